@@ -2,6 +2,8 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import os
+from time import monotonic
 from datetime import timedelta
 from typing import Any
 
@@ -9,18 +11,39 @@ import voluptuous as vol
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant, ServiceCall, callback
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers import issue_registry as ir
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import STORAGE_DIR
 from homeassistant.loader import async_get_integration
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
 from .api import NoopyTVAPI, NoopyTVAPIError, NoopyTVConnectionError
+from .commands import NoopyTVCommandQueue
+from .epg import GUIDE_DEFAULT_LIMIT, GUIDE_MAX_LIMIT, EpgStore, NoopyTVEpgLoader, query_guide
+from .scheduler import ProgrammeBoundaryScheduler
+from .image_pipeline import async_shutdown_image_pipeline
+from .optimistic import TRANSPORT_WINDOW, OptimisticOverlay, Patches
+from .playback import PositionClock, infer_content_type
+from .prefetch import NoopyTVArtworkPrefetcher
+from .sprites import NoopyTVSpriteView
 from .thumbnails import NoopyTVThumbnailView
+from .websocket_api import async_register_websocket_commands
 from .const import (
+    BATCH_COMMANDS,
     CONF_API_KEY,
     CONF_APPLE_TV_ENTITY,
     CONF_HOST,
@@ -31,14 +54,21 @@ from .const import (
     CONF_SUPPORTS_SSE,
     DOMAIN,
     PLATFORMS as PLATFORM_NAMES,
+    PLAYER_REFRESH_COOLDOWN,
+    SERVICE_GET_GUIDE,
     SERVICE_PLAY_CHANNEL,
     SERVICE_PLAY_EPISODE,
     SERVICE_PLAY_MOVIE,
     SERVICE_REFRESH,
     SERVICE_SEND_COMMAND,
+    SERVICE_SEND_COMMANDS,
+    SIGNAL_ENTRY_UNLOADED,
     SSE_FALLBACK_SCAN_INTERVAL_SECONDS,
     SSE_RECONNECT_MAX_DELAY,
     SSE_RECONNECT_MIN_DELAY,
+    SSE_BUS_EVENTS,
+    SSE_REPLAY_WINDOW,
+    SSE_RETRY_FLOOR,
     SUPPORTED_COMMANDS,
 )
 
@@ -73,6 +103,36 @@ SEND_COMMAND_SCHEMA = vol.Schema(
     }
 )
 
+SEND_COMMANDS_SCHEMA = vol.Schema(
+    {
+        vol.Required("commands"): vol.All(
+            cv.ensure_list,
+            vol.Length(min=1),
+            [
+                vol.Schema(
+                    {
+                        vol.Required("command"): vol.In(BATCH_COMMANDS),
+                        vol.Optional("params"): dict,
+                    }
+                )
+            ],
+        ),
+    }
+)
+
+GET_GUIDE_SCHEMA = vol.Schema(
+    {
+        vol.Exclusive("channel_ids", "channels"): vol.All(cv.ensure_list, [cv.string]),
+        vol.Exclusive("category", "channels"): cv.string,
+        vol.Optional("start"): cv.datetime,
+        vol.Optional("end"): cv.datetime,
+        vol.Optional("cursor"): cv.string,
+        vol.Optional("limit", default=GUIDE_DEFAULT_LIMIT): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=GUIDE_MAX_LIMIT)
+        ),
+    }
+)
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     hass.data.setdefault(DOMAIN, {})
@@ -85,6 +145,11 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # les services n'étaient donc jamais retirés, même après suppression du dernier appareil.
     if not hass.data.get(THUMBNAIL_VIEW_KEY):
         hass.http.register_view(NoopyTVThumbnailView())
+        # Planches de vignettes : enregistrée même si l'option est coupée, pour qu'elle
+        # puisse être activée sans redémarrer Home Assistant.
+        hass.http.register_view(NoopyTVSpriteView())
+        # Commandes websocket : comme les vues, enregistrées une fois pour l'intégration.
+        async_register_websocket_commands(hass)
         hass.data[THUMBNAIL_VIEW_KEY] = True
 
     # ⚡️ v3.0.0 cleanup : supprimer les anciennes entities `sensor.<entry>_channel_<id>`
@@ -93,12 +158,13 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # entre les upgrades — on les nettoie ici à chaque setup.
     _cleanup_legacy_per_channel_sensors(hass, entry)
 
-    session = async_get_clientsession(hass)
+    # Pas de session partagée de Home Assistant : l'API ouvre ses propres pools de
+    # connexions vers l'appareil (cf. `_POOL_LIMITS` dans api.py), fermés par `api.close()`.
     api = NoopyTVAPI(
         host=entry.data[CONF_HOST],
         port=entry.data.get(CONF_PORT, DEFAULT_PORT),
-        session=session,
         api_key=entry.data.get(CONF_API_KEY),
+        task_factory=hass.async_create_background_task,
     )
 
     # ⚠️ On ne renonce PAS quand l'application ne répond pas. C'est l'état NORMAL d'un
@@ -133,7 +199,9 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     # ⚡️ v4.0.0 — écoute SSE : le serveur tvOS pousse un event à chaque zap (<50 ms).
     # Tant que le flux tient, le polling retombe à un simple filet de sécurité.
-    sse = NoopyTVEventListener(hass, api, coordinator, poll_interval=scan_interval)
+    sse = NoopyTVEventListener(
+        hass, api, coordinator, poll_interval=scan_interval, entry_id=entry.entry_id
+    )
     # Le TXT Bonjour annonce `sse=1/0`. Absent (anciennes apps) → on tente, le listener
     # abandonne proprement sur un 501. Explicitement à 0 → serveur sans flux push (iOS),
     # inutile d'ouvrir une connexion vouée à l'échec.
@@ -142,7 +210,23 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     else:
         _LOGGER.debug("OneTV: le serveur annonce ne pas supporter SSE — polling seul")
 
-    hass.data[DOMAIN][entry.entry_id] = {"api": api, "coordinator": coordinator, "sse": sse}
+    # Guide des programmes : fenêtre chargée depuis l'app, amorcée par le catalogue.
+    epg_loader = NoopyTVEpgLoader(
+        hass, api, coordinator, coordinator.epg, _guide_path(hass, entry)
+    )
+    epg_loader.async_start()
+
+    # Visuels des favoris, de « Reprendre » et des chaînes voisines, chargés à l'avance.
+    prefetcher = NoopyTVArtworkPrefetcher(hass, api, coordinator)
+    prefetcher.async_start()
+
+    hass.data[DOMAIN][entry.entry_id] = {
+        "api": api,
+        "coordinator": coordinator,
+        "sse": sse,
+        "epg": epg_loader,
+        "prefetch": prefetcher,
+    }
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
@@ -161,13 +245,14 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
         if success:
             _LOGGER.info("Chaîne changée avec succès")
-            await coordinator.async_request_refresh()
+            await coordinator.async_request_player_refresh(include_player=True)
         else:
             _LOGGER.error("Échec du changement de chaîne")
 
     async def _send_command(command: str, params: dict[str, Any] | None = None) -> None:
         try:
-            result = await api.send_command(command, params)
+            # La file relève l'état une fois la rafale passée (cf. commands.py).
+            result = await coordinator.commands.async_send(command, params)
         except NoopyTVAPIError as err:
             raise HomeAssistantError(f"OneTV: commande '{command}' échouée — {err}") from err
         if not result.get("success", False):
@@ -175,7 +260,6 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
                 f"OneTV a refusé la commande '{command}': "
                 f"{result.get('error') or result.get('message')}"
             )
-        await coordinator.async_request_refresh()
 
     async def handle_play_movie(call: ServiceCall) -> None:
         params: dict[str, Any] = {"movieId": call.data["movie_id"]}
@@ -196,6 +280,36 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     async def handle_send_command(call: ServiceCall) -> None:
         await _send_command(call.data["command"], call.data.get("params"))
 
+    async def handle_send_commands(call: ServiceCall) -> None:
+        steps = [(step["command"], step.get("params")) for step in call.data["commands"]]
+        try:
+            results = await coordinator.commands.async_run_batch(steps)
+        except NoopyTVAPIError as err:
+            raise HomeAssistantError(f"OneTV: suite de commandes interrompue — {err}") from err
+        last = results[-1]
+        if not last.get("success", False):
+            command = steps[len(results) - 1][0]
+            raise HomeAssistantError(
+                f"OneTV a refusé la commande '{command}' (étape {len(results)}/{len(steps)}): "
+                f"{last.get('error') or last.get('message')}"
+            )
+
+    async def handle_get_guide(call: ServiceCall) -> ServiceResponse:
+        # Servi entièrement depuis le guide indexé : aucune requête vers l'app.
+        try:
+            return query_guide(
+                coordinator.epg,
+                (coordinator.data or {}).get("channels") or {},
+                channel_ids=call.data.get("channel_ids"),
+                category=call.data.get("category"),
+                start=dt_util.as_utc(call.data["start"]) if "start" in call.data else None,
+                end=dt_util.as_utc(call.data["end"]) if "end" in call.data else None,
+                cursor=call.data.get("cursor"),
+                limit=call.data["limit"],
+            )
+        except ValueError as err:
+            raise HomeAssistantError(f"OneTV: guide — {err}") from err
+
     hass.services.async_register(DOMAIN, SERVICE_REFRESH, handle_refresh)
     hass.services.async_register(DOMAIN, SERVICE_PLAY_CHANNEL, handle_play_channel)
     hass.services.async_register(
@@ -207,6 +321,16 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     hass.services.async_register(
         DOMAIN, SERVICE_SEND_COMMAND, handle_send_command, schema=SEND_COMMAND_SCHEMA
     )
+    hass.services.async_register(
+        DOMAIN, SERVICE_SEND_COMMANDS, handle_send_commands, schema=SEND_COMMANDS_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_GUIDE,
+        handle_get_guide,
+        schema=GET_GUIDE_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
 
     _async_remove_legacy_artwork_entity(hass, entry)
     _async_check_apple_tv_pairing(hass, entry)
@@ -303,9 +427,22 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         ir.async_delete_issue(hass, DOMAIN, f"no_apple_tv_{entry.entry_id}")
 
         data = hass.data[DOMAIN].pop(entry.entry_id)
+        # Les cartes abonnées (websocket) sont prévenues et se réabonneront après un reload.
+        async_dispatcher_send(hass, SIGNAL_ENTRY_UNLOADED.format(entry.entry_id))
         sse: NoopyTVEventListener | None = data.get("sse")
         if sse is not None:
             await sse.stop()
+        epg_loader: NoopyTVEpgLoader | None = data.get("epg")
+        if epg_loader is not None:
+            epg_loader.async_stop()
+        prefetcher: NoopyTVArtworkPrefetcher | None = data.get("prefetch")
+        if prefetcher is not None:
+            await prefetcher.async_stop()
+        data["coordinator"].commands.async_stop()
+        data["coordinator"].boundaries.async_stop()
+        data["coordinator"].async_stop_optimistic()
+        data["coordinator"].async_stop_player_refresh()
+        data["coordinator"].epg.close()
         api: NoopyTVAPI = data["api"]
         await api.close()
 
@@ -316,23 +453,53 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
                 SERVICE_PLAY_MOVIE,
                 SERVICE_PLAY_EPISODE,
                 SERVICE_SEND_COMMAND,
+                SERVICE_SEND_COMMANDS,
+                SERVICE_GET_GUIDE,
             ):
                 hass.services.async_remove(DOMAIN, service)
+            # Plus aucun appareil : le pool de threads des visuels n'a plus de raison d'être.
+            async_shutdown_image_pipeline(hass)
 
     return unload_ok
 
 
+def _guide_path(hass: HomeAssistant, entry: ConfigEntry) -> str:
+    """Fichier du guide des programmes de cette entrée (cf. guide_cache.py)."""
+    return hass.config.path(STORAGE_DIR, f"{DOMAIN}.{entry.entry_id}.guide")
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Appareil supprimé : son guide sur disque n'a plus de raison d'être."""
+
+    def _remove(path: str) -> None:
+        for candidate in (path, f"{path}.tmp"):
+            try:
+                os.remove(candidate)
+            except FileNotFoundError:
+                pass
+
+    await hass.async_add_executor_job(_remove, _guide_path(hass, entry))
+
+
 class NoopyTVEventListener:
     """Maintient le flux SSE `/api/v1/events/stream` et déclenche un refresh à chaque event.
 
     Choix de conception : on ne PARSE PAS le payload des events pour construire l'état. Un
     event sert uniquement de signal « quelque chose a changé, va lire l'état ». Ça évite de
     dupliquer (et de désynchroniser) le décodage déjà fait par `/api/v1/player/state`, et le
-    coût est nul — `async_request_refresh` est débouncé avec `immediate=True`, donc le premier
-    zap déclenche un refresh instantané et une rafale est coalescée.
+    coût est nul — le relevé ciblé (`async_request_player_refresh`, `/player/state` +
+    `/player` seulement) est débouncé avec `immediate=True`, donc le premier zap déclenche un
+    refresh instantané et une rafale est coalescée, y compris avec le relevé qui suit une
+    commande.
 
     Le flux n'existe que sur le serveur tvOS (iOS répond 501) : dans ce cas on abandonne
     définitivement et le polling normal reprend la main.
+
+    Les transitions de lecture sont en outre relayées sur le bus (cf. `SSE_BUS_EVENTS`), avec
+    leur payload, dès que l'évènement est lu : c'est le seul endroit où il est exploité tel quel.
+    Sauf à la connexion : l'état initial et les évènements rejoués après une reprise ne sont
+    pas des transitions qui viennent d'avoir lieu (cf. `SSE_REPLAY_WINDOW`). Ils déclenchent
+    quand même leur relevé.
     """
 
     def __init__(
@@ -341,14 +508,18 @@ class NoopyTVEventListener:
         api: NoopyTVAPI,
         coordinator: DataUpdateCoordinator,
         poll_interval: timedelta,
+        entry_id: str,
     ) -> None:
         self._hass = hass
+        self._entry_id = entry_id
         self._api = api
         self._coordinator = coordinator
         self._poll_interval = poll_interval
         self._task: asyncio.Task | None = None
         self._stopping = False
         self._connected = False
+        # Fin du rattrapage de connexion (état initial, puis rejeu), horloge de la boucle.
+        self._replay_until = 0.0
 
     def start(self) -> None:
         if self._task is None:
@@ -395,23 +566,73 @@ class NoopyTVEventListener:
         ⚠️ Ne PAS déduire la connexion de l'arrivée d'un event `snapshot` : le serveur
         étiquette son état initial selon la situation (il envoie `channel.change` quand une
         chaîne est déjà en cours), donc `snapshot` peut ne jamais arriver.
+
+        Un flux établi prouve aussi que l'app est revenue : le disjoncteur des relevés
+        (cf. `NoopyTVAPI.refresh_data`) est refermé sans attendre sa prochaine sonde.
         """
         self._connected = True
+        self._replay_until = self._hass.loop.time() + SSE_REPLAY_WINDOW
+        self._api.reset_circuit()
+
+    def _is_replay(self) -> bool:
+        """L'évènement qui arrive fait-il partie du rattrapage de connexion ?
+
+        Oui tant que les évènements tombent d'une traite depuis la connexion : chacun repousse
+        la fenêtre. Le premier qui arrive après un silence est en direct — même le tout
+        premier, si l'app n'a rien envoyé à la connexion.
+        """
+        now = self._hass.loop.time()
+        if now <= self._replay_until:
+            self._replay_until = now + SSE_REPLAY_WINDOW
+            return True
+        return False
 
     @callback
-    def _on_event(self, event_name: str, _payload: dict[str, Any]) -> None:
+    def _on_event(self, event_name: str, payload: dict[str, Any]) -> None:
         if event_name in ("heartbeat", "message"):
             return
+        replayed = self._is_replay()
+        if (event_type := SSE_BUS_EVENTS.get(event_name)) is not None and not replayed:
+            self._fire(event_type, payload)
         _LOGGER.debug("OneTV SSE: event %s → refresh", event_name)
-        self._hass.async_create_task(self._coordinator.async_request_refresh())
+        if event_name == "snapshot":
+            # État initial à la (re)connexion : on a pu rater n'importe quoi, relevé complet.
+            self._hass.async_create_task(self._coordinator.async_request_refresh())
+            return
+        # Un évènement signale un changement de LECTURE (zap, arrêt, contexte sportif) : le
+        # catalogue n'a pas bougé, le relevé ciblé suffit.
+        self._hass.async_create_task(
+            self._coordinator.async_request_player_refresh(include_player=True)
+        )
+
+    @callback
+    def _fire(self, event_type: str, payload: dict[str, Any]) -> None:
+        device = dr.async_get(self._hass).async_get_device(
+            identifiers={(DOMAIN, self._entry_id)}
+        )
+        self._hass.bus.async_fire(
+            event_type,
+            {
+                **payload,
+                "entry_id": self._entry_id,
+                "device_id": device.id if device is not None else None,
+            },
+        )
+
+    def _base_delay(self) -> float:
+        """Délai `retry:` annoncé par le serveur, à défaut le délai minimal par défaut."""
+        retry = self._api.sse_retry
+        if retry is None:
+            return SSE_RECONNECT_MIN_DELAY
+        return min(max(retry, SSE_RETRY_FLOOR), SSE_RECONNECT_MAX_DELAY)
 
     async def _run(self) -> None:
-        delay = SSE_RECONNECT_MIN_DELAY
+        delay = self._base_delay()
         while not self._stopping:
             try:
                 await self._api.listen_events(self._on_event, self._on_connected)
                 # Retour normal = flux fermé proprement par le serveur (app quittée).
-                delay = SSE_RECONNECT_MIN_DELAY
+                delay = self._base_delay()
             except NoopyTVAPIError as err:
                 # 501/404 = serveur sans SSE (iOS, ou app trop ancienne) → inutile d'insister.
                 if "501" in str(err) or "non disponible" in str(err) or "non supporté" in str(err):
@@ -427,6 +648,10 @@ class NoopyTVEventListener:
                 _LOGGER.exception("OneTV SSE: erreur inattendue")
 
             # Flux perdu → l'app est peut-être fermée : on repasse en polling nominal.
+            if self._connected:
+                # Coupure d'un flux établi : reprise au délai annoncé (et `Last-Event-ID`),
+                # sans hériter du recul accumulé avant la connexion.
+                delay = self._base_delay()
             self._connected = False
             self._set_poll_interval(self._poll_interval)
             if self._stopping:
@@ -444,10 +669,161 @@ class NoopyTVDataUpdateCoordinator(DataUpdateCoordinator):
     def __init__(self, hass: HomeAssistant, api: NoopyTVAPI, update_interval: timedelta) -> None:
         super().__init__(hass, _LOGGER, name=DOMAIN, update_interval=update_interval)
         self.api = api
+        # Guide des programmes, partagé par les entités (cf. epg.py).
+        self.epg = EpgStore()
+        # Fins de programme guettées par les entités (cf. scheduler.py).
+        self.boundaries = ProgrammeBoundaryScheduler(hass)
+        # Commandes envoyées au lecteur, fusionnées et espacées (cf. commands.py).
+        self.commands = NoopyTVCommandQueue(hass, api, self)
+        # États attendus après une commande, superposés aux relevés (cf. optimistic.py).
+        self.optimistic = OptimisticOverlay()
+        # Dernier relevé tel que rapporté par l'app, SANS superposition.
+        self._reported: dict | None = None
+        # Position de lecture extrapolée entre les relevés (cf. playback.py). Pendant la
+        # lecture régulière d'un film, les ticks périodiques sont sautés ; un relevé demandé
+        # explicitement (service, évènement SSE, reprise) part toujours.
+        self.position = PositionClock()
+        self._force_poll = False
+        self._unsub_expiry = None
+        # Relevé ciblé après commande ou évènement SSE : rafales regroupées, `/player` relu
+        # si au moins un des demandeurs l'a réclamé.
+        self._player_refresh = Debouncer(
+            hass,
+            _LOGGER,
+            cooldown=PLAYER_REFRESH_COOLDOWN,
+            immediate=True,
+            function=self._async_refresh_player,
+        )
+        self._player_refresh_includes_player = False
+
+    async def async_request_player_refresh(self, include_player: bool = False) -> None:
+        """Relit l'état de lecture SEUL (cf. `NoopyTVAPI.refresh_player`) et le fusionne.
+
+        Ce qu'une commande peut changer tient dans `/player/state` (et `/player` pour un
+        zapping) : inutile de repasser par `/api/v1/info` et la détection de changement du
+        catalogue, comme le ferait `async_request_refresh`.
+        """
+        self._player_refresh_includes_player |= include_player
+        await self._player_refresh.async_call()
+
+    async def _async_refresh_player(self) -> None:
+        include_player = self._player_refresh_includes_player
+        self._player_refresh_includes_player = False
+        if self._reported is None or not self.last_update_success:
+            # Rien sur quoi fusionner (ou l'app vient de revenir) : relevé complet.
+            await self.async_request_refresh()
+            return
+        try:
+            partial = await self.api.refresh_player(include_player)
+        except NoopyTVAPIError as err:
+            _LOGGER.debug("OneTV : relevé ciblé en échec (%s) → relevé complet", err)
+            await self.async_request_refresh()
+            return
+        # Les sections relues ici sont fraîches : elles ne sont plus à compter parmi `stale`.
+        stale = {
+            name: age
+            for name, age in (self._reported.get("stale") or {}).items()
+            if name not in partial
+        }
+        self._reported = {**self._reported, **partial, "stale": stale}
+        self._update_position()
+        self._async_publish()
+
+    def _update_position(self) -> None:
+        """Recale l'horloge de position sur le dernier relevé — s'il est de première main.
+
+        Un `playback_state` servi depuis une réponse antérieure (cf. `stale`) peut dater de
+        `_MAX_STALE` (cf. api.py) : son `currentTime`, pris pour actuel, ferait reculer la
+        position et fausserait `can_skip_poll`. L'horloge continue alors d'extrapoler.
+        """
+        if "playback_state" in (self._reported.get("stale") or {}):
+            return
+        self.position.update(self._reported.get("playback_state") or {})
+
+    @callback
+    def async_stop_player_refresh(self) -> None:
+        self._player_refresh.async_cancel()
+
+    @callback
+    def async_expect(
+        self,
+        key: str,
+        patches: Patches,
+        *,
+        window: float = TRANSPORT_WINDOW,
+        confirm=None,
+    ) -> int:
+        """Affiche tout de suite l'état qu'une commande va produire — cf. optimistic.py."""
+        token = self.optimistic.expect(key, patches, window=window, confirm=confirm)
+        self._async_publish()
+        return token
+
+    @callback
+    def async_cancel_expectation(self, token: int) -> None:
+        """La commande a échoué : on revient aussitôt à l'état rapporté."""
+        if self.optimistic.cancel(token):
+            self._async_publish()
+
+    @callback
+    def async_stop_optimistic(self) -> None:
+        self.optimistic.clear()
+        if self._unsub_expiry is not None:
+            self._unsub_expiry()
+            self._unsub_expiry = None
+
+    def _overlaid(self) -> dict | None:
+        """Relevé courant + attentes encore valides ; ré-arme le minuteur d'échéance."""
+        self.optimistic.reconcile(self._reported)
+        if self._unsub_expiry is not None:
+            self._unsub_expiry()
+            self._unsub_expiry = None
+        deadline = self.optimistic.next_deadline()
+        if deadline is not None:
+            self._unsub_expiry = async_call_later(
+                self.hass, max(0.0, deadline - monotonic()), self._async_expired
+            )
+        return None if self._reported is None else self.optimistic.apply(self._reported)
+
+    @callback
+    def _async_expired(self, _now) -> None:
+        self._unsub_expiry = None
+        self._async_publish()
+
+    @callback
+    def _async_publish(self) -> None:
+        """Republie les données superposées SANS relancer de relevé ni décaler le suivant."""
+        data = self._overlaid()
+        if data is None:
+            return  # aucun relevé encore : rien sur quoi superposer
+        self.data = data
+        self.async_update_listeners()
+
+    async def async_request_refresh(self) -> None:
+        self._force_poll = True
+        await super().async_request_refresh()
+
+    async def async_refresh(self) -> None:
+        self._force_poll = True
+        await super().async_refresh()
+
+    def _can_skip_poll(self) -> bool:
+        """Tick périodique pendant la lecture régulière d'un film, contrôlée il y a peu."""
+        if self._reported is None or not self.last_update_success:
+            return False
+        state = self._reported.get("playback_state") or {}
+        if infer_content_type(state, self._reported.get("player")) not in ("movie", "episode"):
+            return False
+        return self.position.can_skip_poll()
 
     async def _async_update_data(self) -> dict:
+        forced, self._force_poll = self._force_poll, False
+        if not forced and self._can_skip_poll():
+            self.position.skipped_polls += 1
+            return self._overlaid()
         try:
-            return await self.api.refresh_data()
+            self._reported = await self.api.refresh_data()
+            self._update_position()
+            return self._overlaid()
         except NoopyTVConnectionError as err:
             raise UpdateFailed(f"OneTV non accessible: {err}") from err
         except NoopyTVAPIError as err:
@@ -1,19 +1,32 @@
 from __future__ import annotations
 
 import asyncio
-import json
+import inspect
 import logging
+import socket
 import uuid
+import zlib
 from collections import OrderedDict
-from collections.abc import Callable
+from collections.abc import AsyncIterator, Callable, Coroutine
+from contextlib import asynccontextmanager
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
+from functools import partial
+from time import monotonic
 from typing import Any
 
 from urllib.parse import quote
 
 import aiohttp
 
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+from .jsoncodec import decode_body, json_loads
+from .sse import SSEParser
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -54,6 +67,30 @@ class NoopyProgram:
         return self.start <= now < self.end
 
 
+# Champs « programme » d'une ligne du cache des chaînes : les seuls que le rafraîchissement
+# du « maintenant » (`refresh_now_playing`) a le droit de réécrire.
+PROGRAM_FIELDS = (
+    "current_program",
+    "current_program_start",
+    "current_program_end",
+    "current_program_description",
+    "current_program_icon",
+    "progress_percent",
+)
+
+
+def _flatten_program(prog: dict[str, Any]) -> dict[str, Any]:
+    """Programme brut de l'app → champs aplatis d'une ligne du cache des chaînes."""
+    return {
+        "current_program": prog.get("title"),
+        "current_program_start": prog.get("start"),
+        "current_program_end": prog.get("end"),
+        "current_program_description": prog.get("description"),
+        "current_program_icon": prog.get("icon_url"),
+        "progress_percent": prog.get("progress_percent", 0),
+    }
+
+
 class NoopyTVAPIError(Exception):
     pass
 
@@ -62,6 +99,248 @@ class NoopyTVConnectionError(NoopyTVAPIError):
     pass
 
 
+# Disjoncteur : après `_CIRCUIT_THRESHOLD` relevés consécutifs en échec de connexion, plus
+# de relevé complet — une seule sonde `/api/v1/info`, espacée de 5 s puis 10, 20… 60 s.
+_CIRCUIT_THRESHOLD = 3
+_CIRCUIT_BACKOFF_MIN = 5.0
+_CIRCUIT_BACKOFF_MAX = 60.0
+_PROBE_TIMEOUT = 2
+
+
+class _CircuitBreaker:
+    """Compte les relevés en échec de connexion et espace les sondes une fois ouvert."""
+
+    def __init__(self) -> None:
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._retry_at = 0.0
+        self._backoff = _CIRCUIT_BACKOFF_MIN
+
+    @property
+    def is_open(self) -> bool:
+        return self.opened_at is not None
+
+    def probe_due(self) -> bool:
+        return monotonic() >= self._retry_at
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.opened_at is None:
+            if self.failures < _CIRCUIT_THRESHOLD:
+                return
+            self.opened_at = monotonic()
+            _LOGGER.info(
+                "OneTV injoignable (%d relevés en échec) : sondage espacé jusqu'à son retour",
+                self.failures,
+            )
+        else:
+            self._backoff = min(self._backoff * 2, _CIRCUIT_BACKOFF_MAX)
+        self._retry_at = monotonic() + self._backoff
+
+    def close(self) -> None:
+        if self.opened_at is not None:
+            _LOGGER.info("OneTV de nouveau joignable : relevés complets rétablis")
+        self.failures = 0
+        self.opened_at = None
+        self._retry_at = 0.0
+        self._backoff = _CIRCUIT_BACKOFF_MIN
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "open": self.is_open,
+            "consecutive_failures": self.failures,
+            "next_probe_in": (
+                max(0.0, round(self._retry_at - monotonic(), 1)) if self.is_open else None
+            ),
+        }
+
+
+# Budget d'un tick pour les relevés temps réel. Ce qui n'a pas répondu à temps est servi
+# depuis sa dernière valeur (marquée de son âge), et sa requête continue en arrière-plan :
+# sa réponse servira au tick suivant.
+_TICK_BUDGET = 4.0
+# Âge maximal d'une valeur servie à la place d'un relevé en retard ou en échec : au-delà, le
+# tick échoue (entités indisponibles) plutôt que d'afficher indéfiniment un état figé.
+# 15 budgets = une minute, six ticks à l'intervalle par défaut.
+_MAX_STALE = 15 * _TICK_BUDGET
+_REALTIME_ENDPOINTS = {
+    "info": "/api/v1/info",
+    "player": "/api/v1/player",
+    "playback_state": "/api/v1/player/state",
+}
+
+
+# Pools de connexions PROPRES à l'appareil (et non la session partagée de Home Assistant,
+# réglée pour des API internet) :
+#   player   relevés d'état, commandes, lancement — petits, fréquents, sensibles à la latence
+#   catalog  catalogue, guide, VOD — gros, rares ; ne peuvent plus priver `player` de connexion
+#   events   le flux SSE, une connexion réservée qui ne dispute rien à personne
+_POOL_LIMITS = {"player": 4, "catalog": 2, "events": 1}
+# Bien au-delà de l'intervalle de relevé : la connexion d'un tick sert au suivant, sans
+# nouvelle poignée de main TCP (le serveur de l'app garde les siennes 120 s).
+_KEEPALIVE_TIMEOUT = 75.0
+
+# Compression négociée : le catalogue, les films et les séries pèsent plusieurs Mo de JSON
+# très redondant (5 à 10 fois moins une fois compressés) — sur une Apple TV en Wi-Fi, c'est
+# l'essentiel du temps de téléchargement. Brotli seulement si son module est installé.
+_ACCEPT_ENCODING = "gzip, deflate, br" if brotli is not None else "gzip, deflate"
+# Pools dont le corps est décompressé ICI, morceau par morceau à mesure qu'il arrive (au lieu
+# d'aiohttp, qui ne dit rien des tailles) : les tailles avant / après sont relevées par endpoint.
+_RAW_POOLS = frozenset({"catalog"})
+# La compression n'est demandée que là : sur `player`, les corps font quelques centaines
+# d'octets et la compresser côté app coûterait plus qu'elle ne fait gagner. « identity »
+# y remplace l'en-tête qu'aiohttp enverrait de lui-même.
+_POOL_ENCODING = {pool: _ACCEPT_ENCODING for pool in _RAW_POOLS}
+_CHUNK_SIZE = 64 * 1024
+_DECOMPRESS_ERRORS: tuple[type[Exception], ...] = (zlib.error,) + (
+    (brotli.error,) if brotli is not None else ()
+)
+_TRANSFER_STATS_MAX = 32  # endpoints suivis (les épisodes d'une série ont chacun le leur)
+
+
+# Classes de priorité des requêtes — la plus petite passe d'abord (cf. `_PriorityGate`).
+PRIORITY_COMMAND = 0  # commandes, lancement d'une chaîne : une main qui attend
+PRIORITY_STATE = 1  # relevés d'état du lecteur
+PRIORITY_BROWSE = 2  # navigation dans le catalogue depuis l'interface
+PRIORITY_BACKGROUND = 3  # catalogue complet, guide, préchauffage des visuels
+_PRIORITY_NAMES = ("command", "state", "browse", "background")
+# Requêtes simultanées par classe : les grosses sont plafonnées, pour ne jamais occuper
+# le thread principal de l'app (qui sert aussi les commandes) à plusieurs.
+_PRIORITY_LIMITS = (2, 3, 2, 1)
+
+
+class _PriorityGate:
+    """Ordonne les requêtes vers l'app par classe de priorité.
+
+    Une requête démarre quand sa classe a une place libre ET qu'aucune requête d'une classe
+    plus prioritaire n'attend. Navigation et tâches de fond attendent en outre la fin des
+    commandes en cours : un appui sur un bouton ne partage jamais l'app avec un
+    téléchargement qui commence. Un transfert déjà lancé n'est pas interrompu — d'où le
+    plafond des classes basses.
+    """
+
+    def __init__(self) -> None:
+        self._condition: asyncio.Condition | None = None
+        self._active = [0] * len(_PRIORITY_LIMITS)
+        self._waiting = [0] * len(_PRIORITY_LIMITS)
+        self._waits = [0] * len(_PRIORITY_LIMITS)
+        self._wait_time = [0.0] * len(_PRIORITY_LIMITS)
+
+    def _can_start(self, priority: int) -> bool:
+        if self._active[priority] >= _PRIORITY_LIMITS[priority]:
+            return False
+        if any(self._waiting[higher] for higher in range(priority)):
+            return False
+        return priority < PRIORITY_BROWSE or not self._active[PRIORITY_COMMAND]
+
+    @asynccontextmanager
+    async def slot(self, priority: int) -> AsyncIterator[None]:
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        condition = self._condition
+        async with condition:
+            if not self._can_start(priority):
+                started = monotonic()
+                self._waiting[priority] += 1
+                try:
+                    await condition.wait_for(lambda: self._can_start(priority))
+                finally:
+                    self._waiting[priority] -= 1
+                    # Une attente de moins peut débloquer une classe inférieure.
+                    condition.notify_all()
+                self._waits[priority] += 1
+                self._wait_time[priority] += monotonic() - started
+            self._active[priority] += 1
+        try:
+            yield
+        finally:
+            async with condition:
+                self._active[priority] -= 1
+                condition.notify_all()
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        return {
+            name: {
+                "limit": _PRIORITY_LIMITS[priority],
+                "active": self._active[priority],
+                "waiting": self._waiting[priority],
+                "waits": self._waits[priority],
+                "wait_seconds": round(self._wait_time[priority], 3),
+            }
+            for priority, name in enumerate(_PRIORITY_NAMES)
+        }
+
+
+def _nodelay_socket(addr_info: tuple) -> socket.socket:
+    """Socket sans algorithme de Nagle : une commande part sans attendre l'accusé précédent."""
+    family, type_, proto, _, _ = addr_info
+    sock = socket.socket(family=family, type=type_, proto=proto)
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    return sock
+
+
+# `socket_factory` n'existe qu'à partir d'aiohttp 3.12 ; avant, aiohttp pose déjà
+# TCP_NODELAY sur ses connexions client.
+_CONNECTOR_EXTRA: dict[str, Any] = (
+    {"socket_factory": _nodelay_socket}
+    if "socket_factory" in inspect.signature(aiohttp.TCPConnector).parameters
+    else {}
+)
+
+
+def _pool_trace(stats: dict[str, int]) -> aiohttp.TraceConfig:
+    """Compte les connexions ouvertes, réutilisées et les attentes de place dans le pool."""
+    trace = aiohttp.TraceConfig()
+
+    async def _created(_session, _ctx, _params) -> None:
+        stats["created"] += 1
+
+    async def _reused(_session, _ctx, _params) -> None:
+        stats["reused"] += 1
+
+    async def _queued(_session, _ctx, _params) -> None:
+        stats["queued"] += 1
+
+    trace.on_connection_create_end.append(_created)
+    trace.on_connection_reuseconn.append(_reused)
+    trace.on_connection_queued_start.append(_queued)
+    return trace
+
+
+def _loop_task(coro: Coroutine[Any, Any, Any], name: str) -> asyncio.Task:
+    return asyncio.get_running_loop().create_task(coro, name=name)
+
+
+class _StreamDecoder:
+    """Décompression incrémentale d'un corps `gzip` / `deflate` / `br`."""
+
+    def __init__(self, encoding: str) -> None:
+        self.encoding = encoding
+        self._obj: Any = None
+        if encoding == "gzip":
+            self._obj = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        elif encoding == "br":
+            if brotli is None:
+                raise NoopyTVAPIError("Réponse brotli reçue sans module brotli installé")
+            self._obj = brotli.Decompressor()
+        elif encoding != "deflate":
+            raise NoopyTVAPIError(f"Encodage de réponse non supporté: {encoding}")
+
+    def decompress(self, chunk: bytes) -> bytes:
+        if self._obj is None:
+            # `deflate` devrait porter l'en-tête zlib ; certains serveurs envoient le flux brut.
+            wbits = zlib.MAX_WBITS if chunk and chunk[0] & 0x0F == 8 else -zlib.MAX_WBITS
+            self._obj = zlib.decompressobj(wbits)
+        if self.encoding == "br":
+            return self._obj.process(chunk)
+        return self._obj.decompress(chunk)
+
+    def flush(self) -> bytes:
+        if self._obj is None or self.encoding == "br":
+            return b""
+        return self._obj.flush()
+
+
 class NoopyTVAPI:
 
     def __init__(
@@ -70,11 +349,24 @@ class NoopyTVAPI:
         port: int = 8765,
         session: aiohttp.ClientSession | None = None,
         api_key: str | None = None,
+        task_factory: Callable[[Coroutine[Any, Any, Any], str], asyncio.Task] | None = None,
     ) -> None:
         self._host = host
+        # Tâches qui survivent à l'appelant (relevés hors budget) : Home Assistant passe
+        # `hass.async_create_background_task`, qui les suit et les annule à l'arrêt.
+        self._create_task = task_factory or _loop_task
         self._port = port
+        # Session imposée (assistant de configuration) : utilisée pour tout. Sinon, une
+        # session par pool, créée à la première requête (cf. `_POOL_LIMITS`).
         self._session = session
-        self._own_session = session is None
+        self._sessions: dict[str, aiohttp.ClientSession] = {}
+        self._pool_stats = {
+            pool: {"created": 0, "reused": 0, "queued": 0} for pool in _POOL_LIMITS
+        }
+        # Flux d'évènements : dernier `id` et `retry` conservés d'une connexion à l'autre.
+        self._sse = SSEParser()
+        # Tailles transférées / décompressées par endpoint (cf. `_RAW_POOLS`).
+        self._transfers: OrderedDict[str, dict[str, Any]] = OrderedDict()
         self._base_url = f"http://{host}:{port}"
         self._api_key = api_key
         self._channels: dict[str, NoopyChannel] = {}
@@ -88,17 +380,129 @@ class NoopyTVAPI:
         self._last_generation: int | None = None
         self._last_total_channels: int | None = None
         self._last_total_categories: int | None = None
+        # Appli fermée : plus de salves de requêtes vouées au timeout (cf. refresh_data).
+        self._circuit = _CircuitBreaker()
+        # Commandes d'abord, téléchargements du catalogue en dernier (cf. `_PriorityGate`).
+        self._gate = _PriorityGate()
+        # Relevés temps réel (cf. `_TICK_BUDGET`) : requête en vol, dernière réponse reçue
+        # (valeur, instant `monotonic()`), et santé de chaque endpoint.
+        self._inflight: dict[str, asyncio.Task] = {}
+        self._last_ok: dict[str, tuple[Any, float]] = {}
+        self._health = {
+            name: {"status": None, "slow": 0, "failed": 0, "last_error": None}
+            for name in _REALTIME_ENDPOINTS
+        }
 
-    async def _ensure_session(self) -> aiohttp.ClientSession:
-        if self._session is None or self._session.closed:
-            timeout = aiohttp.ClientTimeout(total=30)
-            self._session = aiohttp.ClientSession(timeout=timeout)
-            self._own_session = True
-        return self._session
+    async def _ensure_session(self, pool: str = "player") -> aiohttp.ClientSession:
+        if self._session is not None:
+            return self._session
+        session = self._sessions.get(pool)
+        if session is None or session.closed:
+            limit = _POOL_LIMITS[pool]
+            connector = aiohttp.TCPConnector(
+                limit=limit,
+                limit_per_host=limit,
+                keepalive_timeout=_KEEPALIVE_TIMEOUT,
+                ttl_dns_cache=300,
+                **_CONNECTOR_EXTRA,
+            )
+            session = self._sessions[pool] = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=30),
+                trace_configs=[_pool_trace(self._pool_stats[pool])],
+                auto_decompress=pool not in _RAW_POOLS,
+            )
+        return session
 
     async def close(self) -> None:
-        if self._own_session and self._session and not self._session.closed:
-            await self._session.close()
+        for task in list(self._inflight.values()):
+            task.cancel()
+        sessions, self._sessions = self._sessions, {}
+        for session in sessions.values():
+            if not session.closed:
+                await session.close()
+
+    def endpoint_health(self) -> dict[str, dict[str, Any]]:
+        """Par relevé temps réel : dernier statut (ok / slow / failed), compteurs, âge."""
+        now = monotonic()
+        return {
+            name: {
+                **health,
+                "age_seconds": (
+                    round(now - self._last_ok[name][1], 1) if name in self._last_ok else None
+                ),
+            }
+            for name, health in self._health.items()
+        }
+
+    def priority_stats(self) -> dict[str, dict[str, Any]]:
+        """Par classe de priorité : requêtes en cours, en attente, et temps passé à attendre."""
+        return self._gate.stats()
+
+    def pool_stats(self) -> dict[str, dict[str, int]]:
+        """Par pool : connexions ouvertes, réutilisées (keep-alive) et attentes de place."""
+        return {
+            pool: {"limit": _POOL_LIMITS[pool], **stats}
+            for pool, stats in self._pool_stats.items()
+        }
+
+    @property
+    def sse_retry(self) -> float | None:
+        """Délai de reconnexion demandé par le serveur (`retry:`), en secondes."""
+        return self._sse.retry
+
+    @property
+    def last_event_id(self) -> str | None:
+        return self._sse.last_event_id
+
+    def transfer_stats(self) -> dict[str, dict[str, Any]]:
+        """Par endpoint : encodage, octets reçus et décompressés (dernière réponse et cumul)."""
+        return {endpoint: dict(stats) for endpoint, stats in self._transfers.items()}
+
+    def _record_transfer(self, endpoint: str, encoding: str, wire: int, size: int) -> None:
+        name = endpoint.split("?", 1)[0]
+        stats = self._transfers.pop(name, None) or {
+            "requests": 0,
+            "wire_bytes_total": 0,
+            "bytes_total": 0,
+        }
+        stats["requests"] += 1
+        stats["wire_bytes_total"] += wire
+        stats["bytes_total"] += size
+        stats.update(
+            encoding=encoding,
+            wire_bytes=wire,
+            bytes=size,
+            ratio=round(size / wire, 1) if wire else None,
+        )
+        self._transfers[name] = stats
+        while len(self._transfers) > _TRANSFER_STATS_MAX:
+            self._transfers.popitem(last=False)
+
+    async def _read_body(
+        self, session: aiohttp.ClientSession, response: aiohttp.ClientResponse, endpoint: str
+    ) -> bytes | bytearray:
+        """Corps décompressé. Si la session ne décompresse pas elle-même, la décompression
+        suit la réception, morceau par morceau, et les tailles sont relevées."""
+        if getattr(session, "auto_decompress", True):
+            return await response.read()
+        encoding = response.headers.get("Content-Encoding", "identity").strip().lower()
+        if encoding in ("", "identity"):
+            body = await response.read()
+            self._record_transfer(endpoint, "identity", len(body), len(body))
+            return body
+        decoder = _StreamDecoder(encoding)
+        body = bytearray()
+        wire = 0
+        try:
+            async for chunk in response.content.iter_chunked(_CHUNK_SIZE):
+                wire += len(chunk)
+                body += decoder.decompress(chunk)
+            body += decoder.flush()
+        except _DECOMPRESS_ERRORS as err:
+            raise NoopyTVAPIError(f"Réponse {encoding} corrompue sur {endpoint}: {err}") from err
+        self._record_transfer(endpoint, encoding, wire, len(body))
+        return body
 
     def _auth_headers(self) -> dict[str, str]:
         if self._api_key:
@@ -112,26 +516,58 @@ class NoopyTVAPI:
     def set_api_key(self, api_key: str) -> None:
         self._api_key = api_key
 
-    async def _request(self, endpoint: str, timeout: float | None = None) -> Any:
-        session = await self._ensure_session()
+    def reset_circuit(self) -> None:
+        """Signe de vie venu d'ailleurs (annonce Bonjour, flux SSE) : relevés complets rétablis."""
+        self._circuit.close()
+
+    @property
+    def circuit(self) -> dict[str, Any]:
+        return self._circuit.as_dict()
+
+    async def _request(
+        self,
+        endpoint: str,
+        timeout: float | None = None,
+        pool: str = "player",
+        priority: int = PRIORITY_STATE,
+    ) -> Any:
+        session = await self._ensure_session(pool)
         url = f"{self._base_url}{endpoint}"
 
         # ⚡️ FIX HA (2026-06-20) — timeout serré par requête (réseau LAN). Sans ça, un Apple TV
         # bloqué fige le coordinator 30s. connect court (3s) + total adapté à la taille du payload.
         req_timeout = aiohttp.ClientTimeout(connect=3, total=timeout or 12)
         try:
-            async with session.get(url, headers=self._auth_headers(), timeout=req_timeout) as response:
+            async with self._gate.slot(priority), session.get(
+                url,
+                headers={
+                    "Accept-Encoding": _POOL_ENCODING.get(pool, "identity"),
+                    **self._auth_headers(),
+                },
+                timeout=req_timeout,
+            ) as response:
                 if response.status != 200:
                     raise NoopyTVAPIError(f"Erreur HTTP {response.status}")
-                return await response.json()
+                data = decode_body(await self._read_body(session, response, endpoint))
         except aiohttp.ClientConnectorError as err:
             raise NoopyTVConnectionError(f"Impossible de se connecter à OneTV: {err}") from err
+        except aiohttp.ServerTimeoutError as err:
+            raise NoopyTVConnectionError(f"OneTV ne répond pas: {err}") from err
+        except asyncio.TimeoutError as err:
+            # Timeout TOTAL de la requête (connexion acceptée, réponse trop lente — app en
+            # plein démarrage ou figée) : aiohttp le lève tel quel, hors `ClientError`.
+            raise NoopyTVConnectionError(f"OneTV ne répond pas à {endpoint}") from err
         except aiohttp.ClientError as err:
             raise NoopyTVAPIError(f"Erreur de connexion: {err}") from err
+        except ValueError as err:
+            raise NoopyTVAPIError(f"Réponse JSON invalide sur {endpoint}: {err}") from err
+        # L'app a répondu : quelle que soit la requête, elle est joignable.
+        self._circuit.close()
+        return data
 
-    async def get_info(self) -> dict[str, Any]:
+    async def get_info(self, timeout: float | None = None) -> dict[str, Any]:
         # /api/v1/info is public — no auth required (used to discover the api_key)
-        data = await self._request("/api/v1/info")
+        data = await self._request("/api/v1/info", timeout=timeout)
         self._info = data
         # Auto-pick up the api_key advertised by the server
         if not self._api_key and isinstance(data, dict):
@@ -149,7 +585,9 @@ class NoopyTVAPI:
 
     async def get_channels(self) -> list[NoopyChannel]:
         # Gros payload (jusqu'à 60k chaînes) → timeout plus large.
-        data = await self._request("/api/v1/channels", timeout=20)
+        data = await self._request(
+            "/api/v1/channels", timeout=20, pool="catalog", priority=PRIORITY_BACKGROUND
+        )
         channels_data = data.get("channels", [])
         channels = []
         self._channels = {}  # reset (évite les chaînes périmées d'une playlist précédente)
@@ -196,7 +634,9 @@ class NoopyTVAPI:
         `player_data` : si fourni (déjà fetché dans le même tick), évite un 2e GET /player
         coûteux pour le fallback.
         """
-        data = await self._request("/api/v1/categories", timeout=10)
+        data = await self._request(
+            "/api/v1/categories", timeout=10, pool="catalog", priority=PRIORITY_BACKGROUND
+        )
         categories_data = data.get("categories", [])
 
         if categories_data:
@@ -232,9 +672,68 @@ class NoopyTVAPI:
         return self._categories
 
     async def get_now_playing(self) -> list[dict[str, Any]]:
-        data = await self._request("/api/v1/now")
+        data = await self._request(
+            "/api/v1/now", timeout=20, pool="catalog", priority=PRIORITY_BACKGROUND
+        )
         return data.get("now_playing", [])
 
+    async def refresh_now_playing(self) -> list[str]:
+        """Met à jour le programme en cours des chaînes en cache, SANS re-télécharger le catalogue.
+
+        Le catalogue n'est re-téléchargé qu'au changement de `channels_generation` — ce qui
+        peut attendre des jours. Ses champs `current_program*` se figeaient donc au dernier
+        téléchargement. `/api/v1/now` ne porte que les programmes : on patche EN PLACE les
+        champs de `PROGRAM_FIELDS` des lignes existantes, sans toucher au reste (l'identité
+        du dict `channels`, sur laquelle se calent les caches des entités, est conservée).
+
+        Chaque entrée porte `channel_id` (ou `id`) et soit un dict `current_program`, soit
+        les champs du programme à plat. Retourne les identifiants des chaînes modifiées ;
+        une chaîne inconnue du cache est ignorée (elle arrivera avec le prochain catalogue).
+        """
+        if not self._cached_channels_data:
+            return []
+        try:
+            entries = await self.get_now_playing()
+        except (NoopyTVAPIError, asyncio.TimeoutError) as err:
+            _LOGGER.debug("refresh_now_playing failed: %s", err)
+            return []
+
+        changed: list[str] = []
+        for entry in entries or []:
+            if not isinstance(entry, dict):
+                continue
+            row = self._cached_channels_data.get(str(entry.get("channel_id") or entry.get("id") or ""))
+            if row is None:
+                continue
+            prog = entry.get("current_program")
+            fields = _flatten_program(prog if isinstance(prog, dict) else entry)
+            if not fields["current_program"]:
+                continue
+            if any(row.get(key) != value for key, value in fields.items() if key != "progress_percent"):
+                changed.append(row["id"])
+            row.update(fields)
+        return changed
+
+    async def get_epg(self, hours: int) -> dict[str, Any]:
+        """Guide des programmes sur les `hours` prochaines heures (`/api/v1/epg`).
+
+        Shape serveur : `{channels: {channel_id: [{title, start, end, description,
+        icon_url}]}}` (cf. `epg.build_guides`). Gros payload — jusqu'à 60k chaînes × 48 h.
+        Un serveur plus ancien renvoie 404 : `{}`, et l'EPG se limite alors aux instantanés
+        `current_program` du catalogue.
+        """
+        try:
+            data = await self._request(
+                f"/api/v1/epg?hours={int(hours)}",
+                timeout=60,
+                pool="catalog",
+                priority=PRIORITY_BACKGROUND,
+            )
+            return data or {}
+        except (NoopyTVAPIError, asyncio.TimeoutError) as err:
+            _LOGGER.debug("get_epg failed: %s", err)
+            return {}
+
     async def get_player_status(self) -> dict[str, Any]:
         """Récupère l'état du player legacy (`/api/v1/player`) avec available_channels."""
         data = await self._request("/api/v1/player", timeout=6)
@@ -256,6 +755,22 @@ class NoopyTVAPI:
             _LOGGER.debug("get_playback_state failed: %s", err)
             return {}
 
+    async def refresh_player(self, include_player: bool = False) -> dict[str, Any]:
+        """Relevé CIBLÉ après une commande : `/player/state`, plus `/player` si la chaîne a pu changer.
+
+        Une commande ne touche que la lecture : ni `/api/v1/info` ni le catalogue n'ont à être
+        relus. Renvoie les seules sections relevées, à fusionner dans les données du
+        coordinator. Contrairement à `get_playback_state`, une erreur LÈVE : un état vide
+        fusionné effacerait l'état courant.
+        """
+        if not include_player:
+            return {"playback_state": await self._request("/api/v1/player/state", timeout=6)}
+        player_status, playback_state = await asyncio.gather(
+            self.get_player_status(),
+            self._request("/api/v1/player/state", timeout=6),
+        )
+        return {"player": player_status, "playback_state": playback_state}
+
     async def play_channel(self, channel_id: str) -> bool:
         session = await self._ensure_session()
         url = f"{self._base_url}/api/v1/player/play"
@@ -263,12 +778,14 @@ class NoopyTVAPI:
         headers = {"Content-Type": "application/json", **self._auth_headers()}
 
         try:
-            async with session.post(url, json={"channel_id": channel_id}, headers=headers) as response:
+            async with self._gate.slot(PRIORITY_COMMAND), session.post(
+                url, json={"channel_id": channel_id}, headers=headers
+            ) as response:
                 if response.status == 200:
-                    result = await response.json()
+                    result = decode_body(await response.read()) or {}
                     return result.get("success", False)
                 return False
-        except aiohttp.ClientError as err:
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as err:
             _LOGGER.error("Erreur lors du changement de chaîne: %s", err)
             return False
 
@@ -294,7 +811,9 @@ class NoopyTVAPI:
 
         req_timeout = aiohttp.ClientTimeout(connect=3, total=10)
         try:
-            async with session.post(url, json=payload, headers=headers, timeout=req_timeout) as response:
+            async with self._gate.slot(PRIORITY_COMMAND), session.post(
+                url, json=payload, headers=headers, timeout=req_timeout
+            ) as response:
                 if response.status == 404:
                     # Ancienne version de l'app : l'endpoint commandes n'existe pas encore.
                     raise NoopyTVAPIError(
@@ -302,11 +821,15 @@ class NoopyTVAPI:
                     )
                 if response.status != 200:
                     raise NoopyTVAPIError(f"Erreur HTTP {response.status} sur send_command({command})")
-                return await response.json()
+                return decode_body(await response.read()) or {}
         except aiohttp.ClientConnectorError as err:
             raise NoopyTVConnectionError(f"Impossible de se connecter à OneTV: {err}") from err
+        except asyncio.TimeoutError as err:
+            raise NoopyTVConnectionError(f"OneTV ne répond pas à send_command({command})") from err
         except aiohttp.ClientError as err:
             raise NoopyTVAPIError(f"Erreur de connexion: {err}") from err
+        except ValueError as err:
+            raise NoopyTVAPIError(f"Réponse JSON invalide sur send_command({command}): {err}") from err
 
     async def get_movies(self) -> list[dict[str, Any]]:
         """Catalogue films groupé par catégorie (`/api/v1/movies`).
@@ -316,7 +839,9 @@ class NoopyTVAPI:
         ⚠️ Le serveur plafonne à 100 films par catégorie.
         """
         try:
-            data = await self._request("/api/v1/movies", timeout=20)
+            data = await self._request(
+                "/api/v1/movies", timeout=20, pool="catalog", priority=PRIORITY_BROWSE
+            )
         except NoopyTVAPIError as err:
             _LOGGER.debug("get_movies failed: %s", err)
             return []
@@ -325,7 +850,9 @@ class NoopyTVAPI:
     async def get_series(self) -> list[dict[str, Any]]:
         """Catalogue séries groupé par catégorie (`/api/v1/series`) — même shape, clé `series`."""
         try:
-            data = await self._request("/api/v1/series", timeout=20)
+            data = await self._request(
+                "/api/v1/series", timeout=20, pool="catalog", priority=PRIORITY_BROWSE
+            )
         except NoopyTVAPIError as err:
             _LOGGER.debug("get_series failed: %s", err)
             return []
@@ -340,7 +867,12 @@ class NoopyTVAPI:
         rappelle un instant plus tard. Un serveur plus ancien renvoie 404 : `(False, [])`.
         """
         try:
-            data = await self._request(f"/api/v1/series/{series_id}/episodes", timeout=10)
+            data = await self._request(
+                f"/api/v1/series/{series_id}/episodes",
+                timeout=10,
+                pool="catalog",
+                priority=PRIORITY_BROWSE,
+            )
         except NoopyTVAPIError as err:
             _LOGGER.debug("get_series_episodes(%s) failed: %s", series_id, err)
             return False, []
@@ -355,24 +887,35 @@ class NoopyTVAPI:
         """
         kind = "movies" if is_movies else "series"
         try:
-            data = await self._request(f"/api/v1/{kind}/{quote(category_id, safe='')}", timeout=15)
+            data = await self._request(
+                f"/api/v1/{kind}/{quote(category_id, safe='')}",
+                timeout=15,
+                pool="catalog",
+                priority=PRIORITY_BROWSE,
+            )
         except NoopyTVAPIError as err:
             _LOGGER.debug("get_vod_category(%s, %s) failed: %s", kind, category_id, err)
             return False, []
         return bool(data.get("loading")), data.get("items", []) or []
 
-    async def get_favorites(self) -> list[dict[str, Any]]:
+    async def get_favorites(self, priority: int = PRIORITY_BROWSE) -> list[dict[str, Any]]:
         """Chaînes favorites (app >= 2026-08)."""
         try:
-            data = await self._request("/api/v1/favorites", timeout=10)
+            data = await self._request(
+                "/api/v1/favorites", timeout=10, pool="catalog", priority=priority
+            )
         except NoopyTVAPIError:
             return []
         return data.get("channels", []) or []
 
-    async def get_continue_watching(self) -> list[dict[str, Any]]:
+    async def get_continue_watching(
+        self, priority: int = PRIORITY_BROWSE
+    ) -> list[dict[str, Any]]:
         """Films et épisodes commencés, du plus récent au plus ancien (app >= 2026-08)."""
         try:
-            data = await self._request("/api/v1/continue-watching", timeout=10)
+            data = await self._request(
+                "/api/v1/continue-watching", timeout=10, pool="catalog", priority=priority
+            )
         except NoopyTVAPIError:
             return []
         return data.get("items", []) or []
@@ -387,12 +930,17 @@ class NoopyTVAPI:
         Le serveur (tvOS uniquement) émet `event: <kind>\\ndata: <json>\\n\\n` avec
         kind ∈ snapshot | channel.start | channel.change | channel.stop | sport.context,
         plus un commentaire `: ping` toutes les 10 s. Sur iOS le serveur répond 501.
+        Le dernier `id:` reçu est renvoyé en `Last-Event-ID` à la connexion suivante, et le
+        délai `retry:` annoncé est exposé par `sse_retry` (cf. sse.py).
 
         Lève `NoopyTVConnectionError` / `NoopyTVAPIError` — l'appelant gère la reconnexion.
         """
-        session = await self._ensure_session()
+        session = await self._ensure_session("events")
         url = f"{self._base_url}/api/v1/events/stream"
         headers = {"Accept": "text/event-stream", **self._auth_headers()}
+        if self._sse.last_event_id:
+            # Reprise : l'app rejoue ce qui a été émis depuis le dernier évènement reçu.
+            headers["Last-Event-ID"] = self._sse.last_event_id
         # Flux long : pas de timeout total, seulement la connexion. `sock_read` sert de
         # détecteur de mort du lien — le heartbeat serveur tombe toutes les 10 s, donc
         # 45 s sans le moindre octet = lien perdu.
@@ -410,33 +958,18 @@ class NoopyTVAPI:
                 _LOGGER.debug("OneTV: flux SSE connecté (%s)", url)
                 if on_connected is not None:
                     on_connected()
-                event_name = "message"
-                data_lines: list[str] = []
-
-                async for raw_line in response.content:
-                    line = raw_line.decode("utf-8", errors="ignore").rstrip("\r\n")
-
-                    if line.startswith(":"):
-                        continue  # heartbeat / commentaire
-                    if line.startswith("event:"):
-                        event_name = line[len("event:"):].strip()
-                        continue
-                    if line.startswith("data:"):
-                        data_lines.append(line[len("data:"):].strip())
-                        continue
-                    if line == "":
-                        if data_lines:
-                            payload: dict[str, Any] = {}
-                            raw = "\n".join(data_lines)
-                            try:
-                                decoded = json.loads(raw)
-                                if isinstance(decoded, dict):
-                                    payload = decoded
-                            except ValueError:
-                                _LOGGER.debug("SSE: payload non-JSON ignoré (%s)", raw[:120])
-                            on_event(event_name, payload)
-                        event_name = "message"
-                        data_lines = []
+                parser = self._sse
+                parser.reset()
+                async for chunk in response.content.iter_any():
+                    for event in parser.feed(chunk):
+                        payload: dict[str, Any] = {}
+                        try:
+                            decoded = json_loads(event.data)
+                            if isinstance(decoded, dict):
+                                payload = decoded
+                        except ValueError:
+                            _LOGGER.debug("SSE: payload non-JSON ignoré (%s)", event.data[:120])
+                        on_event(event.name, payload)
         except asyncio.TimeoutError as err:
             raise NoopyTVConnectionError(f"SSE timeout: {err}") from err
         except aiohttp.ClientConnectorError as err:
@@ -446,7 +979,7 @@ class NoopyTVAPI:
 
     async def get_channel_detail(self, channel_id: str) -> dict[str, Any] | None:
         try:
-            data = await self._request(f"/api/v1/channel/{channel_id}")
+            data = await self._request(f"/api/v1/channel/{channel_id}", priority=PRIORITY_BROWSE)
             return data
         except NoopyTVAPIError:
             return None
@@ -461,25 +994,46 @@ class NoopyTVAPI:
           2. `player` + `playback_state` (petits, temps réel) sont fetchés en parallèle à CHAQUE tick.
           3. La liste lourde n'est fetchée que si la génération/les compteurs ont changé ; sinon on
              réutilise le cache → la chaîne en cours reste fluide sans marteler le catalogue.
+
+        Les relevés 1 et 2 tiennent dans un budget (`_TICK_BUDGET`) : un `/player/state` figé
+        ne fait plus échouer tout le tick quand `/player` a répondu — il est servi depuis sa
+        dernière valeur, dont l'âge est rapporté dans `stale`, pendant `_MAX_STALE` au plus.
         """
-        # 1) Détecteur de changement bon marché.
-        info: dict[str, Any] = {}
-        try:
-            info = await self.get_info()
-        except NoopyTVAPIError:
-            info = {}
+        # 0) App fermée (disjoncteur ouvert) : plus de salve de trois requêtes qui attendent
+        # chacune le timeout de connexion, seulement une sonde `/api/v1/info`, espacée.
+        endpoints = list(_REALTIME_ENDPOINTS)
+        probed: dict[str, Any] | None = None
+        if self._circuit.is_open:
+            if not self._circuit.probe_due():
+                raise NoopyTVConnectionError("OneTV injoignable (prochaine sonde en attente)")
+            try:
+                probed = await self.get_info(timeout=_PROBE_TIMEOUT)
+            except NoopyTVAPIError as err:
+                self._circuit.record_failure()
+                raise NoopyTVConnectionError(f"OneTV injoignable: {err}") from err
+            self._last_ok["info"] = (probed, monotonic())
+            endpoints.remove("info")
+
+        # 1) + 2) `/api/v1/info` (détecteur de changement bon marché), `player` et
+        # `playback_state` (temps réel, petits payloads) : en parallèle, dans le budget du tick.
+        values, stale = await self._fetch_realtime(endpoints, answered=probed is not None)
+        if probed is not None:
+            values["info"] = probed
+        info: dict[str, Any] = values.get("info") or {}
+        info_fresh = "info" in values and "info" not in stale
+        player_status = values.get("player") or {}
+        playback_state = values.get("playback_state") or {}
         generation = info.get("channels_generation")
         total_ch = info.get("total_channels")
         total_cat = info.get("total_categories")
 
-        # 2) Player + playback_state : toujours, en parallèle (temps réel, petits payloads).
-        player_status, playback_state = await asyncio.gather(
-            self.get_player_status(),
-            self.get_playback_state(),
-        )
-
         # 3) Décide si la liste lourde doit être re-fetchée.
-        if generation is not None:
+        if not info_fresh:
+            # Sans `/api/v1/info` à jour, rien ne dit que le catalogue a changé : on garde le
+            # cache (auparavant, un `info` manquant passait pour un changement de compteurs
+            # et relançait le téléchargement complet).
+            channels_changed = False
+        elif generation is not None:
             channels_changed = generation != self._last_generation
         else:
             # Serveur ancien sans génération → repli sur les compteurs.
@@ -509,14 +1063,7 @@ class NoopyTVAPI:
                     "order": channel.order,
                 }
                 if channel.current_program:
-                    cd.update({
-                        "current_program": channel.current_program.get("title"),
-                        "current_program_start": channel.current_program.get("start"),
-                        "current_program_end": channel.current_program.get("end"),
-                        "current_program_description": channel.current_program.get("description"),
-                        "current_program_icon": channel.current_program.get("icon_url"),
-                        "progress_percent": channel.current_program.get("progress_percent", 0),
-                    })
+                    cd.update(_flatten_program(channel.current_program))
                 channels_data[channel.id] = cd
 
             self._cached_channels_data = channels_data
@@ -536,8 +1083,92 @@ class NoopyTVAPI:
             "total_categories": len(self._cached_categories_data),
             "player": player_status,
             "playback_state": playback_state,
+            # Sections servies depuis une réponse antérieure → leur âge en secondes.
+            "stale": stale,
         }
 
+    def _realtime_task(self, name: str) -> asyncio.Task:
+        """Requête en vol pour `name`, ou une nouvelle : jamais deux à la fois par endpoint."""
+        task = self._inflight.get(name)
+        if task is None or task.done():
+            if name == "info":
+                coro = self.get_info(timeout=6)
+            else:
+                coro = self._request(_REALTIME_ENDPOINTS[name], timeout=6)
+            task = self._create_task(coro, f"noopy_tv_realtime_{name}")
+            task.add_done_callback(partial(self._on_realtime_done, name))
+            self._inflight[name] = task
+        return task
+
+    def _on_realtime_done(self, name: str, task: asyncio.Task) -> None:
+        if self._inflight.get(name) is task:
+            del self._inflight[name]
+        if task.cancelled():
+            return
+        if task.exception() is None:  # lue dans tous les cas : pas d'exception orpheline
+            # Y compris une réponse arrivée APRÈS son tick : elle sert au suivant.
+            self._last_ok[name] = (task.result(), monotonic())
+
+    async def _fetch_realtime(
+        self, endpoints: list[str], answered: bool = False
+    ) -> tuple[dict[str, Any], dict[str, float]]:
+        """Relevés temps réel dans le budget du tick.
+
+        Renvoie les valeurs (fraîches, ou la dernière reçue à défaut) et l'âge de celles qui
+        ne sont pas fraîches. Un endpoint LENT (pas de réponse dans le budget) est distingué
+        d'un endpoint en ÉCHEC (erreur) dans `endpoint_health`. Le tick échoue si aucun n'a
+        répondu, ou si l'un d'eux n'a plus de valeur de moins de `_MAX_STALE`.
+
+        `answered` : l'app vient de répondre à la sonde du disjoncteur. Des relevés qui
+        échouent juste derrière (app en plein démarrage) ne comptent alors pas comme un échec
+        de plus : le disjoncteur reste fermé et le recul des sondes ne double pas.
+        """
+        tasks = {name: self._realtime_task(name) for name in endpoints}
+        if tasks:
+            await asyncio.wait(tasks.values(), timeout=_TICK_BUDGET)
+        now = monotonic()
+        values: dict[str, Any] = {}
+        stale: dict[str, float] = {}
+        errors: list[BaseException] = []
+        for name, task in tasks.items():
+            health = self._health[name]
+            if task.done() and not task.cancelled() and task.exception() is None:
+                values[name] = task.result()
+                health["status"] = "ok"
+                continue
+            if task.done():
+                error = task.exception() if not task.cancelled() else NoopyTVAPIError("annulée")
+                errors.append(error)
+                health["status"] = "failed"
+                health["failed"] += 1
+                health["last_error"] = str(error)
+            else:
+                health["status"] = "slow"
+                health["slow"] += 1
+                _LOGGER.debug(
+                    "OneTV: %s hors budget (%.0f s), dernière valeur servie", name, _TICK_BUDGET
+                )
+            last = self._last_ok.get(name)
+            if last is not None and now - last[1] <= _MAX_STALE:
+                values[name] = last[0]
+                stale[name] = round(now - last[1], 1)
+
+        if tasks and all(name in stale or name not in values for name in tasks):
+            # Aucune réponse fraîche. Des erreurs HTTP disent que l'app est là mais refuse ;
+            # des erreurs de connexion ou un silence complet, qu'elle est injoignable ou figée.
+            if any(not isinstance(error, NoopyTVConnectionError) for error in errors):
+                raise NoopyTVAPIError(f"Aucun relevé n'a abouti: {errors[0]}")
+            if not answered:
+                self._circuit.record_failure()
+            raise NoopyTVConnectionError(
+                f"OneTV ne répond pas ({errors[0] if errors else 'hors budget'})"
+            )
+        if missing := [name for name in tasks if name not in values]:
+            raise NoopyTVAPIError(
+                f"Pas de relevé de {', '.join(missing)} depuis plus de {_MAX_STALE:.0f} s"
+            )
+        return values, stale
+
     @property
     def channels(self) -> dict[str, NoopyChannel]:
         return self._channels
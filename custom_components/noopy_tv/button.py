@@ -110,14 +110,13 @@ class NoopyTVGoLiveButton(_NoopyTVButtonBase):
 
     async def async_press(self) -> None:
         try:
-            result = await self._api.send_command("seekToLive")
+            result = await self.coordinator.commands.async_send("seekToLive")
         except NoopyTVAPIError as err:
             raise HomeAssistantError(f"OneTV : retour au direct impossible — {err}") from err
         if not result.get("success", False):
             raise HomeAssistantError(
                 f"OneTV a refusé le retour au direct : {result.get('error') or result.get('message')}"
             )
-        await self.coordinator.async_request_refresh()
 
 
 class NoopyTVRefreshButton(_NoopyTVButtonBase):
@@ -0,0 +1,277 @@
+"""File des commandes envoyées au lecteur — une par appareil.
+
+Glisser le curseur de volume envoie une rafale de `setVolume` ; appuyer plusieurs fois sur
+« +30 s » une rafale de `seekRelative`. Chacune partait en POST séparé, suivi d'un relevé
+complet : le thread principal de l'app (qui exécute les commandes) traitait des dizaines
+de niveaux intermédiaires dont seul le dernier comptait.
+
+Les commandes passent désormais par une file servie une à une :
+
+- tant qu'une commande attend son tour, la suivante de même nature la REJOINT au lieu de
+  s'ajouter : le dernier `setVolume` / `seekAbsolute` l'emporte, les deltas de
+  `seekRelative` / `adjustVolume` s'additionnent ;
+- deux envois sont espacés d'au moins `_MIN_INTERVAL` ;
+- un seul relevé — ciblé, cf. `async_request_player_refresh` — suit la rafale, une fois
+  la file vide depuis `_SETTLE`.
+
+Chaque appelant reçoit la réponse de l'envoi qui a porté sa commande, fusionnée ou non.
+
+Une SUITE de commandes (service `send_commands`, cf. `async_run_batch`) prend UNE place
+dans la même file : rien ne s'intercale entre ses étapes (curseur de volume, boutons), qui
+partent dans l'ordre, espacées comme les autres, sans fusion ni relevé intermédiaire. Seules
+les commandes qui dépendent du contenu (pistes, déplacements) attendent qu'un contenu lancé
+plus haut dans la suite soit effectivement monté.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import deque
+from dataclasses import dataclass, field
+from time import monotonic
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+
+from .api import NoopyTVAPI, NoopyTVAPIError
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+# Écart minimal entre deux commandes : de quoi laisser le thread principal de l'app
+# respirer, sans qu'un appui isolé n'attende de façon perceptible.
+_MIN_INTERVAL = 0.15
+# File vide depuis ce délai = rafale terminée → un seul relevé.
+_SETTLE = 0.3
+
+# Commande → comment deux occurrences consécutives se fusionnent.
+_LAST_WINS = frozenset({"setVolume", "seekAbsolute"})
+_SUMMED = {"seekRelative": "seconds", "adjustVolume": "delta"}
+
+# Commandes sans effet sur la chaîne ni sur le contenu : le relevé qui les suit se limite à
+# `/player/state`. Toute autre (zapping, arrêt, lancement d'un film…) relit aussi `/player`.
+_STATE_ONLY = frozenset(
+    {
+        "play",
+        "pause",
+        "togglePlayPause",
+        "seekRelative",
+        "seekAbsolute",
+        "seekToLive",
+        "setAudioTrack",
+        "setSubtitleTrack",
+        "setVolume",
+        "adjustVolume",
+        "toggleMute",
+    }
+)
+
+
+# Commandes qui remplacent le contenu joué : pistes et durée de l'ancien ne valent plus.
+_STARTS_CONTENT = frozenset({"playMovie", "playEpisode", "nextChannel", "previousChannel"})
+# Commandes qui n'ont de sens qu'une fois le nouveau contenu monté.
+_NEEDS_CONTENT = frozenset({"setAudioTrack", "setSubtitleTrack", "seekRelative", "seekAbsolute"})
+# Attente maximale d'un contenu lancé dans une suite : au-delà, on envoie quand même.
+_READY_TIMEOUT = 20.0
+_READY_POLL = 0.5
+# Sans changement d'identifiant visible (relance du même film), délai au-delà duquel un
+# lecteur actif, hors buffering et avec ses pistes, est tenu pour prêt.
+_SAME_CONTENT_GRACE = 3.0
+
+
+Step = tuple[str, dict[str, Any] | None]
+
+
+@dataclass
+class _Pending:
+    command: str | None  # None pour une suite (`steps`)
+    params: dict[str, Any] | None
+    waiters: list[asyncio.Future] = field(default_factory=list)
+    steps: list[Step] | None = None
+
+
+def _merge(pending: _Pending, command: str, params: dict[str, Any] | None) -> bool:
+    """Fusionne `command` dans `pending` si c'est possible ; False sinon."""
+    if pending.command != command:
+        return False
+    if command in _LAST_WINS:
+        pending.params = params
+        return True
+    key = _SUMMED.get(command)
+    if key is None:
+        return False
+    previous = (pending.params or {}).get(key)
+    delta = (params or {}).get(key)
+    if not isinstance(previous, (int, float)) or not isinstance(delta, (int, float)):
+        return False
+    pending.params = {**(pending.params or {}), **(params or {}), key: previous + delta}
+    return True
+
+
+def _fail(waiters: list[asyncio.Future], err: Exception) -> None:
+    for waiter in waiters:
+        if not waiter.done():
+            waiter.set_exception(err)
+
+
+class NoopyTVCommandQueue:
+    """Sérialise, fusionne et espace les commandes d'un appareil."""
+
+    def __init__(
+        self, hass: HomeAssistant, api: NoopyTVAPI, coordinator: DataUpdateCoordinator
+    ) -> None:
+        self._hass = hass
+        self._api = api
+        self._coordinator = coordinator
+        self._pending: deque[_Pending] = deque()
+        self._worker: asyncio.Task | None = None
+        self._last_sent = 0.0
+        self._touches_player = False
+        self.sent = 0
+        self.merged = 0
+
+    async def async_send(
+        self, command: str, params: dict[str, Any] | None = None
+    ) -> dict[str, Any]:
+        """Met `command` en file et renvoie la réponse de l'app (cf. `send_command`).
+
+        Lève `NoopyTVAPIError` comme `send_command` si l'envoi échoue.
+        """
+        waiter: asyncio.Future = self._hass.loop.create_future()
+        if self._pending and _merge(self._pending[-1], command, params):
+            self.merged += 1
+            self._pending[-1].waiters.append(waiter)
+        else:
+            self._pending.append(_Pending(command, params, [waiter]))
+        self._ensure_worker()
+        return await waiter
+
+    def _ensure_worker(self) -> None:
+        if self._worker is None:
+            self._worker = self._hass.async_create_background_task(
+                self._drain(), name=f"{DOMAIN}_commands"
+            )
+
+    async def _drain(self) -> None:
+        try:
+            while True:
+                while self._pending:
+                    wait = self._last_sent + _MIN_INTERVAL - monotonic()
+                    if wait > 0:
+                        # Pendant cette attente, une rafale continue de se fusionner dans la
+                        # commande en tête de file.
+                        await asyncio.sleep(wait)
+                    await self._send(self._pending.popleft())
+                await asyncio.sleep(_SETTLE)
+                if self._pending:
+                    continue
+                touches_player, self._touches_player = self._touches_player, False
+                await self._coordinator.async_request_player_refresh(
+                    include_player=touches_player
+                )
+                # Une commande arrivée PENDANT le relevé a trouvé ce worker encore en place et
+                # n'en a pas lancé d'autre : c'est à lui de la servir. Entre ce test et le
+                # `finally`, plus aucun `await` — rien ne peut se glisser.
+                if not self._pending:
+                    break
+        finally:
+            self._worker = None
+
+    async def _send(self, pending: _Pending) -> None:
+        try:
+            if pending.steps is not None:
+                result: Any = await self._run_steps(pending.steps)
+            else:
+                self._last_sent = monotonic()
+                self.sent += 1
+                if pending.command not in _STATE_ONLY:
+                    self._touches_player = True
+                result = await self._api.send_command(pending.command, pending.params)
+        except asyncio.CancelledError:
+            _fail(pending.waiters, NoopyTVAPIError("Commande annulée"))
+            raise
+        except NoopyTVAPIError as err:
+            _fail(pending.waiters, err)
+            return
+        except Exception as err:  # noqa: BLE001 - la file doit survivre à une commande fautive
+            _LOGGER.exception("OneTV : commande %s en erreur", pending.command or "send_commands")
+            _fail(pending.waiters, NoopyTVAPIError(str(err)))
+            return
+        for waiter in pending.waiters:
+            if not waiter.done():
+                waiter.set_result(result)
+
+    async def async_run_batch(self, steps: list[Step]) -> list[dict[str, Any]]:
+        """Envoie `steps` dans l'ordre, d'un seul tenant dans la file ; un seul relevé à la fin.
+
+        S'arrête à la première commande refusée (sa réponse est la dernière renvoyée). Lève
+        `NoopyTVAPIError` si un envoi échoue.
+        """
+        waiter: asyncio.Future = self._hass.loop.create_future()
+        # Jamais fusionnée : `_merge` compare les commandes, une suite n'en porte pas.
+        self._pending.append(_Pending(None, None, [waiter], steps=list(steps)))
+        self._ensure_worker()
+        return await waiter
+
+    async def _run_steps(self, steps: list[Step]) -> list[dict[str, Any]]:
+        """Étapes d'une suite, exécutées par le worker : la file attend qu'elle soit finie."""
+        self._touches_player = True
+        results: list[dict[str, Any]] = []
+        started_from: str | None = None  # contenu joué AVANT le dernier lancement en attente
+        started_at = 0.0
+        awaiting_content = False
+        for command, params in steps:
+            if awaiting_content and command in _NEEDS_CONTENT:
+                await self._wait_for_content(started_from, started_at)
+                awaiting_content = False
+            if command in _STARTS_CONTENT:
+                state = ((self._coordinator.data or {}).get("playback_state")) or {}
+                started_from = state.get("contentId")
+            wait = self._last_sent + _MIN_INTERVAL - monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self._last_sent = monotonic()
+            self.sent += 1
+            result = await self._api.send_command(command, params)
+            results.append(result)
+            if not result.get("success", False):
+                break
+            if command in _STARTS_CONTENT:
+                started_at = monotonic()
+                awaiting_content = True
+        return results
+
+    async def _wait_for_content(self, previous_id: str | None, started_at: float) -> None:
+        """Attend que le contenu lancé soit monté : lecteur actif, hors buffering, pistes publiées."""
+        deadline = monotonic() + _READY_TIMEOUT
+        while monotonic() < deadline:
+            state = await self._api.get_playback_state()
+            if (
+                state.get("isPlayerActive")
+                and not state.get("isBuffering")
+                and state.get("audioTracks")
+                and (
+                    state.get("contentId") != previous_id
+                    or monotonic() - started_at >= _SAME_CONTENT_GRACE
+                )
+            ):
+                return
+            await asyncio.sleep(_READY_POLL)
+        _LOGGER.warning(
+            "OneTV : contenu toujours pas prêt après %.0f s, la suite est envoyée quand même",
+            _READY_TIMEOUT,
+        )
+
+    @callback
+    def async_stop(self) -> None:
+        """Déchargement : la file est abandonnée, les appelants en attente reçoivent une erreur."""
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+        while self._pending:
+            _fail(self._pending.popleft().waiters, NoopyTVAPIError("Commande annulée"))
+
+    def stats(self) -> dict[str, int]:
+        return {"sent": self.sent, "merged": self.merged, "queued": len(self._pending)}
@@ -22,6 +22,7 @@ from .const import (
     CONF_DEVICE_MODEL,
     CONF_ENABLE_CATEGORY_SELECTS,
     CONF_SUPPORTS_SSE,
+    CONF_THUMBNAIL_SPRITES,
     CONF_HOST,
     CONF_PORT,
     CONF_SCAN_INTERVAL,
@@ -157,6 +158,7 @@ class NoopyTVConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         # pour les versions antérieures.
         unique_id = self._unique_id_for_discovery()
         await self.async_set_unique_id(unique_id)
+        self._async_device_announced(unique_id)
         # `updates=` : si l'appareil est déjà connu, on met à jour son adresse au lieu
         # d'abandonner — c'est ce qui répare une IP qui a changé.
         self._abort_if_unique_id_configured(
@@ -206,6 +208,22 @@ class NoopyTVConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         return await self.async_step_zeroconf_confirm()
     
+    @callback
+    def _async_device_announced(self, unique_id: str) -> None:
+        """Une annonce Bonjour d'un appareil configuré = l'app vient (re)démarrer.
+
+        Si ses relevés étaient suspendus (disjoncteur ouvert, cf. `NoopyTVAPI.refresh_data`),
+        on les rétablit tout de suite au lieu d'attendre la prochaine sonde espacée.
+        """
+        for entry in self._async_current_entries(include_ignore=False):
+            if entry.unique_id != unique_id:
+                continue
+            data = self.hass.data.get(DOMAIN, {}).get(entry.entry_id)
+            if data is None:
+                continue
+            data["api"].reset_circuit()
+            self.hass.async_create_task(data["coordinator"].async_request_refresh())
+
     def _async_adopt_legacy_entry(self, unique_id: str) -> bool:
         """Rattache une entrée existante au nouvel identifiant. True si adoptée.
 
@@ -309,5 +327,9 @@ class NoopyTVOptionsFlowHandler(config_entries.OptionsFlow):
                     CONF_ENABLE_CATEGORY_SELECTS,
                     default=self.config_entry.options.get(CONF_ENABLE_CATEGORY_SELECTS, True),
                 ): bool,
+                vol.Optional(
+                    CONF_THUMBNAIL_SPRITES,
+                    default=self.config_entry.options.get(CONF_THUMBNAIL_SPRITES, False),
+                ): bool,
             }),
         )
@@ -22,6 +22,9 @@ CONF_DEVICE_MANUFACTURER = "device_manufacturer"
 CONF_SUPPORTS_SSE = "supports_sse"
 # Les 6 sélecteurs par catégorie restent à `unknown` en permanence et encombrent l'UI.
 CONF_ENABLE_CATEGORY_SELECTS = "enable_category_selects"
+# Vignettes du navigateur servies par planches (cf. sprites.py) : une URL stable par page au
+# lieu d'une URL signée par chaîne. Désactivé par défaut.
+CONF_THUMBNAIL_SPRITES = "thumbnail_sprites"
 CONF_APPLE_TV_SOURCE = "apple_tv_source"
 DEFAULT_APPLE_TV_SOURCE = "OneTV Connect"
 
@@ -31,6 +34,32 @@ DEFAULT_APPLE_TV_SOURCE = "OneTV Connect"
 SSE_FALLBACK_SCAN_INTERVAL_SECONDS = 60
 SSE_RECONNECT_MIN_DELAY = 5
 SSE_RECONNECT_MAX_DELAY = 300
+# Évènements du flux SSE relayés tels quels sur le bus de Home Assistant, dès leur lecture
+# (payload de l'app + `entry_id` / `device_id`) : une automatisation déclenchée sur un zap
+# n'attend plus le relevé ni l'écriture d'état qui suivent. `snapshot` (état initial à la
+# connexion) n'est pas une transition : il n'est pas relayé.
+EVENT_CHANNEL_STARTED = f"{DOMAIN}_channel_started"
+EVENT_CHANNEL_CHANGED = f"{DOMAIN}_channel_changed"
+EVENT_PLAYBACK_STOPPED = f"{DOMAIN}_playback_stopped"
+EVENT_SPORT_CONTEXT = f"{DOMAIN}_sport_context"
+SSE_BUS_EVENTS = {
+    "channel.start": EVENT_CHANNEL_STARTED,
+    "channel.change": EVENT_CHANNEL_CHANGED,
+    "channel.stop": EVENT_PLAYBACK_STOPPED,
+    "sport.context": EVENT_SPORT_CONTEXT,
+}
+# Plancher du délai `retry:` annoncé par le serveur : un `retry: 0` ne doit pas faire
+# boucler les tentatives de reconnexion.
+SSE_RETRY_FLOOR = 1
+# Ce qui arrive à la connexion n'est pas relayé sur le bus : l'état initial (étiqueté
+# `channel.change` quand une chaîne est en cours) puis, après une reprise `Last-Event-ID`,
+# les évènements rejoués. L'app les envoie d'une traite : tant que chacun suit le précédent
+# (ou la connexion) de moins de ce délai, en secondes, on est encore dans le rattrapage.
+SSE_REPLAY_WINDOW = 0.5
+
+# Relevé ciblé (`/player/state`) après une commande ou un évènement SSE : le premier part
+# aussitôt, ceux qui suivent dans ce délai sont regroupés en un seul.
+PLAYER_REFRESH_COOLDOWN = 0.5
 
 DEFAULT_PORT = 8765
 # ⚡️ v3.2.0 (2026-06-20) : 10s par défaut. Depuis le re-fetch CONDITIONNEL de la liste lourde
@@ -71,6 +100,12 @@ SERVICE_PLAY_CHANNEL = "play_channel"
 SERVICE_PLAY_MOVIE = "play_movie"
 SERVICE_PLAY_EPISODE = "play_episode"
 SERVICE_SEND_COMMAND = "send_command"
+SERVICE_SEND_COMMANDS = "send_commands"
+SERVICE_GET_GUIDE = "get_guide"
+
+# Signal (dispatcher) émis au déchargement d'une entrée, suffixé de son `entry_id` : les
+# abonnements websocket qui la suivent y prennent fin (cf. websocket_api.py).
+SIGNAL_ENTRY_UNLOADED = f"{DOMAIN}_entry_unloaded_{{}}"
 
 # Commandes acceptées par `noopy_tv.send_command`. Liste calquée sur le switch de
 # `AppModel.handleRemoteCommand` : une commande absente de ce switch renverrait un échec,
@@ -94,6 +129,10 @@ SUPPORTED_COMMANDS = [
     "toggleMute",
 ]
 
+# Commandes d'une suite `noopy_tv.send_commands` : les mêmes, plus le lancement d'un film ou
+# d'un épisode — c'est par là que commence une scène « soirée film ».
+BATCH_COMMANDS = [*SUPPORTED_COMMANDS, "playMovie", "playEpisode"]
+
 ATTR_IS_PLAYING = "is_playing"
 ATTR_PLAYER_ACTIVE = "player_active"
 ATTR_CURRENT_CHANNEL = "current_channel"
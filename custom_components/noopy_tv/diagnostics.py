@@ -2,7 +2,7 @@
 
 Évite les allers-retours « envoie-moi tes logs » : tout ce qui sert à comprendre un
 problème (identité de l'appareil, état du flux push, cadence de sondage, forme du dernier
-payload) est réuni en un fichier.
+payload, guide des programmes, file des visuels) est réuni en un fichier.
 
 ⚠️ `api_key` est expurgée : elle donne un accès complet à l'API de l'app sur le réseau local.
 """
@@ -16,6 +16,8 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 
 from .const import CONF_API_KEY, DOMAIN
+from .image_pipeline import async_get_image_pipeline
+from .jsoncodec import JSON_BACKEND
 
 TO_REDACT = {CONF_API_KEY, "api_key", "apiKey"}
 
@@ -43,6 +45,7 @@ async def async_get_config_entry_diagnostics(
         "server_info": async_redact_data(dict(getattr(api, "info", {}) or {}), TO_REDACT),
         "coordinator": {
             "last_update_success": coordinator.last_update_success,
+            "circuit": api.circuit,
             "update_interval_seconds": (
                 coordinator.update_interval.total_seconds()
                 if coordinator.update_interval
@@ -52,6 +55,16 @@ async def async_get_config_entry_diagnostics(
         "push": {
             "connected": bool(sse is not None and sse.connected),
         },
+        # Connexions ouvertes / réutilisées par pool : un `created` qui suit `reused` de près
+        # trahit un keep-alive coupé par le réseau ou l'app.
+        "connections": api.pool_stats(),
+        "json_backend": JSON_BACKEND,
+        # Gros endpoints : octets reçus (compressés) / décompressés, et encodage négocié.
+        "transfers": api.transfer_stats(),
+        "request_priorities": api.priority_stats(),
+        # Relevés temps réel : « slow » = hors budget du tick (dernière valeur servie),
+        # « failed » = erreur.
+        "endpoints": api.endpoint_health(),
         "counts": {
             "channels": len(channels),
             "categories": len(payload.get("categories") or {}),
@@ -59,4 +72,10 @@ async def async_get_config_entry_diagnostics(
         "player": payload.get("player"),
         "playback_state": payload.get("playback_state"),
         "channels_sample": sample,
+        "epg": coordinator.epg.stats(),
+        # Horloge de position : dérive mesurée au dernier relevé, ticks sautés en VOD.
+        "position_clock": coordinator.position.stats(),
+        "commands": coordinator.commands.stats(),
+        # File d'attente et cache des visuels : de quoi régler les bornes de la chaîne.
+        "image_pipeline": async_get_image_pipeline(hass).stats(),
     }
@@ -0,0 +1,542 @@
+"""Guide des programmes (EPG) : stockage compact et recherche « maintenant / ensuite ».
+
+Jusqu'ici, la seule donnée EPG était l'instantané `current_program` pris au dernier
+téléchargement du catalogue — figé jusqu'au re-fetch suivant, et sans aucun « ensuite ».
+
+Le guide est rangé par chaîne dans des tableaux TRIÉS de débuts et de fins (`array('d')`,
+secondes epoch). « Maintenant », « ensuite » et « à l'instant t » sont des recherches
+dichotomiques : O(log n) par chaîne interrogée, sans jamais parcourir le guide. 60 000
+chaînes × 48 h, c'est plus d'un million de programmes — les parcourir à chaque tick du
+coordinator n'est pas envisageable, les interroger l'est.
+
+Deux sources :
+- `/api/v1/epg?hours=` (fenêtre du guide, apps récentes), chargé hors boucle d'événements
+  et rangé dans un fichier projeté en mémoire (cf. guide_cache.py) ;
+- à défaut, les instantanés `current_program` du catalogue, qui amorcent le « maintenant »,
+  tenus à jour par `/api/v1/now` entre deux téléchargements du catalogue.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from array import array
+from bisect import bisect_right
+from collections.abc import Iterable
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.util import dt as dt_util
+
+from .api import NoopyProgram, NoopyTVAPI, NoopyTVAPIError
+from .playback import playlist_order
+from .const import DOMAIN
+from .guide_cache import GuideFile, GuideRows, Row, open_guide_file, write_guide_file
+
+_LOGGER = logging.getLogger(__name__)
+
+# Fenêtre demandée à l'app, et cadence de rechargement : la moitié de la fenêtre restant
+# toujours devant nous, un rechargement toutes les heures suffit largement.
+EPG_WINDOW_HOURS = 48
+_RELOAD_INTERVAL = timedelta(hours=1)
+# Programme en cours de toutes les chaînes (`/api/v1/now`) : quelques centaines d'octets par
+# chaîne, sans commune mesure avec le catalogue — mais inutile plus souvent qu'un programme
+# ne change.
+_NOW_INTERVAL = timedelta(minutes=5)
+# Les programmes terminés depuis plus longtemps sont oubliés.
+_KEEP_PAST = timedelta(hours=3)
+# Requêtes du guide (`noopy_tv.get_guide`, websocket `noopy_tv/guide`) : une page couvre au
+# plus GUIDE_MAX_LIMIT chaînes sur au plus GUIDE_MAX_WINDOW.
+GUIDE_DEFAULT_LIMIT = 50
+GUIDE_MAX_LIMIT = 200
+GUIDE_DEFAULT_WINDOW = timedelta(hours=3)
+GUIDE_MAX_WINDOW = timedelta(hours=24)
+
+
+def _timestamp(value: Any) -> float | None:
+    """Secondes epoch depuis un horodatage ISO 8601 ou un nombre (secondes epoch)."""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str) and value:
+        parsed = dt_util.parse_datetime(value)
+        if parsed is not None:
+            if parsed.tzinfo is None:
+                parsed = parsed.replace(tzinfo=timezone.utc)
+            return parsed.timestamp()
+    return None
+
+
+class _ChannelGuide:
+    """Programmes d'une chaîne, triés par début et sans chevauchement."""
+
+    __slots__ = ("starts", "ends", "titles", "descriptions", "icons")
+
+    def __init__(self) -> None:
+        self.starts = array("d")
+        self.ends = array("d")
+        self.titles: list[str] = []
+        self.descriptions: list[str | None] = []
+        self.icons: list[str | None] = []
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def index_at(self, ts: float) -> int | None:
+        """Rang du programme diffusé à `ts`, s'il y en a un."""
+        index = bisect_right(self.starts, ts) - 1
+        if index >= 0 and ts < self.ends[index]:
+            return index
+        return None
+
+    def index_after(self, ts: float) -> int | None:
+        """Rang du premier programme qui commence APRÈS `ts`."""
+        index = bisect_right(self.starts, ts)
+        return index if index < len(self.starts) else None
+
+    def row(self, index: int) -> Row:
+        return (
+            self.starts[index],
+            self.ends[index],
+            self.titles[index],
+            self.descriptions[index],
+            self.icons[index],
+        )
+
+    def insert(
+        self, start: float, end: float, title: str, description: str | None, icon: str | None
+    ) -> bool:
+        """Insère un programme à sa place ; refusé s'il chevauche un programme connu."""
+        index = bisect_right(self.starts, start)
+        if index > 0 and self.ends[index - 1] > start:
+            return False
+        if index < len(self.starts) and self.starts[index] < end:
+            return False
+        self.starts.insert(index, start)
+        self.ends.insert(index, end)
+        self.titles.insert(index, title)
+        self.descriptions.insert(index, description)
+        self.icons.insert(index, icon)
+        return True
+
+    def prune(self, before: float) -> None:
+        """Oublie les programmes terminés avant `before`."""
+        # Les fins sont triées elles aussi (programmes sans chevauchement).
+        count = bisect_right(self.ends, before)
+        if count:
+            del self.starts[:count]
+            del self.ends[:count]
+            del self.titles[:count]
+            del self.descriptions[:count]
+            del self.icons[:count]
+
+
+def build_guides(raw: Any, not_before: float) -> dict[str, _ChannelGuide]:
+    """Construit les guides depuis la réponse de `/api/v1/epg` — à exécuter HORS boucle.
+
+    Formes acceptées : `{"channels": {id: [programme, …]}}` ou
+    `{"channels": [{"channel_id": id, "programmes": [programme, …]}]}`, un programme
+    portant `title`, `start`, `end` et, en option, `description` / `icon_url`.
+    """
+    channels = (raw or {}).get("channels") if isinstance(raw, dict) else None
+    if isinstance(channels, dict):
+        items: Iterable[tuple[Any, Any]] = channels.items()
+    elif isinstance(channels, list):
+        items = (
+            (entry.get("channel_id") or entry.get("id"), entry.get("programmes") or entry.get("programs"))
+            for entry in channels
+            if isinstance(entry, dict)
+        )
+    else:
+        return {}
+
+    # Un même titre (« Journal », « Météo ») revient des milliers de fois : une seule chaîne
+    # Python pour toutes ses occurrences.
+    interned: dict[str, str] = {}
+    guides: dict[str, _ChannelGuide] = {}
+    for channel_id, programmes in items:
+        if not channel_id or not isinstance(programmes, list):
+            continue
+        rows = []
+        for programme in programmes:
+            if not isinstance(programme, dict):
+                continue
+            start = _timestamp(programme.get("start"))
+            end = _timestamp(programme.get("end"))
+            if start is None or end is None or end <= start or end < not_before:
+                continue
+            title = str(programme.get("title") or "")
+            rows.append(
+                (
+                    start,
+                    end,
+                    interned.setdefault(title, title),
+                    programme.get("description") or programme.get("desc"),
+                    programme.get("icon_url") or programme.get("iconURL"),
+                )
+            )
+        if not rows:
+            continue
+        rows.sort(key=lambda row: row[0])
+        guide = _ChannelGuide()
+        for start, end, title, description, icon in rows:
+            # Chevauchement dans la source (guides XMLTV fusionnés) : le premier l'emporte.
+            if guide.ends and start < guide.ends[-1]:
+                continue
+            guide.starts.append(start)
+            guide.ends.append(end)
+            guide.titles.append(title)
+            guide.descriptions.append(description)
+            guide.icons.append(icon)
+        guides[str(channel_id)] = guide
+    return guides
+
+
+class EpgStore:
+    """Guide de toutes les chaînes, interrogeable par chaîne en O(log n).
+
+    Le guide chargé depuis l'app vit dans un fichier projeté en mémoire (cf.
+    guide_cache.py) ; seuls les instantanés `current_program` des chaînes qu'il ne couvre
+    pas restent en mémoire.
+    """
+
+    def __init__(self) -> None:
+        self._file: GuideFile | None = None
+        self._guides: dict[str, _ChannelGuide] = {}
+        self.loaded_at: datetime | None = None
+
+    def attach(self, guide_file: GuideFile) -> None:
+        """Bascule sur un nouveau fichier de guide (d'un bloc) et ferme le précédent."""
+        previous, self._file = self._file, guide_file
+        # Le guide l'emporte sur les instantanés des chaînes qu'il couvre.
+        self._guides = {
+            channel_id: guide
+            for channel_id, guide in self._guides.items()
+            if channel_id not in guide_file
+        }
+        self.loaded_at = guide_file.built_at
+        if previous is not None:
+            previous.close()
+
+    def replace(self, guides: dict[str, _ChannelGuide]) -> None:
+        """Guide gardé en mémoire — repli quand le fichier ne peut pas être écrit."""
+        self._guides = guides
+        self.loaded_at = dt_util.utcnow()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def seed_from_channels(self, channels: dict[str, dict[str, Any]]) -> None:
+        """Amorce le « maintenant » depuis les instantanés `current_program` du catalogue.
+
+        Un programme déjà connu (guide chargé) l'emporte : l'instantané est ignoré s'il le
+        chevauche, ou si le fichier du guide couvre la chaîne.
+        """
+        horizon = (dt_util.utcnow() - _KEEP_PAST).timestamp()
+        for guide in self._guides.values():
+            guide.prune(horizon)
+        for channel_id, channel in channels.items():
+            if self._file is not None and channel_id in self._file:
+                continue
+            title = channel.get("current_program")
+            if isinstance(title, dict):  # forme brute de /api/v1/player
+                programme = title
+                title = programme.get("title")
+                start, end = programme.get("start"), programme.get("end")
+                description, icon = programme.get("description"), programme.get("icon_url")
+            else:
+                start = channel.get("current_program_start")
+                end = channel.get("current_program_end")
+                description = channel.get("current_program_description")
+                icon = channel.get("current_program_icon")
+            start_ts, end_ts = _timestamp(start), _timestamp(end)
+            if not title or start_ts is None or end_ts is None or end_ts <= start_ts:
+                continue
+            if end_ts < horizon:
+                continue  # instantané périmé (catalogue non re-téléchargé depuis des heures)
+            guide = self._guides.get(channel_id)
+            if guide is None:
+                guide = self._guides[channel_id] = _ChannelGuide()
+            guide.insert(start_ts, end_ts, str(title), description, icon)
+
+    def _rows(self, channel_id: str) -> GuideRows | None:
+        if self._file is not None:
+            rows = self._file.channel(channel_id)
+            if rows is not None:
+                return rows
+        return self._guides.get(channel_id)
+
+    def __len__(self) -> int:
+        return len(self._guides) + (len(self._file) if self._file is not None else 0)
+
+    @property
+    def programme_count(self) -> int:
+        in_memory = sum(len(guide) for guide in self._guides.values())
+        return in_memory + (self._file.record_count if self._file is not None else 0)
+
+    @staticmethod
+    def _programme(channel_id: str, row: Row) -> NoopyProgram:
+        start_ts, end_ts, title, description, icon = row
+        start = datetime.fromtimestamp(start_ts, timezone.utc)
+        end = datetime.fromtimestamp(end_ts, timezone.utc)
+        now = dt_util.utcnow()
+        total = (end - start).total_seconds()
+        progress = (now - start).total_seconds() / total * 100 if total > 0 else 0.0
+        return NoopyProgram(
+            id=f"{channel_id}:{int(start_ts)}",
+            title=title,
+            start=start,
+            end=end,
+            description=description,
+            icon_url=icon,
+            progress_percent=round(max(0.0, min(100.0, progress)), 1),
+        )
+
+    def at(self, channel_id: str, when: datetime) -> NoopyProgram | None:
+        """Programme diffusé sur `channel_id` à l'instant `when`."""
+        rows = self._rows(channel_id)
+        if rows is None:
+            return None
+        index = rows.index_at(when.timestamp())
+        return None if index is None else self._programme(channel_id, rows.row(index))
+
+    def now(self, channel_id: str) -> NoopyProgram | None:
+        return self.at(channel_id, dt_util.utcnow())
+
+    def next(self, channel_id: str, after: datetime | None = None) -> NoopyProgram | None:
+        """Premier programme qui commence après `after` (par défaut : maintenant)."""
+        rows = self._rows(channel_id)
+        if rows is None:
+            return None
+        index = rows.index_after((after or dt_util.utcnow()).timestamp())
+        return None if index is None else self._programme(channel_id, rows.row(index))
+
+    def window(self, channel_id: str, start: datetime, end: datetime) -> list[NoopyProgram]:
+        """Programmes de `channel_id` qui recoupent [start, end), dans l'ordre."""
+        rows = self._rows(channel_id)
+        if rows is None:
+            return []
+        start_ts, end_ts = start.timestamp(), end.timestamp()
+        # Premier programme concerné : celui en cours à `start`, sinon le suivant.
+        index = rows.index_at(start_ts)
+        if index is None:
+            index = rows.index_after(start_ts)
+        programmes: list[NoopyProgram] = []
+        while index is not None and index < len(rows):
+            row = rows.row(index)
+            if row[0] >= end_ts:
+                break
+            programmes.append(self._programme(channel_id, row))
+            index += 1
+        return programmes
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "channels": len(self),
+            "programmes": self.programme_count,
+            "loaded_at": self.loaded_at.isoformat() if self.loaded_at else None,
+            "file_bytes": self._file.size if self._file is not None else None,
+        }
+
+
+def query_guide(
+    store: EpgStore,
+    channels: dict[str, dict[str, Any]],
+    *,
+    channel_ids: list[str] | None = None,
+    category: str | None = None,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    cursor: str | None = None,
+    limit: int = GUIDE_DEFAULT_LIMIT,
+) -> dict[str, Any]:
+    """Une page de la grille des programmes, servie uniquement depuis le guide indexé.
+
+    Chaînes : `channel_ids` dans l'ordre donné, sinon celles de `category`, sinon toutes —
+    dans l'ordre de la playlist. `cursor` est le rang de la première chaîne de la page
+    (renvoyé par la page précédente dans `next_cursor`, nul sur la dernière). Lève
+    `ValueError` sur une fenêtre ou un curseur invalide.
+    """
+    start = start or dt_util.utcnow()
+    end = end or start + GUIDE_DEFAULT_WINDOW
+    if end <= start:
+        raise ValueError("la fin de la fenêtre doit suivre son début")
+    if end - start > GUIDE_MAX_WINDOW:
+        raise ValueError(f"fenêtre limitée à {int(GUIDE_MAX_WINDOW.total_seconds() // 3600)} h")
+    try:
+        offset = int(cursor) if cursor else 0
+    except ValueError as err:
+        raise ValueError(f"curseur invalide : {cursor}") from err
+    if offset < 0:
+        raise ValueError(f"curseur invalide : {cursor}")
+    limit = max(1, min(limit, GUIDE_MAX_LIMIT))
+
+    if channel_ids:
+        selected = list(dict.fromkeys(channel_ids))
+    else:
+        ordered, _ = playlist_order(channels)
+        selected = (
+            [
+                channel_id
+                for channel_id in ordered
+                if (channels.get(channel_id) or {}).get("category") == category
+            ]
+            if category
+            else ordered
+        )
+
+    page = selected[offset : offset + limit]
+    rows = []
+    for channel_id in page:
+        channel = channels.get(channel_id) or {}
+        rows.append(
+            {
+                "channel_id": channel_id,
+                "name": channel.get("name"),
+                "logo_url": channel.get("logo_url"),
+                "programmes": [
+                    {
+                        "title": programme.title,
+                        "start": programme.start.isoformat(),
+                        "end": programme.end.isoformat(),
+                        "description": programme.description,
+                        "icon_url": programme.icon_url,
+                    }
+                    for programme in store.window(channel_id, start, end)
+                ],
+            }
+        )
+    next_offset = offset + limit
+    return {
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "total": len(selected),
+        "channels": rows,
+        "next_cursor": str(next_offset) if next_offset < len(selected) else None,
+    }
+
+
+class NoopyTVEpgLoader:
+    """Charge la fenêtre du guide depuis l'app et garde le store amorcé par le catalogue.
+
+    Deux rythmes, indépendants du catalogue : la fenêtre du guide toutes les heures, le
+    programme en cours de chaque chaîne toutes les cinq minutes.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        api: NoopyTVAPI,
+        coordinator: DataUpdateCoordinator,
+        store: EpgStore,
+        path: str,
+    ) -> None:
+        self._hass = hass
+        self._api = api
+        self._coordinator = coordinator
+        self._store = store
+        self._path = path
+        self._unsubs: list[CALLBACK_TYPE] = []
+        self._seeded_from: object | None = None
+        self._loading = False
+
+    @callback
+    def async_start(self) -> None:
+        self._unsubs.append(self._coordinator.async_add_listener(self._handle_coordinator_update))
+        self._unsubs.append(
+            async_track_time_interval(self._hass, self._async_load, _RELOAD_INTERVAL)
+        )
+        self._unsubs.append(
+            async_track_time_interval(self._hass, self._async_refresh_now, _NOW_INTERVAL)
+        )
+        self._hass.async_create_background_task(self._async_start(), name=f"{DOMAIN}_epg")
+
+    async def _async_start(self) -> None:
+        # Guide de la session précédente : disponible tout de suite, avant la première
+        # réponse de l'app. Trop vieux, il ne couvrirait même plus le « maintenant ».
+        guide_file = await self._hass.async_add_executor_job(open_guide_file, self._path)
+        if guide_file is not None:
+            if dt_util.utcnow() - guide_file.built_at < timedelta(hours=EPG_WINDOW_HOURS):
+                self._store.attach(guide_file)
+            else:
+                guide_file.close()
+        self._handle_coordinator_update()
+        await self._async_load()
+
+    @callback
+    def async_stop(self) -> None:
+        while self._unsubs:
+            self._unsubs.pop()()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        channels = (self._coordinator.data or {}).get("channels")
+        # Le dict `channels` n'est remplacé qu'au re-fetch du catalogue : comparer par
+        # identité évite de ré-amorcer 60 000 chaînes à chaque tick.
+        if channels and channels is not self._seeded_from:
+            self._seeded_from = channels
+            self._store.seed_from_channels(channels)
+
+    async def _async_refresh_now(self, _now: datetime | None = None) -> None:
+        """Rafraîchit le programme en cours des chaînes en cache, sur son propre rythme."""
+        if not self._coordinator.last_update_success:
+            return
+        try:
+            changed = await self._api.refresh_now_playing()
+        except (NoopyTVAPIError, asyncio.TimeoutError) as err:
+            # Rappel de minuteur : une exception ici finirait en tâche orpheline.
+            _LOGGER.debug("OneTV : programme en cours non rafraîchi (%s)", err)
+            return
+        if not changed:
+            return
+        channels = (self._coordinator.data or {}).get("channels") or {}
+        self._store.seed_from_channels(
+            {channel_id: channels[channel_id] for channel_id in changed if channel_id in channels}
+        )
+        _LOGGER.debug("OneTV : programme en cours mis à jour sur %d chaîne(s)", len(changed))
+        self._coordinator.async_update_listeners()
+
+    async def _async_load(self, _now: datetime | None = None) -> None:
+        if self._loading or not self._coordinator.last_update_success:
+            return
+        self._loading = True
+        try:
+            raw = await self._api.get_epg(EPG_WINDOW_HOURS)
+            if not raw:
+                return
+            not_before = (dt_util.utcnow() - _KEEP_PAST).timestamp()
+            # Un million de programmes à trier : hors de la boucle d'événements.
+            guides = await self._hass.async_add_executor_job(build_guides, raw, not_before)
+            try:
+                guide_file = await self._hass.async_add_executor_job(
+                    write_guide_file, self._path, guides
+                )
+            except OSError as err:
+                # Disque plein ou en lecture seule : le guide reste utilisable, en mémoire.
+                _LOGGER.warning("OneTV : guide non écrit sur disque (%s), gardé en mémoire", err)
+                self._store.replace(guides)
+            else:
+                self._store.attach(guide_file)
+            del guides
+            # Les chaînes absentes du guide gardent au moins leur instantané.
+            channels = (self._coordinator.data or {}).get("channels")
+            if channels:
+                self._store.seed_from_channels(channels)
+            _LOGGER.debug(
+                "OneTV : guide chargé (%d chaînes, %d programmes)",
+                len(self._store),
+                self._store.programme_count,
+            )
+            self._coordinator.async_update_listeners()
+        except asyncio.CancelledError:
+            raise
+        except Exception:  # noqa: BLE001 - un guide indisponible ne doit rien casser
+            _LOGGER.debug("OneTV : chargement du guide impossible", exc_info=True)
+        finally:
+            self._loading = False
@@ -0,0 +1,251 @@
+"""Guide des programmes sur disque, projeté en mémoire (`mmap`).
+
+Un guide de plusieurs jours pour une grosse playlist IPTV, ce sont des millions de
+programmes. Gardés en objets Python dans le processus de Home Assistant, ils pèsent des
+centaines de mégaoctets — sur un Raspberry Pi, c'est une bonne partie de la mémoire.
+
+Le guide est donc écrit dans un fichier binaire compact, puis projeté en mémoire : les
+recherches lisent directement le cache de pages du système, qui ne garde que les pages
+effectivement consultées (celles des quelques chaînes interrogées). Le fichier survit au
+redémarrage : le guide est disponible avant même la première réponse de l'app.
+
+Format (petit-boutiste) :
+
+    en-tête     magic "NTVG", version, nombres de chaînes / programmes / chaînes de
+                caractères, date de construction, positions des sections
+    index       par chaîne : (rang de son identifiant, premier programme, nombre)
+    programmes  enregistrements de taille fixe : début, fin (secondes epoch, double),
+                rangs du titre, de la description et de l'icône (0xFFFFFFFF = absent)
+    chaînes     positions (uint32) puis textes UTF-8 concaténés — chaque texte n'y figure
+                qu'une fois, quel que soit le nombre de programmes qui le portent
+
+Les programmes d'une chaîne sont contigus et triés par début : « maintenant » et
+« ensuite » restent des recherches dichotomiques, directement dans le fichier.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_right
+from collections.abc import Mapping
+from datetime import datetime, timezone
+from typing import Any, Protocol
+
+_MAGIC = b"NTVG"
+_VERSION = 1
+_HEADER = struct.Struct("<4sHHIIIdQQQQ")
+_INDEX = struct.Struct("<III")
+_RECORD = struct.Struct("<ddIII")
+_START = struct.Struct("<d")
+_OFFSETS = struct.Struct("<II")
+_NONE = 0xFFFFFFFF
+
+Row = tuple[float, float, str, str | None, str | None]
+
+
+class GuideRows(Protocol):
+    """Programmes d'une chaîne, triés par début — en mémoire ou dans le fichier."""
+
+    def __len__(self) -> int: ...
+
+    def index_at(self, ts: float) -> int | None: ...
+
+    def index_after(self, ts: float) -> int | None: ...
+
+    def row(self, index: int) -> Row: ...
+
+
+class GuideFile:
+    """Guide projeté en mémoire, en lecture seule."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with open(path, "rb") as handle:
+            self._mm = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            (
+                magic,
+                version,
+                _reserved,
+                n_channels,
+                self.record_count,
+                self._string_count,
+                built_at,
+                off_index,
+                self._off_records,
+                self._off_offsets,
+                self._off_blob,
+            ) = _HEADER.unpack_from(self._mm, 0)
+            if magic != _MAGIC or version != _VERSION:
+                raise ValueError(f"format de guide inconnu ({magic!r} v{version})")
+            self.built_at = datetime.fromtimestamp(built_at, timezone.utc)
+            # Seul l'index des chaînes est chargé : quelques Mo pour 60 000 chaînes, contre
+            # des centaines pour les programmes.
+            self._channels: dict[str, tuple[int, int]] = {}
+            for position in range(n_channels):
+                name, first, count = _INDEX.unpack_from(self._mm, off_index + position * _INDEX.size)
+                self._channels[self.string(name)] = (first, count)
+        except Exception:
+            self._mm.close()
+            raise
+
+    def __contains__(self, channel_id: str) -> bool:
+        return channel_id in self._channels
+
+    def __len__(self) -> int:
+        return len(self._channels)
+
+    @property
+    def size(self) -> int:
+        return len(self._mm)
+
+    def string(self, index: int) -> str:
+        start, end = _OFFSETS.unpack_from(self._mm, self._off_offsets + index * 4)
+        return self._mm[self._off_blob + start : self._off_blob + end].decode("utf-8")
+
+    def channel(self, channel_id: str) -> _FileRows | None:
+        bounds = self._channels.get(channel_id)
+        return None if bounds is None else _FileRows(self, *bounds)
+
+    def start_at(self, record: int) -> float:
+        return _START.unpack_from(self._mm, self._off_records + record * _RECORD.size)[0]
+
+    def record(self, record: int) -> Row:
+        start, end, title, description, icon = _RECORD.unpack_from(
+            self._mm, self._off_records + record * _RECORD.size
+        )
+        return (
+            start,
+            end,
+            self.string(title),
+            None if description == _NONE else self.string(description),
+            None if icon == _NONE else self.string(icon),
+        )
+
+    def close(self) -> None:
+        self._mm.close()
+
+
+class _FileRows:
+    """Vue sur les programmes d'une chaîne dans le fichier."""
+
+    __slots__ = ("_file", "_first", "_count")
+
+    def __init__(self, guide_file: GuideFile, first: int, count: int) -> None:
+        self._file = guide_file
+        self._first = first
+        self._count = count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _start(self, index: int) -> float:
+        return self._file.start_at(self._first + index)
+
+    def index_at(self, ts: float) -> int | None:
+        index = bisect_right(range(self._count), ts, key=self._start) - 1
+        if index >= 0 and ts < self.row(index)[1]:
+            return index
+        return None
+
+    def index_after(self, ts: float) -> int | None:
+        index = bisect_right(range(self._count), ts, key=self._start)
+        return index if index < self._count else None
+
+    def row(self, index: int) -> Row:
+        return self._file.record(self._first + index)
+
+
+def write_guide_file(path: str, guides: Mapping[str, GuideRows]) -> GuideFile:
+    """Écrit le guide puis l'ouvre — à exécuter HORS boucle d'événements.
+
+    Écriture dans un fichier temporaire puis `os.replace` : un guide déjà projeté par
+    ailleurs reste lisible (l'ancien fichier vit tant qu'il est ouvert), et un arrêt
+    brutal ne laisse jamais un guide à moitié écrit.
+    """
+    strings: dict[str, int] = {}
+
+    def intern(value: Any) -> int:
+        if value is None:
+            return _NONE
+        text = str(value)
+        index = strings.get(text)
+        if index is None:
+            index = strings[text] = len(strings)
+        return index
+
+    channel_ids = list(guides)
+    counts = [len(guides[channel_id]) for channel_id in channel_ids]
+    names = [intern(channel_id) for channel_id in channel_ids]
+    off_index = _HEADER.size
+    off_records = off_index + len(channel_ids) * _INDEX.size
+    record_count = sum(counts)
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as handle:
+        handle.write(bytes(_HEADER.size))
+        first = 0
+        for name, count in zip(names, counts):
+            handle.write(_INDEX.pack(name, first, count))
+            first += count
+        for channel_id in channel_ids:
+            rows = guides[channel_id]
+            chunk = bytearray(len(rows) * _RECORD.size)
+            for index in range(len(rows)):
+                start, end, title, description, icon = rows.row(index)
+                _RECORD.pack_into(
+                    chunk,
+                    index * _RECORD.size,
+                    start,
+                    end,
+                    intern(title),
+                    intern(description),
+                    intern(icon),
+                )
+            handle.write(chunk)
+
+        off_offsets = off_records + record_count * _RECORD.size
+        encoded = [text.encode("utf-8") for text in strings]  # ordre d'insertion = rang
+        offsets = array("I", [0])
+        for blob in encoded:
+            offsets.append(offsets[-1] + len(blob))
+        if offsets.itemsize != 4:  # pragma: no cover - « I » fait 4 octets partout où HA tourne
+            raise OSError("uint32 indisponible")
+        if sys.byteorder != "little":  # pragma: no cover
+            offsets.byteswap()
+        handle.write(offsets.tobytes())
+        off_blob = off_offsets + len(offsets) * 4
+        for blob in encoded:
+            handle.write(blob)
+
+        handle.seek(0)
+        handle.write(
+            _HEADER.pack(
+                _MAGIC,
+                _VERSION,
+                0,
+                len(channel_ids),
+                record_count,
+                len(strings),
+                datetime.now(timezone.utc).timestamp(),
+                off_index,
+                off_records,
+                off_offsets,
+                off_blob,
+            )
+        )
+    os.replace(tmp_path, path)
+    return GuideFile(path)
+
+
+def open_guide_file(path: str) -> GuideFile | None:
+    """Guide laissé par une session précédente, ou None s'il est absent ou illisible."""
+    try:
+        return GuideFile(path)
+    except (OSError, ValueError, struct.error):
+        return None
@@ -0,0 +1,320 @@
+"""Chaîne de traitement des visuels : téléchargement borné, Pillow sur pool dédié.
+
+⚠️ Ouvrir une grosse catégorie du navigateur de médias fait demander des centaines de
+vignettes d'un coup. Chacune faisait son propre téléchargement puis son
+`async_add_executor_job` : l'exécuteur PARTAGÉ de Home Assistant était saturé de travail
+Pillow, et les autres intégrations attendaient derrière nos logos.
+
+Désormais :
+- les téléchargements sont limités par hôte (un CDN de logos n'a pas à recevoir 300
+  connexions simultanées) ;
+- Pillow tourne sur un petit pool de threads À NOUS, jamais sur celui de Home Assistant ;
+- deux demandes simultanées du même visuel partagent un seul traitement ;
+- la profondeur de file et l'attente sont mesurées (cf. diagnostics) pour régler les bornes.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import io
+import logging
+from collections import OrderedDict, deque
+from collections.abc import Awaitable, Callable
+from concurrent.futures import ThreadPoolExecutor
+from time import monotonic
+from typing import Any, TypeVar
+from urllib.parse import urlparse
+
+import aiohttp
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+# Clé de `hass.data` propre à la chaîne — hors de `hass.data[DOMAIN]`, réservé aux entrées.
+_PIPELINE_KEY = f"{DOMAIN}_image_pipeline"
+
+# Deux threads suffisent : un logo réduit prend quelques millisecondes, et Home Assistant
+# tourne souvent sur un Raspberry Pi à quatre cœurs qu'on ne veut pas monopoliser.
+_MAX_WORKERS = 2
+_MAX_DOWNLOADS_PER_HOST = 4
+
+# Budget du cache des visuels transformés. Un logo de 256 px pèse 10 à 30 Ko une fois
+# réduit : quelques milliers de vignettes tiennent dans ce budget.
+_CACHE_MAX_BYTES = 24 * 1024 * 1024
+
+# Fenêtre des mesures d'attente exposées dans les diagnostics.
+_WAIT_SAMPLES = 200
+
+CacheKey = tuple[str, int | None, str]
+
+_T = TypeVar("_T")
+
+
+class _ArtworkCache:
+    """Visuels déjà transformés, évincés du moins récemment servi au plus récent.
+
+    Bornés en OCTETS et non en nombre d'entrées : une jaquette de 1024 px pèse cent fois une
+    icône de 64 px.
+    """
+
+    def __init__(self, max_bytes: int = _CACHE_MAX_BYTES) -> None:
+        self._entries: OrderedDict[CacheKey, bytes] = OrderedDict()
+        self._max_bytes = max_bytes
+        self._bytes = 0
+
+    def __contains__(self, key: CacheKey) -> bool:
+        return key in self._entries
+
+    def get(self, key: CacheKey) -> bytes | None:
+        data = self._entries.get(key)
+        if data is not None:
+            self._entries.move_to_end(key)
+        return data
+
+    def put(self, key: CacheKey, data: bytes) -> None:
+        if len(data) > self._max_bytes:
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._bytes -= len(previous)
+        self._entries[key] = data
+        self._bytes += len(data)
+        while self._bytes > self._max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= len(evicted)
+
+    def stats(self) -> dict[str, int]:
+        return {"entries": len(self._entries), "bytes": self._bytes, "max_bytes": self._max_bytes}
+
+
+class ImagePipeline:
+    """Téléchargement + mise au carré des visuels, bornés et dédupliqués."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        max_workers: int = _MAX_WORKERS,
+        downloads_per_host: int = _MAX_DOWNLOADS_PER_HOST,
+    ) -> None:
+        self._hass = hass
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=f"{DOMAIN}_image"
+        )
+        # ⚠️ Le pool de threads a sa propre file, mais invisible : on passe donc par un
+        # sémaphore de même taille pour savoir combien de travaux attendent, et depuis quand.
+        self._workers = asyncio.Semaphore(max_workers)
+        self._downloads_per_host = downloads_per_host
+        self._host_limits: dict[str, asyncio.Semaphore] = {}
+        self._inflight: dict[CacheKey, asyncio.Task[bytes | None]] = {}
+        self.cache = _ArtworkCache()
+
+        self._queued_downloads = 0
+        self._queued_transforms = 0
+        self._waits: deque[float] = deque(maxlen=_WAIT_SAMPLES)
+        self._counters = {"requests": 0, "cache_hits": 0, "shared": 0, "failures": 0}
+        # Levé quand plus rien n'est en cours ni en attente (cf. `async_wait_idle`).
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    async def async_get(
+        self, url: str, bucket: int | None, fmt: str
+    ) -> bytes | None:
+        """Octets du visuel transformé, depuis le cache ou un traitement (éventuellement partagé)."""
+        return await self.async_get_or_build(
+            (url, bucket, fmt), lambda: self._async_process(url, bucket, fmt)
+        )
+
+    async def async_get_or_build(
+        self, key: CacheKey, build: Callable[[], Awaitable[bytes | None]]
+    ) -> bytes | None:
+        """Résultat en cache pour `key`, sinon celui de `build()` — produit une seule fois.
+
+        Sert aussi aux visuels composés (planches de vignettes) : ils profitent du même
+        cache et de la même déduplication que les visuels simples.
+        """
+        self._counters["requests"] += 1
+        cached = self.cache.get(key)
+        if cached is not None:
+            self._counters["cache_hits"] += 1
+            return cached
+
+        # Single-flight : les demandes concurrentes du même visuel attendent la même tâche.
+        # `shield` : l'annulation d'un demandeur (onglet fermé) ne doit pas interrompre le
+        # traitement dont les autres attendent le résultat.
+        task = self._inflight.get(key)
+        if task is None:
+            task = self._hass.async_create_background_task(
+                self._async_run(key, build), name=f"{DOMAIN}_image"
+            )
+            self._inflight[key] = task
+            self._idle.clear()
+        else:
+            self._counters["shared"] += 1
+        return await asyncio.shield(task)
+
+    async def _async_run(
+        self, key: CacheKey, build: Callable[[], Awaitable[bytes | None]]
+    ) -> bytes | None:
+        try:
+            data = await build()
+        except Exception as err:  # noqa: BLE001 - un visuel ne doit jamais casser l'appelant
+            _LOGGER.debug("Visuel %s : traitement impossible (%s)", key[0], err)
+            data = None
+        finally:
+            self._inflight.pop(key, None)
+            self._signal_idle()
+        if data is None:
+            self._counters["failures"] += 1
+        else:
+            self.cache.put(key, data)
+        return data
+
+    async def _async_process(self, url: str, bucket: int | None, fmt: str) -> bytes | None:
+        raw = await self._async_download(url)
+        if raw is None:
+            return None
+        return await self.async_run_job(_pad_to_square, raw, bucket, fmt)
+
+    async def async_run_job(self, func: Callable[..., _T], *args: Any) -> _T:
+        """Exécute du travail Pillow sur le pool dédié, en respectant sa borne."""
+        queued_at = monotonic()
+        self._queued_transforms += 1
+        self._idle.clear()
+        acquired = False
+        try:
+            async with self._workers:
+                self._queued_transforms -= 1
+                acquired = True
+                self._waits.append(monotonic() - queued_at)
+                return await self._hass.loop.run_in_executor(self._executor, func, *args)
+        finally:
+            if not acquired:
+                self._queued_transforms -= 1
+            self._signal_idle()
+
+    @property
+    def busy(self) -> bool:
+        """Un traitement est en cours ou attend — le préchargement doit alors patienter."""
+        return bool(self._inflight) or self._queued_downloads > 0 or self._queued_transforms > 0
+
+    def _signal_idle(self) -> None:
+        if not self.busy:
+            self._idle.set()
+
+    async def async_wait_idle(self) -> None:
+        """Rend la main quand la chaîne n'a plus rien à faire — sans sonder en boucle."""
+        while self.busy:
+            self._idle.clear()
+            await self._idle.wait()
+
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        host = urlparse(url).hostname or ""
+        limit = self._host_limits.get(host)
+        if limit is None:
+            limit = self._host_limits[host] = asyncio.Semaphore(self._downloads_per_host)
+        return limit
+
+    async def _async_download(self, url: str) -> bytes | None:
+        session = async_get_clientsession(self._hass)
+        self._queued_downloads += 1
+        self._idle.clear()
+        acquired = False
+        try:
+            async with self._host_limit(url):
+                self._queued_downloads -= 1
+                acquired = True
+                async with session.get(
+                    url, timeout=aiohttp.ClientTimeout(connect=5, total=15)
+                ) as response:
+                    if response.status != 200:
+                        _LOGGER.debug("Visuel %s : HTTP %s", url, response.status)
+                        return None
+                    return await response.read()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+            _LOGGER.debug("Visuel %s injoignable : %s", url, err)
+            return None
+        finally:
+            if not acquired:
+                self._queued_downloads -= 1
+            self._signal_idle()
+
+    def stats(self) -> dict[str, Any]:
+        """Profondeur de file et attentes — pour régler `_MAX_WORKERS` et la limite par hôte."""
+        waits = sorted(self._waits)
+        return {
+            **self._counters,
+            "inflight": len(self._inflight),
+            "queued_downloads": self._queued_downloads,
+            "queued_transforms": self._queued_transforms,
+            "transform_wait_ms": {
+                "p50": round(waits[len(waits) // 2] * 1000, 1) if waits else None,
+                "max": round(waits[-1] * 1000, 1) if waits else None,
+            },
+            "cache": self.cache.stats(),
+        }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+@callback
+def async_get_image_pipeline(hass: HomeAssistant) -> ImagePipeline:
+    """Chaîne unique pour toute l'intégration, créée au premier visuel demandé."""
+    pipeline = hass.data.get(_PIPELINE_KEY)
+    if pipeline is None:
+        pipeline = hass.data[_PIPELINE_KEY] = ImagePipeline(hass)
+    return pipeline
+
+
+@callback
+def async_shutdown_image_pipeline(hass: HomeAssistant) -> None:
+    """Libère le pool de threads — au déchargement de la dernière entrée."""
+    pipeline: ImagePipeline | None = hass.data.pop(_PIPELINE_KEY, None)
+    if pipeline is not None:
+        pipeline.shutdown()
+
+
+def _pad_to_square(raw: bytes, bucket: int | None = None, fmt: str = "png") -> bytes | None:
+    try:
+        from PIL import Image
+    except ImportError:  # pragma: no cover - Pillow est une dépendance de HA
+        return raw
+
+    try:
+        image = Image.open(io.BytesIO(raw))
+        if bucket is not None:
+            # JPEG : décodage directement à 1/2, 1/4 ou 1/8 de la taille quand le palier le
+            # permet — le plus gros du temps Pillow d'une affiche part dans ce décodage.
+            image.draft("RGB", (bucket, bucket))
+        image = image.convert("RGBA")
+    except Exception:  # noqa: BLE001 - une image illisible ne doit pas casser l'entité
+        _LOGGER.debug("Visuel illisible, servi tel quel")
+        return raw
+
+    # Réduire AVANT de compléter en carré : les marges ajoutées n'ont pas à être
+    # rééchantillonnées.
+    if bucket is not None and max(image.size) > bucket:
+        image.thumbnail((bucket, bucket), Image.LANCZOS)
+
+    width, height = image.size
+    side = max(width, height)
+    if width == height:
+        canvas = image
+    else:
+        canvas = Image.new("RGBA", (side, side), (0, 0, 0, 0))
+        canvas.paste(image, ((side - width) // 2, (side - height) // 2))
+
+    # Toujours ré-encoder : les appelants annoncent le type du format demandé, et une source
+    # JPEG déjà carrée renverrait sinon un type incohérent.
+    # ⚠️ Pas de `optimize=True` en PNG : c'est le réglage le plus lent, pour quelques pour
+    # cent d'octets en moins sur une image déjà réduite et mise en cache.
+    buffer = io.BytesIO()
+    if fmt == "webp":
+        canvas.save(buffer, format="WEBP", quality=80, method=4)
+    else:
+        canvas.save(buffer, format="PNG", compress_level=6)
+    return buffer.getvalue()
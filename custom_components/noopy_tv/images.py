@@ -18,89 +18,91 @@ il a accès à Internet, les logos et affiches sont sur des hôtes publics, et 
 passage l'exposition de la clé d'API dans les attributs d'entité — elle aurait dû être
 placée dans l'URL, visible de tout utilisateur de Home Assistant.
 
-Ce qu'on perd : le redimensionnement `size=` du proxy. Négligeable — un logo pèse quelques
-kilo-octets et Home Assistant met le résultat en cache.
+Ce qu'on perd : le redimensionnement `size=` du proxy. Il est refait ici, pour tout ce qui
+transite par l'intégration (jaquette du lecteur, vignettes du navigateur) : mise au carré,
+réduction au palier de taille demandé, encodage PNG ou WebP, résultat gardé en cache.
 """
 
 from __future__ import annotations
 
-import asyncio
-import io
 import logging
 
-import aiohttp
-
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import entity_registry as er
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
 from .const import DOMAIN
+from .image_pipeline import async_get_image_pipeline
 
 _LOGGER = logging.getLogger(__name__)
 
 
+# ⚠️ Les tailles demandées sont ARRONDIES au palier supérieur : chaque appelant passe sa
+# propre valeur (48, 80, 200, 400, 780…), et sans paliers le cache contiendrait une variante
+# par valeur pour le même logo.
+_SIZE_BUCKETS = (64, 128, 256, 512, 1024)
+
+IMAGE_CONTENT_TYPES = {"png": "image/png", "webp": "image/webp"}
+
+# Jaquette du lecteur : logo de chaîne, ou visuel paysage d'un film / épisode.
+ARTWORK_SIZE_LOGO = 200
+ARTWORK_SIZE_BACKDROP = 780
+# Vignettes du navigateur : une carte fait ~150 px CSS, soit ~300 px sur un écran haute
+# densité. Les affiches VOD, verticales, occupent davantage la carte.
+THUMBNAIL_SIZE_LOGO = 256
+THUMBNAIL_SIZE_POSTER = 512
+
+
 def proxy_image_url(entry: ConfigEntry, raw_url: str, size: int = 300) -> str:
     """URL exploitable par Home Assistant pour un visuel.
 
-    `size` est conservé dans la signature (les appelants le passent) mais n'a plus d'effet
-    depuis l'abandon du proxy ; le garder évite de toucher les quatre plateformes le jour où
-    un redimensionnement redeviendrait possible.
+    Renvoie l'URL d'origine : une `entity_picture` n'est qu'une URL, rien n'y transite par
+    l'intégration. `size` n'a d'effet que pour les visuels servis en octets — la jaquette du
+    lecteur et les vignettes du navigateur, cf. `async_square_image`.
     """
     return raw_url
 
 
-async def async_square_png(hass: HomeAssistant, url: str) -> bytes | None:
-    """Télécharge un visuel et le rend CARRÉ par ajout de marges transparentes.
+def size_bucket(size: int | None) -> int | None:
+    """Palier de taille servi pour `size` (None = taille d'origine)."""
+    if not size or size <= 0:
+        return None
+    for bucket in _SIZE_BUCKETS:
+        if size <= bucket:
+            return bucket
+    return _SIZE_BUCKETS[-1]
+
+
+def accepts_webp(accept_header: str | None) -> bool:
+    """Le client annonce-t-il WebP dans son en-tête `Accept` ?"""
+    return "image/webp" in (accept_header or "")
+
+
+async def async_square_image(
+    hass: HomeAssistant, url: str, size: int | None = None, fmt: str = "png"
+) -> tuple[bytes, str] | None:
+    """Télécharge un visuel, le rend CARRÉ et le réduit au palier de `size`.
+
+    Renvoie `(octets, type MIME)`, ou `None` si le visuel est injoignable.
 
     ⚠️ Home Assistant affiche ces vignettes en carré avec recadrage centré
     (`object-fit: cover`). Un logo paysage y perd ses bords : mesuré sur le logo M6
     (379×213), 44 % de la largeur disparaissait et les branches du M étaient coupées.
 
-    On ne redimensionne PAS le contenu : on l'inscrit dans un carré transparent, ce qui rend
-    le recadrage de Home Assistant sans effet et garde le logo entier et centré.
+    On ne recadre PAS le contenu : on l'inscrit dans un carré transparent, ce qui rend le
+    recadrage de Home Assistant sans effet et garde le logo entier et centré.
+
+    ⚠️ Sans réduction, un backdrop TMDB de 2000 px était ré-encodé en PNG pleine taille pour
+    finir dans une icône de 48 px. `fmt="webp"` n'est à demander que si le client l'accepte.
     """
-    session = async_get_clientsession(hass)
-    try:
-        async with session.get(url, timeout=aiohttp.ClientTimeout(connect=5, total=15)) as response:
-            if response.status != 200:
-                _LOGGER.debug("Visuel %s : HTTP %s", url, response.status)
-                return None
-            raw = await response.read()
-    except (aiohttp.ClientError, asyncio.TimeoutError) as err:
-        _LOGGER.debug("Visuel %s injoignable : %s", url, err)
+    if fmt not in IMAGE_CONTENT_TYPES:
+        fmt = "png"
+    # Téléchargement, Pillow et cache passent par la chaîne dédiée : jamais par l'exécuteur
+    # partagé de Home Assistant (cf. `image_pipeline`).
+    data = await async_get_image_pipeline(hass).async_get(url, size_bucket(size), fmt)
+    if data is None:
         return None
-
-    # Pillow est fourni par Home Assistant. Traitement en exécuteur : c'est du CPU, et la
-    # boucle d'événements ne doit pas être bloquée.
-    return await hass.async_add_executor_job(_pad_to_square, raw)
-
-
-def _pad_to_square(raw: bytes) -> bytes | None:
-    try:
-        from PIL import Image
-    except ImportError:  # pragma: no cover - Pillow est une dépendance de HA
-        return raw
-
-    try:
-        image = Image.open(io.BytesIO(raw)).convert("RGBA")
-    except Exception:  # noqa: BLE001 - une image illisible ne doit pas casser l'entité
-        _LOGGER.debug("Visuel illisible, servi tel quel")
-        return raw
-
-    width, height = image.size
-    side = max(width, height)
-    if width == height:
-        canvas = image
-    else:
-        canvas = Image.new("RGBA", (side, side), (0, 0, 0, 0))
-        canvas.paste(image, ((side - width) // 2, (side - height) // 2))
-
-    # Toujours ré-encoder en PNG : les appelants annoncent `image/png`, et une source JPEG
-    # déjà carrée renverrait sinon un type incohérent.
-    buffer = io.BytesIO()
-    canvas.save(buffer, format="PNG", optimize=True)
-    return buffer.getvalue()
+    return data, IMAGE_CONTENT_TYPES[fmt]
 
 
 @callback
@@ -0,0 +1,38 @@
+"""Décodage JSON des réponses de l'app.
+
+`response.json()` d'aiohttp lit le corps, le décode en texte, puis passe la main au module
+`json` standard : sur `/api/v1/channels` (jusqu'à 60k chaînes), c'est plusieurs centaines
+de millisecondes de boucle d'événements bloquée à chaque rechargement du catalogue.
+
+Les réponses sont désormais lues en octets et décodées par `json_loads`, sans passer par
+le texte : orjson — livré avec Home Assistant — quand il est importable, le module
+standard sinon (qui accepte lui aussi des octets UTF-8).
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Callable
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson est une dépendance de Home Assistant
+    orjson = None
+
+# Les deux lèvent une sous-classe de `ValueError` sur un document invalide
+# (`orjson.JSONDecodeError` hérite de `json.JSONDecodeError`).
+json_loads: Callable[[bytes | str], Any]
+if orjson is not None:
+    json_loads = orjson.loads
+    JSON_BACKEND = "orjson"
+else:
+    json_loads = json.loads
+    JSON_BACKEND = "json"
+
+
+def decode_body(body: bytes) -> Any:
+    """Corps de réponse → objet JSON ; None pour un corps vide (comme `response.json()`)."""
+    if not body or body.isspace():  # sans copier un corps de plusieurs Mo
+        return None
+    return json_loads(body)
@@ -17,7 +17,7 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from time import monotonic
+from collections.abc import Callable
 from typing import Any
 from urllib.parse import quote
 
@@ -36,21 +36,35 @@ from homeassistant.exceptions import HomeAssistantError, ServiceNotSupported
 from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_track_state_change_event
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
-from homeassistant.util import dt as dt_util
 
 from .api import NoopyTVAPI, NoopyTVAPIError
 from .const import (
     CONF_APPLE_TV_ENTITY,
     CONF_APPLE_TV_SOURCE,
+    CONF_THUMBNAIL_SPRITES,
     DEFAULT_APPLE_TV_SOURCE,
     DOMAIN,
 )
 from .device import build_device_info
-from .images import async_square_png, proxy_image_url
+from .images import (
+    ARTWORK_SIZE_BACKDROP,
+    ARTWORK_SIZE_LOGO,
+    THUMBNAIL_SIZE_LOGO,
+    THUMBNAIL_SIZE_POSTER,
+    async_square_image,
+    proxy_image_url,
+)
 from .naming import is_channel_name_valid
+from .optimistic import ZAP_WINDOW, Patches, channel_confirm, channel_patches
+from .sprites import (
+    SPRITE_PAGE_SIZE,
+    async_register_sprite_page,
+    sprite_tile_url,
+)
 from .thumbnails import squared_thumbnail_url
-from .playback import infer_content_type
+from .playback import infer_content_type, playlist_order
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -62,13 +76,22 @@ _BROWSE_SERIES = "series"
 _BROWSE_EPISODES = "episodes"
 _BROWSE_FAVORITES = "favorites"
 _BROWSE_RESUME = "resume"
+_BROWSE_ON_NOW = "on_now"
 
 # Pas de constante côté app : `adjustVolume` prend un delta libre. 5 % donne un cran fin,
 # cohérent avec la couronne de la montre et les boutons ± de la télécommande iPhone.
 _VOLUME_STEP = 0.05
 
-# Durée pendant laquelle le niveau demandé prime sur celui rapporté par l'app.
-_OPTIMISTIC_WINDOW = 2.5
+# Sonde de l'app pendant un lancement : refus immédiat tant que le serveur est fermé, donc un
+# intervalle court ne coûte rien et gagne jusqu'à une seconde et demie sur l'ancien sondage.
+_PROBE_INTERVAL = 0.5
+_PROBE_TIMEOUT = 2
+
+# Après `stop`, le lecteur est démonté : l'entité passe « inactive » sans attendre.
+_STOPPED: Patches = {
+    "playback_state": {"isPlayerActive": False, "isPlaying": False},
+    "player": {"is_active": False},
+}
 
 
 def _order_of(channel: dict) -> int:
@@ -98,12 +121,6 @@ class NoopyTVMediaPlayer(CoordinatorEntity, MediaPlayerEntity):
         self._api = api
         self._entry = entry
         self._attr_unique_id = f"{entry.entry_id}_media_player"
-        self._last_position: float | None = None
-        self._last_position_updated = dt_util.utcnow()
-        # 🔊 Niveau/sourdine tout juste demandés, en attente de confirmation par l'app.
-        self._optimistic_volume: float | None = None
-        self._optimistic_muted: bool | None = None
-        self._optimistic_until: float = 0.0
 
     # ------------------------------------------------------------------ device
 
@@ -159,59 +176,11 @@ class NoopyTVMediaPlayer(CoordinatorEntity, MediaPlayerEntity):
         info = getattr(self._api, "info", None) or {}
         return info.get("foreground") is True
 
-    @callback
-    def _handle_coordinator_update(self) -> None:
-        """Suit les sauts de position pour alimenter `media_position_updated_at`.
-
-        HA extrapole la position entre deux mises à jour à partir de cet horodatage : le
-        rafraîchir à chaque tick ferait repartir la barre de progression en arrière à chaque
-        fois. On ne le bouge donc que si la position a réellement bougé d'au moins 1 s.
-        """
-        position = self._state_payload().get("currentTime")
-        if isinstance(position, (int, float)):
-            if self._last_position is None or abs(position - self._last_position) >= 1:
-                self._last_position = float(position)
-                self._last_position_updated = dt_util.utcnow()
-        self._settle_optimistic_volume()
-        super()._handle_coordinator_update()
-
     # ------------------------------------------------------------------ volume
 
-    def _settle_optimistic_volume(self) -> None:
-        """Rend la main à l'app dès qu'elle confirme ce qu'on lui a demandé."""
-        if self._optimistic_volume is None and self._optimistic_muted is None:
-            return
-        ps = self._state_payload()
-        reported = ps.get("volume")
-        if self._optimistic_volume is not None and isinstance(reported, (int, float)):
-            if abs(float(reported) - self._optimistic_volume) < 0.01:
-                self._optimistic_volume = None
-        if self._optimistic_muted is not None and ps.get("isMuted") == self._optimistic_muted:
-            self._optimistic_muted = None
-
-    def _optimistic_expired(self) -> bool:
-        return monotonic() > self._optimistic_until
-
-    def _remember_optimistic(
-        self, volume: float | None = None, muted: bool | None = None
-    ) -> None:
-        """Affiche immédiatement le niveau demandé.
-
-        Le curseur de Home Assistant est piloté par l'état de l'entité : sans cette avance,
-        chaque cran envoyé pendant un glissement revenait à l'ancienne valeur le temps d'un
-        cycle de rafraîchissement, et le curseur sautait en arrière sous le doigt.
-        """
-        self._optimistic_volume = volume
-        self._optimistic_muted = muted
-        self._optimistic_until = monotonic() + _OPTIMISTIC_WINDOW
-        if self.hass is not None:
-            self.async_write_ha_state()
-
     @property
     def volume_level(self) -> float | None:
         """Gain du moteur de lecture (0…1). PAS le volume du téléviseur."""
-        if self._optimistic_volume is not None and not self._optimistic_expired():
-            return self._optimistic_volume
         value = self._state_payload().get("volume")
         if isinstance(value, (int, float)):
             return min(1.0, max(0.0, float(value)))
@@ -219,8 +188,6 @@ class NoopyTVMediaPlayer(CoordinatorEntity, MediaPlayerEntity):
 
     @property
     def is_volume_muted(self) -> bool | None:
-        if self._optimistic_muted is not None and not self._optimistic_expired():
-            return self._optimistic_muted
         muted = self._state_payload().get("isMuted")
         if muted is None:
             return None
@@ -355,25 +322,28 @@ class NoopyTVMediaPlayer(CoordinatorEntity, MediaPlayerEntity):
 
     @property
     def media_position(self) -> int | None:
+        """Position au point d'ancrage de l'horloge partagée (cf. `PositionClock`).
+
+        HA extrapole depuis `media_position_updated_at` : l'ancre ne bouge qu'à un saut ou
+        un changement d'état, jamais à chaque tick — la barre ne repart pas en arrière.
+        """
         if self.media_duration is None:
             return None
-        position = self._state_payload().get("currentTime")
-        if isinstance(position, (int, float)):
-            return int(position)
-        return None
+        anchor = self.coordinator.position.anchor()
+        return None if anchor is None else int(anchor[0])
 
     @property
     def media_position_updated_at(self):
         if self.media_position is None:
             return None
-        return self._last_position_updated
+        return self.coordinator.position.anchor()[1]
 
     def _proxy_image_url(self, raw_url: str, size: int = 400) -> str:
         """URL du visuel pour la jaquette du lecteur (servie en octets par l'entité)."""
         return proxy_image_url(self._entry, raw_url, size)
 
-    def _thumbnail(self, raw_url: str | None) -> str | None:
-        """Vignette du navigateur, MISE AU CARRÉ.
+    def _thumbnail(self, raw_url: str | None, size: int = THUMBNAIL_SIZE_LOGO) -> str | None:
+        """Vignette du navigateur, MISE AU CARRÉ et réduite à `size`.
 
         Home Assistant recadre les vignettes au centre : un logo large y perdrait ses bords.
         On passe donc par notre vue, qui complète l'image en carré. Repli sur l'URL brute si
@@ -381,10 +351,10 @@ class NoopyTVMediaPlayer(CoordinatorEntity, MediaPlayerEntity):
         """
         if not raw_url:
             return None
-        return squared_thumbnail_url(self.hass, str(raw_url)) or str(raw_url)
+        return squared_thumbnail_url(self.hass, str(raw_url), size) or str(raw_url)
 
-    @property
-    def media_image_url(self) -> str | None:
+    def _artwork(self) -> tuple[str, int] | None:
+        """Visuel du contenu en cours et taille à laquelle le servir."""
         ps = self._state_payload()
         if self._content_type() in ("movie", "episode"):
             # 🎬 Visuel PAYSAGE en priorité : les vignettes de Home Assistant sont
@@ -392,27 +362,35 @@ class NoopyTVMediaPlayer(CoordinatorEntity, MediaPlayerEntity):
             # L'affiche verticale reste le repli quand TMDB n'a pas de backdrop.
             artwork = ps.get("backdropURL") or ps.get("posterURL")
             if artwork:
-                return self._proxy_image_url(str(artwork), size=780)
-        if ps.get("logoURL"):
-            return self._proxy_image_url(str(ps["logoURL"]), size=200)
-        current = self._player().get("current_channel") or {}
-        if current.get("logo_url"):
-            return self._proxy_image_url(str(current["logo_url"]), size=200)
+                size = ARTWORK_SIZE_BACKDROP
+                return self._proxy_image_url(str(artwork), size=size), size
+        logo = ps.get("logoURL") or (self._player().get("current_channel") or {}).get("logo_url")
+        if logo:
+            return self._proxy_image_url(str(logo), size=ARTWORK_SIZE_LOGO), ARTWORK_SIZE_LOGO
         return None
 
+    @property
+    def media_image_url(self) -> str | None:
+        artwork = self._artwork()
+        return artwork[0] if artwork else None
+
     async def async_get_media_image(self) -> tuple[bytes | None, str | None]:
-        """Jaquette MISE AU CARRÉ avant d'être servie par Home Assistant.
+        """Jaquette MISE AU CARRÉ et réduite avant d'être servie par Home Assistant.
 
         HA récupère `media_image_url` côté serveur puis l'affiche dans une vignette carrée
         avec recadrage centré : un logo de chaîne y perdait ses bords.
+
+        Toujours en PNG : le proxy de Home Assistant ne transmet pas l'en-tête `Accept` du
+        client, on ne peut donc pas savoir s'il lit le WebP.
         """
-        url = self.media_image_url
-        if not url:
+        artwork = self._artwork()
+        if artwork is None:
             return None, None
-        data = await async_square_png(self.hass, url)
-        if data is None:
+        url, size = artwork
+        result = await async_square_image(self.hass, url, size=size)
+        if result is None:
             return None, None
-        return data, "image/png"
+        return result
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
@@ -492,34 +470,81 @@ class NoopyTVMediaPlayer(CoordinatorEntity, MediaPlayerEntity):
 
     # ------------------------------------------------------------- commandes
 
-    async def _send(self, command: str, params: dict[str, Any] | None = None) -> None:
+    async def _send(
+        self,
+        command: str,
+        params: dict[str, Any] | None = None,
+        *,
+        expect: Patches | None = None,
+        key: str = "transport",
+        **expect_options: Any,
+    ) -> None:
+        """Envoie une commande ; `expect` = l'état qu'elle produira, affiché sans attendre.
+
+        Sans cette avance, le bouton pressé ne changeait qu'après l'aller-retour complet
+        (réponse à la commande PUIS relevé de l'état). L'attente est levée dès que l'app
+        confirme, ou aussitôt si la commande échoue — cf. optimistic.py. Le relevé, lui, est
+        fait par la file une fois la rafale passée — cf. commands.py.
+        """
+        token = (
+            self.coordinator.async_expect(key, expect, **expect_options)
+            if expect is not None
+            else None
+        )
         try:
-            result = await self._api.send_command(command, params)
+            result = await self.coordinator.commands.async_send(command, params)
         except NoopyTVAPIError as err:
+            self._forget(token)
             raise HomeAssistantError(f"OneTV: commande '{command}' échouée — {err}") from err
         if not result.get("success", False):
+            self._forget(token)
             raise HomeAssistantError(
                 f"OneTV a refusé la commande '{command}': {result.get('error') or result.get('message')}"
             )
-        await self.coordinator.async_request_refresh()
+
+    def _forget(self, token: int | None) -> None:
+        if token is not None:
+            self.coordinator.async_cancel_expectation(token)
 
     async def async_media_play(self) -> None:
-        await self._send("play")
+        await self._send("play", expect={"playback_state": {"isPaused": False}})
 
     async def async_media_pause(self) -> None:
-        await self._send("pause")
+        await self._send("pause", expect={"playback_state": {"isPaused": True}})
 
     async def async_media_play_pause(self) -> None:
-        await self._send("togglePlayPause")
+        paused = not self._state_payload().get("isPaused")
+        await self._send("togglePlayPause", expect={"playback_state": {"isPaused": paused}})
 
     async def async_media_stop(self) -> None:
-        await self._send("stop")
+        await self._send("stop", expect=_STOPPED)
+
+    def _zap_expectation(self, channel_id: str | None) -> dict[str, Any]:
+        """Options d'attente pour un zapping vers `channel_id` (rien si hors catalogue)."""
+        channel = self._channels().get(channel_id) if channel_id else None
+        if channel is None:
+            return {}
+        return {
+            "expect": channel_patches(channel_id, channel),
+            "key": "channel",
+            "window": ZAP_WINDOW,
+            "confirm": channel_confirm(channel_id),
+        }
+
+    def _neighbour_channel_id(self, step: int) -> str | None:
+        """Chaîne où mènera `nextChannel` (+1) / `previousChannel` (-1) — la playlist boucle."""
+        current = (self._player().get("current_channel") or {}).get("id")
+        ordered, positions = playlist_order(self._channels())
+        index = positions.get(current) if current else None
+        if index is None:
+            return None
+        return ordered[(index + step) % len(ordered)]
 
     async def async_media_next_track(self) -> None:
-        await self._send("nextChannel")
+        await self._send("nextChannel", **self._zap_expectation(self._neighbour_channel_id(1)))
 
     async def async_media_previous_track(self) -> None:
-        await self._send("previousChannel")
+        await self._send("previousChannel", **self._zap_expectation(self._neighbour_channel_id(-1)))
 
     async def async_media_seek(self, position: float) -> None:
         await self._send("seekAbsolute", {"position": float(position)})
@@ -528,9 +553,15 @@ class NoopyTVMediaPlayer(CoordinatorEntity, MediaPlayerEntity):
         level = min(1.0, max(0.0, float(volume)))
         # Côté app, un niveau nul VAUT la sourdine (`applyPlayerVolume` pose `isPlayerMuted`
         # quand le gain tombe à 0) : on annonce la même chose, sinon l'icône de sourdine
-        # clignoterait le temps que l'état revienne.
-        self._remember_optimistic(volume=level, muted=level == 0)
-        await self._send("setVolume", {"level": level})
+        # clignoterait le temps que l'état revienne. L'avance est ici indispensable : sans
+        # elle, chaque cran envoyé pendant un glissement ramenait le curseur à l'ancienne
+        # valeur le temps d'un relevé, et il sautait en arrière sous le doigt.
+        await self._send(
+            "setVolume",
+            {"level": level},
+            expect={"playback_state": {"volume": level, "isMuted": level == 0}},
+            key="volume",
+        )
 
     async def async_volume_up(self) -> None:
         await self._adjust_volume(_VOLUME_STEP)
@@ -539,11 +570,18 @@ class NoopyTVMediaPlayer(CoordinatorEntity, MediaPlayerEntity):
         await self._adjust_volume(-_VOLUME_STEP)
 
     async def _adjust_volume(self, delta: float) -> None:
-        # `adjustVolume` sort du mode muet côté app : on l'annonce ici aussi.
+        # `adjustVolume` sort du mode muet côté app : on l'annonce ici aussi. Le niveau de
+        # départ inclut l'attente en cours : des crans rapprochés s'additionnent.
+        expected: dict[str, Any] = {"isMuted": False}
         current = self.volume_level
-        expected = None if current is None else min(1.0, max(0.0, current + delta))
-        self._remember_optimistic(volume=expected, muted=False)
-        await self._send("adjustVolume", {"delta": float(delta)})
+        if current is not None:
+            expected["volume"] = min(1.0, max(0.0, current + delta))
+        await self._send(
+            "adjustVolume",
+            {"delta": float(delta)},
+            expect={"playback_state": expected},
+            key="volume",
+        )
 
     async def async_mute_volume(self, mute: bool) -> None:
         """Coupe ou rétablit le son.
@@ -556,12 +594,11 @@ class NoopyTVMediaPlayer(CoordinatorEntity, MediaPlayerEntity):
         current = self.is_volume_muted
         if current is not None and current == mute:
             return
-        self._remember_optimistic(muted=mute)
-        await self._send("toggleMute")
+        await self._send("toggleMute", expect={"playback_state": {"isMuted": mute}}, key="volume")
 
     async def async_turn_off(self) -> None:
         """Arrête la lecture. Ne ferme PAS l'app : tvOS ne permet pas de quitter une app à distance."""
-        await self._send("stop")
+        await self._send("stop", expect=_STOPPED)
 
     def _apple_tv_entity(self) -> str | None:
         return self._entry.options.get(CONF_APPLE_TV_ENTITY) or self._entry.data.get(
@@ -602,9 +639,45 @@ class NoopyTVMediaPlayer(CoordinatorEntity, MediaPlayerEntity):
                 "l'intégration OneTV pour pouvoir lancer l'app depuis Home Assistant."
             )
 
-        await self._wake_apple_tv(entity_id)
-        await self._select_source_with_retry(entity_id)
-        await self._wait_until_reachable()
+        # Lancement en pipeline : la sonde de l'app tourne DÈS le début, en parallèle du
+        # réveil et du changement de source. La commande en attente chez l'appelant
+        # (`_play_channel`, `async_play_media`) part donc à l'instant où l'app accepte les
+        # connexions ET a été ramenée à l'écran, sans attendre de relevé complet.
+        reachable = self.hass.async_create_task(self._wait_until_reachable())
+        try:
+            await self._wake_apple_tv(entity_id)
+            await self._select_source_with_retry(entity_id)
+        except BaseException:
+            reachable.cancel()
+            raise
+        await reachable
+
+    async def _wait_for_state(
+        self, entity_id: str, predicate: Callable[[], bool] | None, timeout: float
+    ) -> bool:
+        """Attend un changement d'état de `entity_id` (vérifiant `predicate`, s'il est donné).
+
+        Réveillé par l'évènement de changement d'état lui-même, là où une boucle de sommeil
+        ratait jusqu'à une période entière à chaque étape du lancement.
+        """
+        if predicate is not None and predicate():
+            return True
+        changed = asyncio.Event()
+
+        @callback
+        def _on_change(_event) -> None:
+            if predicate is None or predicate():
+                changed.set()
+
+        unsub = async_track_state_change_event(self.hass, [entity_id], _on_change)
+        try:
+            async with asyncio.timeout(timeout):
+                await changed.wait()
+            return True
+        except TimeoutError:
+            return False
+        finally:
+            unsub()
 
     async def _wake_apple_tv(self, entity_id: str, timeout: float = 20.0) -> None:
         """Réveille l'Apple TV avant tout `select_source`.
@@ -642,11 +715,9 @@ class NoopyTVMediaPlayer(CoordinatorEntity, MediaPlayerEntity):
             _LOGGER.debug("OneTV: réveil via %s impossible (%s)", remote_entity, err)
             return
 
-        deadline = asyncio.get_running_loop().time() + timeout
-        while asyncio.get_running_loop().time() < deadline:
-            await asyncio.sleep(1)
-            if not self._apple_tv_is_asleep(entity_id):
-                return
+        await self._wait_for_state(
+            entity_id, lambda: not self._apple_tv_is_asleep(entity_id), timeout
+        )
 
     def _apple_tv_is_asleep(self, entity_id: str) -> bool:
         state = self.hass.states.get(entity_id)
@@ -688,7 +759,9 @@ class NoopyTVMediaPlayer(CoordinatorEntity, MediaPlayerEntity):
             except ServiceNotSupported as err:
                 last_error = err
                 if attempt < attempts - 1:
-                    await asyncio.sleep(delay)
+                    # Réessai au prochain changement de l'entité (ses attributs suivent le
+                    # réveil), au plus tard après `delay`.
+                    await self._wait_for_state(entity_id, None, delay)
 
         raise HomeAssistantError(
             f"{entity_id} refuse toujours le changement de source après "
@@ -696,17 +769,28 @@ class NoopyTVMediaPlayer(CoordinatorEntity, MediaPlayerEntity):
             "puis réessayez."
         ) from last_error
 
-    async def _wait_until_reachable(self, timeout: float = 40.0) -> bool:
+    async def _wait_until_reachable(self, timeout: float = 60.0) -> bool:
         """Attend que le serveur HTTP de l'app réponde de nouveau.
 
-        Lancement à froid mesuré ~10 s, réveil d'une app suspendue <4 s.
+        Lancement à froid mesuré ~10 s, réveil d'une app suspendue <4 s. La sonde est
+        `/api/v1/info` (O(1) côté serveur, refus de connexion immédiat tant que l'app est
+        fermée) toutes les `_PROBE_INTERVAL` — et non un relevé complet toutes les 2 s. Le
+        relevé complet part en arrière-plan dès que l'app répond.
+
+        L'attente court EN MÊME TEMPS que le réveil de l'Apple TV (jusqu'à 20 s) et le
+        lancement : 60 s = l'ancien budget de 40 s compté après le réveil. Une sonde trop
+        lente (app qui accepte la connexion mais démarre encore) compte comme un échec —
+        `_request` la remonte en `NoopyTVConnectionError`.
         """
         deadline = asyncio.get_running_loop().time() + timeout
         while asyncio.get_running_loop().time() < deadline:
-            await self.coordinator.async_refresh()
-            if self.coordinator.last_update_success:
-                return True
-            await asyncio.sleep(2)
+            try:
+                await self._api.get_info(timeout=_PROBE_TIMEOUT)
+            except NoopyTVAPIError:
+                await asyncio.sleep(_PROBE_INTERVAL)
+                continue
+            self.hass.async_create_task(self.coordinator.async_request_refresh())
+            return True
         _LOGGER.warning("OneTV: l'app n'a pas répondu dans les %.0fs après le lancement", timeout)
         return False
 
@@ -718,10 +802,19 @@ class NoopyTVMediaPlayer(CoordinatorEntity, MediaPlayerEntity):
             await self.async_turn_on()
 
         channel_id = self._resolve_channel_id(wanted) or wanted
+        zap = self._zap_expectation(channel_id)
+        token = (
+            self.coordinator.async_expect(
+                "channel", zap["expect"], window=zap["window"], confirm=zap["confirm"]
+            )
+            if zap
+            else None
+        )
         # `play_channel` traverse /api/v1/player/play, qui résout aussi bien un UUID qu'un nom.
         if not await self._api.play_channel(channel_id):
+            self._forget(token)
             raise HomeAssistantError(f"OneTV n'a pas trouvé la chaîne « {wanted} »")
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_request_player_refresh(include_player=True)
 
     async def async_play_media(self, media_type: str, media_id: str, **kwargs: Any) -> None:
         """Lit une chaîne, un film ou un épisode.
@@ -769,6 +862,10 @@ class NoopyTVMediaPlayer(CoordinatorEntity, MediaPlayerEntity):
             return await self._browse_favorites()
         if media_content_id == _BROWSE_RESUME:
             return await self._browse_resume()
+        if media_content_id == _BROWSE_ON_NOW:
+            return await self._browse_on_now()
+        if media_content_id.startswith(f"{_BROWSE_ON_NOW}/"):
+            return self._browse_on_now_in_category(media_content_id.split("/", 1)[1])
         if media_content_id == _BROWSE_CHANNELS:
             return self._browse_channel_categories()
         if media_content_id.startswith(f"{_BROWSE_CHANNELS}/"):
@@ -812,6 +909,14 @@ class NoopyTVMediaPlayer(CoordinatorEntity, MediaPlayerEntity):
                     can_play=False,
                     can_expand=True,
                 ),
+                BrowseMedia(
+                    media_class=MediaClass.DIRECTORY,
+                    media_content_id=_BROWSE_ON_NOW,
+                    media_content_type="",
+                    title="À la TV",
+                    can_play=False,
+                    can_expand=True,
+                ),
                 BrowseMedia(
                     media_class=MediaClass.DIRECTORY,
                     media_content_id=_BROWSE_CHANNELS,
@@ -839,7 +944,7 @@ class NoopyTVMediaPlayer(CoordinatorEntity, MediaPlayerEntity):
             ],
         )
 
-    def _browse_channel_categories(self) -> BrowseMedia:
+    def _ordered_categories(self) -> list[str]:
         # Ordre playlist : une catégorie se range à la position de sa première chaîne.
         first_seen: dict[str, int] = {}
         for channel in self._channels().values():
@@ -849,7 +954,19 @@ class NoopyTVMediaPlayer(CoordinatorEntity, MediaPlayerEntity):
             position = _order_of(channel)
             if category not in first_seen or position < first_seen[category]:
                 first_seen[category] = position
-        categories = sorted(first_seen, key=lambda name: (first_seen[name], name))
+        return sorted(first_seen, key=lambda name: (first_seen[name], name))
+
+    def _channels_in_category(self, category: str) -> list[tuple[str, dict[str, Any]]]:
+        in_category = [
+            (channel_id, channel)
+            for channel_id, channel in self._channels().items()
+            if channel.get("category") == category and is_channel_name_valid(channel.get("name"))
+        ]
+        in_category.sort(key=lambda item: (_order_of(item[1]), str(item[1].get("name", ""))))
+        return in_category
+
+    def _browse_channel_categories(self) -> BrowseMedia:
+        categories = self._ordered_categories()
         return BrowseMedia(
             media_class=MediaClass.DIRECTORY,
             media_content_id=_BROWSE_CHANNELS,
@@ -872,13 +989,11 @@ class NoopyTVMediaPlayer(CoordinatorEntity, MediaPlayerEntity):
         )
 
     def _browse_channels_in_category(self, category: str) -> BrowseMedia:
-        in_category = [
-            (channel_id, channel)
-            for channel_id, channel in self._channels().items()
-            if channel.get("category") == category and is_channel_name_valid(channel.get("name"))
-        ]
-        in_category.sort(key=lambda item: (_order_of(item[1]), str(item[1].get("name", ""))))
+        in_category = self._channels_in_category(category)
 
+        thumbnails = self._category_thumbnails(
+            [channel.get("logo_url") for _, channel in in_category]
+        )
         children = [
             BrowseMedia(
                 media_class=MediaClass.VIDEO,
@@ -887,9 +1002,9 @@ class NoopyTVMediaPlayer(CoordinatorEntity, MediaPlayerEntity):
                 title=str(channel.get("name", "")),
                 can_play=True,
                 can_expand=False,
-                thumbnail=self._thumbnail(channel.get("logo_url")),
+                thumbnail=thumbnail,
             )
-            for channel_id, channel in in_category
+            for (channel_id, channel), thumbnail in zip(in_category, thumbnails)
         ]
         # ⚠️ Ordre de la PLAYLIST, pas alphabétique : c'est l'ordre que l'utilisateur a
         # arrangé et celui qu'il retrouve dans l'app. Le champ `order` est fourni par
@@ -909,6 +1024,28 @@ class NoopyTVMediaPlayer(CoordinatorEntity, MediaPlayerEntity):
             children=children,
         )
 
+    def _category_thumbnails(self, logos: list[Any]) -> list[str | None]:
+        """Vignettes des chaînes d'une catégorie, dans l'ordre de `logos`.
+
+        Mode planche (option) : les logos sont regroupés par pages de `SPRITE_PAGE_SIZE`, et
+        chaque chaîne reçoit l'URL STABLE de sa case — le navigateur la garde en cache d'une
+        visite à l'autre, là où une URL signée change à chaque fois (cf. sprites.py). Une
+        carte qui sait découper une planche la retrouve en retirant le rang de l'URL.
+        """
+        if not self._entry.options.get(CONF_THUMBNAIL_SPRITES, False):
+            return [self._thumbnail(logo) for logo in logos]
+
+        thumbnails: list[str | None] = [None] * len(logos)
+        # Seules les chaînes qui ONT un logo entrent dans une planche : une case vide par
+        # chaîne sans logo gonflerait la planche pour rien.
+        with_logo = [(position, str(logo)) for position, logo in enumerate(logos) if logo]
+        for start in range(0, len(with_logo), SPRITE_PAGE_SIZE):
+            page = with_logo[start : start + SPRITE_PAGE_SIZE]
+            key = async_register_sprite_page(self.hass, [url for _, url in page])
+            for index, (position, _) in enumerate(page):
+                thumbnails[position] = sprite_tile_url(key, index)
+        return thumbnails
+
     async def _fetch_vod(self, kind: str) -> list[dict[str, Any]]:
         if kind == _BROWSE_MOVIES:
             return await self._api.get_movies()
@@ -976,7 +1113,8 @@ class NoopyTVMediaPlayer(CoordinatorEntity, MediaPlayerEntity):
                     # brute du fournisseur arrive alors sous `logoURL` (films) ou `coverURL`
                     # (séries), selon la version de l'application.
                     thumbnail=self._thumbnail(
-                        item.get("posterURL") or item.get("logoURL") or item.get("coverURL")
+                        item.get("posterURL") or item.get("logoURL") or item.get("coverURL"),
+                        THUMBNAIL_SIZE_POSTER,
                     ),
                 )
             )
@@ -1062,6 +1200,81 @@ class NoopyTVMediaPlayer(CoordinatorEntity, MediaPlayerEntity):
             children=children,
         )
 
+    def _on_now_children(self, channels: list[tuple[str, dict[str, Any]]]) -> list[BrowseMedia]:
+        """Une carte par chaîne : programme en cours et avancement, lus dans le guide indexé.
+
+        Aucune requête par chaîne : le guide (cf. epg.py) répond en O(log n), la grille
+        s'ouvre aussitôt même sur des centaines de chaînes.
+        """
+        epg = self.coordinator.epg
+        thumbnails = self._category_thumbnails([channel.get("logo_url") for _, channel in channels])
+        children = []
+        for (channel_id, channel), thumbnail in zip(channels, thumbnails):
+            name = str(channel.get("name", ""))
+            programme = epg.now(channel_id)
+            title = (
+                f"{programme.title} — {name} · {int(programme.progress_percent)} %"
+                if programme is not None and programme.title
+                else name
+            )
+            children.append(
+                BrowseMedia(
+                    media_class=MediaClass.VIDEO,
+                    media_content_id=channel_id,
+                    media_content_type=MediaType.CHANNEL,
+                    title=title,
+                    can_play=True,
+                    can_expand=False,
+                    thumbnail=thumbnail,
+                )
+            )
+        return children
+
+    async def _browse_on_now(self) -> BrowseMedia:
+        """Ce qui passe en ce moment sur les favoris, puis un dossier par catégorie."""
+        # Une seule requête — la liste des favoris ; les programmes viennent du guide.
+        favorites = await self._api.get_favorites()
+        known = self._channels()
+        channels = [
+            (str(channel["id"]), known.get(str(channel["id"])) or channel)
+            for channel in favorites
+            if channel.get("id")
+        ]
+        children = self._on_now_children(channels)
+        children += [
+            BrowseMedia(
+                media_class=MediaClass.DIRECTORY,
+                media_content_id=f"{_BROWSE_ON_NOW}/{category}",
+                media_content_type="",
+                title=category,
+                can_play=False,
+                can_expand=True,
+            )
+            for category in self._ordered_categories()
+        ]
+        return BrowseMedia(
+            media_class=MediaClass.DIRECTORY,
+            media_content_id=_BROWSE_ON_NOW,
+            media_content_type="",
+            title="À la TV",
+            can_play=False,
+            can_expand=True,
+            children_media_class=MediaClass.VIDEO,
+            children=children,
+        )
+
+    def _browse_on_now_in_category(self, category: str) -> BrowseMedia:
+        return BrowseMedia(
+            media_class=MediaClass.DIRECTORY,
+            media_content_id=f"{_BROWSE_ON_NOW}/{category}",
+            media_content_type="",
+            title=f"À la TV · {category}",
+            can_play=False,
+            can_expand=True,
+            children_media_class=MediaClass.VIDEO,
+            children=self._on_now_children(self._channels_in_category(category)),
+        )
+
     async def _browse_resume(self) -> BrowseMedia:
         """Films et épisodes commencés, du plus récent au plus ancien.
 
@@ -1120,7 +1333,8 @@ class NoopyTVMediaPlayer(CoordinatorEntity, MediaPlayerEntity):
                     can_play=True,
                     can_expand=False,
                     thumbnail=self._thumbnail(
-                        entry.get("posterURL") or entry.get("logoURL") or entry.get("coverURL")
+                        entry.get("posterURL") or entry.get("logoURL") or entry.get("coverURL"),
+                        THUMBNAIL_SIZE_POSTER,
                     ),
                 )
             )
@@ -0,0 +1,176 @@
+"""État « attendu » après une commande, affiché avant que l'app ne le confirme.
+
+Une commande acceptée par l'app ne se voyait qu'au rafraîchissement suivant : sur une
+tablette murale, appuyer sur pause laissait le bouton « lecture » affiché le temps d'un
+aller-retour complet (commande, puis relevé de `/api/v1/player/state`). Le volume avait
+déjà son avance locale ; ce module la généralise à toutes les commandes.
+
+Chaque commande annonce ce qu'elle va changer — des champs de `player` et/ou de
+`playback_state` — sous une CLÉ (une nouvelle attente de même clé remplace l'ancienne :
+deux pauses de suite ne s'empilent pas). Le coordinator superpose ces champs aux données
+rapportées, pour TOUTES les entités à la fois. Une attente disparaît :
+
+- dès que l'app rapporte l'état attendu (relevé périodique ou évènement SSE) ;
+- à l'échéance de sa fenêtre si l'app ne l'a jamais confirmée — on revient alors à ce que
+  l'app rapporte, plutôt que d'afficher indéfiniment un état qui n'est pas arrivé ;
+- immédiatement si la commande échoue.
+"""
+
+from __future__ import annotations
+
+import itertools
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from time import monotonic
+from typing import Any
+
+# Fenêtres par défaut. Un zapping est plus long à confirmer qu'une pause : l'app ne publie
+# la nouvelle chaîne qu'une fois le flux ouvert.
+TRANSPORT_WINDOW = 3.0
+ZAP_WINDOW = 8.0
+
+# Écart toléré sur les nombres (le volume revient arrondi par l'app).
+_TOLERANCE = 0.01
+
+Patches = Mapping[str, Mapping[str, Any]]
+
+
+@dataclass
+class _Expectation:
+    token: int
+    patches: Patches
+    deadline: float
+    confirm: Callable[[dict[str, Any]], bool] | None
+
+
+def _matches(reported: Any, expected: Any) -> bool:
+    if isinstance(expected, bool) or isinstance(reported, bool):
+        return reported is expected
+    if isinstance(expected, (int, float)) and isinstance(reported, (int, float)):
+        return abs(float(reported) - float(expected)) < _TOLERANCE
+    return reported == expected
+
+
+class OptimisticOverlay:
+    """Attentes en cours, indexées par clé, dans l'ordre où elles ont été posées."""
+
+    def __init__(self) -> None:
+        self._pending: dict[str, _Expectation] = {}
+        self._tokens = itertools.count(1)
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def expect(
+        self,
+        key: str,
+        patches: Patches,
+        *,
+        window: float = TRANSPORT_WINDOW,
+        confirm: Callable[[dict[str, Any]], bool] | None = None,
+    ) -> int:
+        """Pose une attente et renvoie son jeton (pour l'annuler si la commande échoue).
+
+        Sans `confirm`, l'attente est confirmée quand chaque champ annoncé est rapporté à
+        l'identique.
+        """
+        token = next(self._tokens)
+        self._pending.pop(key, None)  # ré-insérée en dernier : elle prime sur les autres
+        self._pending[key] = _Expectation(token, patches, monotonic() + window, confirm)
+        return token
+
+    def cancel(self, token: int) -> bool:
+        for key, expectation in self._pending.items():
+            if expectation.token == token:
+                del self._pending[key]
+                return True
+        return False
+
+    def clear(self) -> None:
+        self._pending.clear()
+
+    def next_deadline(self) -> float | None:
+        """Échéance `monotonic()` la plus proche, ou None sans attente."""
+        return min((e.deadline for e in self._pending.values()), default=None)
+
+    def reconcile(self, reported: dict[str, Any] | None) -> None:
+        """Oublie les attentes confirmées par `reported` ou arrivées à échéance."""
+        now = monotonic()
+        for key, expectation in list(self._pending.items()):
+            if now >= expectation.deadline or (
+                reported is not None and self._confirmed(expectation, reported)
+            ):
+                del self._pending[key]
+
+    @staticmethod
+    def _confirmed(expectation: _Expectation, reported: dict[str, Any]) -> bool:
+        if expectation.confirm is not None:
+            return expectation.confirm(reported)
+        for section, fields in expectation.patches.items():
+            current = reported.get(section) or {}
+            if not all(_matches(current.get(name), value) for name, value in fields.items()):
+                return False
+        return True
+
+    def apply(self, reported: dict[str, Any]) -> dict[str, Any]:
+        """Copie de `reported` où les champs attendus remplacent les champs rapportés.
+
+        Copie superficielle : seules les sections modifiées sont dupliquées (le catalogue,
+        potentiellement énorme, reste partagé — et son identité, qui sert de clé de cache,
+        est préservée).
+        """
+        if not self._pending:
+            return reported
+        merged = dict(reported)
+        for expectation in self._pending.values():
+            for section, fields in expectation.patches.items():
+                merged[section] = {**(merged.get(section) or {}), **fields}
+        return merged
+
+
+# ----------------------------------------------------------- attentes usuelles
+
+
+def channel_patches(channel_id: str, channel: Mapping[str, Any]) -> Patches:
+    """Zapping vers `channel` (ligne du catalogue) : chaîne, logo, et plus d'ancien programme."""
+    return {
+        "player": {"current_channel": {**channel, "id": channel_id}, "is_active": True},
+        "playback_state": {
+            "isPlayerActive": True,
+            "isPaused": False,
+            "contentType": "channel",
+            "contentId": channel_id,
+            "contentTitle": channel.get("name"),
+            "logoURL": channel.get("logo_url"),
+            # Le programme rapporté est celui de l'ANCIENNE chaîne : on retombe sur celui du
+            # catalogue (cf. `media_title`).
+            "currentProgramme": None,
+        },
+    }
+
+
+def channel_confirm(channel_id: str) -> Callable[[dict[str, Any]], bool]:
+    """Zapping confirmé dès que l'app rapporte la chaîne — le reste suit au même relevé."""
+
+    def _confirm(reported: dict[str, Any]) -> bool:
+        current = (reported.get("player") or {}).get("current_channel") or {}
+        return current.get("id") == channel_id
+
+    return _confirm
+
+
+def track_patches(payload_key: str, tracks: list[dict[str, Any]], index: int) -> Patches:
+    """Sélection de la piste `index` parmi `tracks` (`audioTracks` / `subtitleTracks`)."""
+    return {
+        "playback_state": {
+            payload_key: [{**track, "isSelected": track.get("index") == index} for track in tracks]
+        }
+    }
+
+
+def track_confirm(payload_key: str, index: int) -> Callable[[dict[str, Any]], bool]:
+    def _confirm(reported: dict[str, Any]) -> bool:
+        tracks = (reported.get("playback_state") or {}).get(payload_key) or []
+        return any(t.get("isSelected") and t.get("index") == index for t in tracks)
+
+    return _confirm
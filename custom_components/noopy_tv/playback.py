@@ -6,6 +6,18 @@ l'autre.
 
 from __future__ import annotations
 
+from collections.abc import Mapping
+from datetime import datetime, timezone
+from time import monotonic
+from typing import Any
+
+from .naming import is_channel_name_valid
+
+# Dernier ordre de playlist calculé, et le dict `channels` dont il provient. Ce dict n'est
+# remplacé qu'au re-fetch du catalogue (cf. `NoopyTVAPI.refresh_data`) : comparer par
+# identité suffit.
+_order_cache: tuple[object, list[str], dict[str, int]] | None = None
+
 
 def infer_content_type(payload: dict, player: dict | None) -> str:
     """Type de contenu, avec rattrapage quand l'app renvoie « none » en pleine lecture.
@@ -34,3 +46,164 @@ def infer_content_type(payload: dict, player: dict | None) -> str:
     if isinstance(duration, (int, float)) and duration > 0 and (payload or {}).get("contentTitle"):
         return "movie"
     return "none"
+
+
+def playlist_order(channels: dict[str, dict[str, Any]]) -> tuple[list[str], dict[str, int]]:
+    """Identifiants des chaînes dans l'ordre de la playlist (séparateurs exclus), et leur rang.
+
+    Trier 60 000 chaînes coûte quelques dizaines de millisecondes : le résultat est gardé tant
+    que le catalogue n'a pas changé.
+    """
+    global _order_cache  # noqa: PLW0603 - cache d'un seul élément, volontairement global
+    if _order_cache is not None and _order_cache[0] is channels:
+        return _order_cache[1], _order_cache[2]
+    ordered = [
+        channel_id
+        for channel_id, channel in sorted(
+            channels.items(),
+            key=lambda item: (
+                item[1].get("order") if isinstance(item[1].get("order"), int) else 10**9
+            ),
+        )
+        if is_channel_name_valid(channel.get("name"))
+    ]
+    positions = {channel_id: index for index, channel_id in enumerate(ordered)}
+    _order_cache = (channels, ordered, positions)
+    return ordered, positions
+
+
+def adjacent_channel_ids(
+    channels: dict[str, dict[str, Any]], current_id: str | None, span: int = 1
+) -> list[str]:
+    """Chaînes voisines de `current_id` — celles où mèneront `nextChannel` / `previousChannel`.
+
+    Les plus proches d'abord, en alternant suivante et précédente ; la playlist boucle.
+    """
+    ordered, positions = playlist_order(channels)
+    index = positions.get(current_id) if current_id else None
+    if index is None:
+        return []
+    result: list[str] = []
+    for step in range(1, span + 1):
+        for neighbour in (ordered[(index + step) % len(ordered)], ordered[(index - step) % len(ordered)]):
+            if neighbour != current_id and neighbour not in result:
+                result.append(neighbour)
+    return result
+
+
+# Écart toléré entre la position rapportée et la position extrapolée. Au-delà, c'est un
+# saut (recherche, reprise après coupure, lecture ralentie) : l'horloge est recalée.
+_DRIFT_TOLERANCE = 2.0
+# Lecture régulière d'un film : délai maximal entre deux relevés (contrôle de dérive). Une
+# pause faite à la télécommande est vue au plus tard à ce moment ; celles passées par Home
+# Assistant le sont aussitôt (relevé ciblé après la commande).
+VOD_VERIFY_INTERVAL = 30.0
+
+
+class PositionClock:
+    """Position de lecture, extrapolée entre deux relevés — partagée par les entités.
+
+    Pendant un film, seule `currentTime` change d'un relevé à l'autre, et de façon
+    prévisible. L'horloge est ANCRÉE sur une position rapportée ; tant que les relevés
+    suivants tombent là où elle l'avait prévu (à `_DRIFT_TOLERANCE` près), l'ancre ne bouge
+    pas : une barre de progression qui extrapole depuis l'ancre ne repart jamais en arrière.
+    Une pause, un buffering, une recherche ou un autre contenu la recalent.
+
+    Une lecture confirmée par deux relevés concordants est dite RÉGULIÈRE : le coordinator
+    peut alors sauter ses relevés jusqu'au prochain contrôle (cf. `can_skip_poll`).
+    """
+
+    def __init__(self) -> None:
+        self.content_id: str | None = None
+        self.position: float | None = None  # position au point d'ancrage
+        self.anchored_at: datetime | None = None
+        self.running = False
+        self.duration: float | None = None
+        self.drift: float | None = None  # dernier écart mesuré : rapporté − extrapolé
+        self.skipped_polls = 0
+        self._anchored_mono = 0.0
+        self._verified_at: float | None = None
+        self._steady = False
+
+    def reset(self) -> None:
+        self.content_id = None
+        self.position = None
+        self.anchored_at = None
+        self.running = False
+        self.duration = None
+        self.drift = None
+        self._verified_at = None
+        self._steady = False
+
+    def update(self, state: Mapping[str, Any]) -> None:
+        """Relevé de `/player/state` : mesure la dérive, recale l'ancre si besoin."""
+        position = state.get("currentTime")
+        if isinstance(position, bool) or not isinstance(position, (int, float)):
+            self.reset()
+            return
+        now = monotonic()
+        running = bool(
+            state.get("isPlayerActive") and not state.get("isPaused") and not state.get("isBuffering")
+        )
+        content_id = state.get("contentId")
+        expected = (
+            self.position_at(now)
+            if self.position is not None and content_id == self.content_id
+            else None
+        )
+        self.drift = None if expected is None else round(float(position) - expected, 3)
+        consistent = (
+            self.drift is not None
+            and running == self.running
+            and abs(self.drift) < _DRIFT_TOLERANCE
+        )
+        if not consistent:
+            self.position = float(position)
+            self.anchored_at = datetime.now(timezone.utc)
+            self._anchored_mono = now
+        self._steady = consistent and running
+        self.running = running
+        self.content_id = content_id
+        duration = state.get("duration")
+        self.duration = (
+            float(duration) if isinstance(duration, (int, float)) and duration > 0 else None
+        )
+        self._verified_at = now
+
+    def position_at(self, now: float | None = None) -> float | None:
+        """Position extrapolée à l'instant `monotonic()` `now` (par défaut : maintenant)."""
+        if self.position is None:
+            return None
+        if not self.running:
+            return self.position
+        position = self.position + ((monotonic() if now is None else now) - self._anchored_mono)
+        return min(position, self.duration) if self.duration is not None else position
+
+    def anchor(self) -> tuple[float, datetime] | None:
+        """(position, instant) d'ancrage — le couple `media_position` / `…_updated_at`."""
+        if self.position is None or self.anchored_at is None:
+            return None
+        return self.position, self.anchored_at
+
+    def can_skip_poll(self) -> bool:
+        """Lecture régulière, contrôlée récemment, et loin de la fin du contenu."""
+        if not self._steady or self._verified_at is None:
+            return False
+        now = monotonic()
+        if now - self._verified_at >= VOD_VERIFY_INTERVAL:
+            return False
+        position = self.position_at(now)
+        # Fin proche : l'épisode suivant, ou le retour au menu, doit être vu à temps.
+        return self.duration is None or (
+            position is not None and position + VOD_VERIFY_INTERVAL < self.duration
+        )
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "content_id": self.content_id,
+            "position": self.position_at(),
+            "running": self.running,
+            "steady": self._steady,
+            "drift": self.drift,
+            "skipped_polls": self.skipped_polls,
+        }
@@ -0,0 +1,183 @@
+"""Préchargement des visuels qu'on s'apprête à demander.
+
+La première ouverture des Favoris, ou le premier zap vers la chaîne suivante, faisait
+télécharger et mettre au carré le logo pendant que l'utilisateur attendait. Or ces visuels
+sont prévisibles :
+
+- les chaînes voisines de la chaîne en cours, dans l'ordre de la playlist — là où mèneront
+  `nextChannel` / `previousChannel` ;
+- les logos des favoris et les affiches de « Reprendre », que le navigateur affichera.
+
+On les fait donc passer en cache à l'avance, en BASSE priorité : un visuel à la fois, et
+seulement quand la chaîne des visuels n'a rien d'autre à faire.
+
+⚠️ Deux garde-fous. Un budget d'octets par heure : le préchargement ne doit pas évincer du
+cache ce que l'utilisateur regarde vraiment. Et une pause tant que l'app est injoignable :
+interroger ses favoris échouerait, et un Apple TV en veille n'a personne devant lui.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from time import monotonic
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+
+from .api import PRIORITY_BACKGROUND, NoopyTVAPI, NoopyTVAPIError
+from .const import DOMAIN
+from .image_pipeline import CacheKey, async_get_image_pipeline
+from .images import (
+    ARTWORK_SIZE_LOGO,
+    THUMBNAIL_SIZE_LOGO,
+    THUMBNAIL_SIZE_POSTER,
+    size_bucket,
+)
+from .playback import adjacent_channel_ids
+
+_LOGGER = logging.getLogger(__name__)
+
+# Favoris et « Reprendre » changent rarement : une passe toutes les 30 min suffit.
+_CATALOG_INTERVAL = timedelta(minutes=30)
+# Deux chaînes de chaque côté : couvre un zap en rafale sans précharger la playlist entière.
+_ADJACENT_SPAN = 2
+# Octets de visuels transformés que le préchargement peut ajouter au cache par heure.
+_BUDGET_BYTES = 4 * 1024 * 1024
+_BUDGET_WINDOW_SECONDS = 3600
+
+
+class NoopyTVArtworkPrefetcher:
+    """Réchauffe le cache des visuels à partir de ce que l'app annonce."""
+
+    def __init__(
+        self, hass: HomeAssistant, api: NoopyTVAPI, coordinator: DataUpdateCoordinator
+    ) -> None:
+        self._hass = hass
+        self._api = api
+        self._coordinator = coordinator
+        self._pending: OrderedDict[CacheKey, None] = OrderedDict()
+        self._task: asyncio.Task | None = None
+        self._unsubs: list[CALLBACK_TYPE] = []
+        self._last_channel_id: str | None = None
+        self._window_start = monotonic()
+        self._spent = 0
+
+    @callback
+    def async_start(self) -> None:
+        self._unsubs.append(self._coordinator.async_add_listener(self._handle_coordinator_update))
+        self._unsubs.append(
+            async_track_time_interval(self._hass, self._async_warm_catalog, _CATALOG_INTERVAL)
+        )
+        self._hass.async_create_background_task(
+            self._async_warm_catalog(), name=f"{DOMAIN}_prefetch_catalog"
+        )
+
+    async def async_stop(self) -> None:
+        while self._unsubs:
+            self._unsubs.pop()()
+        self._pending.clear()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _reachable(self) -> bool:
+        return bool(self._coordinator.last_update_success)
+
+    # ------------------------------------------------------------ sources
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        if not self._reachable():
+            return
+        data = self._coordinator.data or {}
+        current = ((data.get("player") or {}).get("current_channel") or {}).get("id")
+        if current and current != self._last_channel_id:
+            self._last_channel_id = current
+            channels = data.get("channels") or {}
+            # Jaquette du lecteur après un zap : logo en PNG, au palier de la jaquette.
+            keys = [
+                (str(logo), size_bucket(ARTWORK_SIZE_LOGO), "png")
+                for channel_id in adjacent_channel_ids(channels, current, _ADJACENT_SPAN)
+                if (logo := (channels.get(channel_id) or {}).get("logo_url"))
+            ]
+            # Le zap est imminent : ces visuels passent devant ceux du catalogue.
+            self._enqueue(keys, urgent=True)
+        elif self._pending:
+            # L'app répond de nouveau : on reprend là où la pause nous avait arrêtés.
+            self._kick()
+
+    async def _async_warm_catalog(self, _now: datetime | None = None) -> None:
+        if not self._reachable():
+            return
+        try:
+            favorites = await self._api.get_favorites(priority=PRIORITY_BACKGROUND)
+            resume = await self._api.get_continue_watching(priority=PRIORITY_BACKGROUND)
+        except (NoopyTVAPIError, asyncio.TimeoutError) as err:
+            # Rappel de minuteur : une exception ici finirait en tâche orpheline.
+            _LOGGER.debug("OneTV : favoris / reprise indisponibles pour le préchargement (%s)", err)
+            return
+        # Vignettes du navigateur, au format que sert la vue aux navigateurs récents (WebP).
+        keys: list[CacheKey] = [
+            (str(channel["logo_url"]), size_bucket(THUMBNAIL_SIZE_LOGO), "webp")
+            for channel in favorites
+            if channel.get("logo_url")
+        ]
+        keys += [
+            (str(poster), size_bucket(THUMBNAIL_SIZE_POSTER), "webp")
+            for entry in resume
+            if (poster := entry.get("posterURL") or entry.get("logoURL") or entry.get("coverURL"))
+        ]
+        self._enqueue(keys)
+
+    # -------------------------------------------------------------- file
+
+    def _enqueue(self, keys: list[CacheKey], urgent: bool = False) -> None:
+        cache = async_get_image_pipeline(self._hass).cache
+        # Les plus urgents en tête, dans leur ordre : on les insère donc à l'envers.
+        for key in reversed(keys) if urgent else keys:
+            if key in cache:
+                continue
+            self._pending[key] = None
+            if urgent:
+                self._pending.move_to_end(key, last=False)
+        self._kick()
+
+    def _kick(self) -> None:
+        if self._pending and (self._task is None or self._task.done()):
+            self._task = self._hass.async_create_background_task(
+                self._async_drain(), name=f"{DOMAIN}_prefetch"
+            )
+
+    def _budget_left(self) -> bool:
+        if monotonic() - self._window_start >= _BUDGET_WINDOW_SECONDS:
+            self._window_start = monotonic()
+            self._spent = 0
+        return self._spent < _BUDGET_BYTES
+
+    async def _async_drain(self) -> None:
+        pipeline = async_get_image_pipeline(self._hass)
+        while self._pending:
+            # Pause : la file est conservée, la prochaine mise à jour réussie la relance.
+            if not self._reachable():
+                return
+            if not self._budget_left():
+                _LOGGER.debug(
+                    "OneTV : budget de préchargement atteint, %d visuel(s) abandonné(s)",
+                    len(self._pending),
+                )
+                self._pending.clear()
+                return
+            # Basse priorité : on ne passe jamais devant une vignette réellement demandée.
+            await pipeline.async_wait_idle()
+            key, _ = self._pending.popitem(last=False)
+            data = await pipeline.async_get(*key)
+            if data is not None:
+                self._spent += len(data)
@@ -0,0 +1,108 @@
+"""Minuteur des fins de programme : réveille les entités PILE au changement de programme.
+
+Un capteur de programme ne bougeait qu'au tick du coordinator : le titre restait sur le
+programme terminé jusqu'au relevé suivant, et la progression avançait au rythme du
+sondage. Or la fin de chaque programme suivi est connue à l'avance.
+
+Les échéances sont rangées dans un tas (`heapq`) : un seul minuteur Home Assistant est
+armé, sur la plus proche. À son déclenchement, toutes les échéances dues sont servies
+d'un coup, puis le minuteur est ré-armé sur la suivante. Re-planifier une clé ne retire
+pas l'ancienne entrée du tas (O(n)) : elle est simplement ignorée quand elle remonte.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import logging
+from collections.abc import Callable
+from datetime import datetime
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.util import dt as dt_util
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ProgrammeBoundaryScheduler:
+    """Échéances nommées (une par clé), servies par un unique minuteur."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._hass = hass
+        self._heap: list[tuple[datetime, int, str]] = []
+        # Clé → (numéro de l'entrée valide, échéance, action). Une entrée du tas dont le
+        # numéro ne correspond plus est périmée.
+        self._entries: dict[str, tuple[int, datetime, Callable[[], None]]] = {}
+        self._counter = itertools.count()
+        self._unsub: CALLBACK_TYPE | None = None
+        self._armed_for: datetime | None = None
+
+    @callback
+    def async_schedule(self, key: str, when: datetime, action: Callable[[], None]) -> None:
+        """Appelle `action` à `when` ; remplace l'échéance précédente de la même clé."""
+        current = self._entries.get(key)
+        if current is not None and current[1] == when:
+            # Même échéance (cas de chaque tick du coordinator) : rien à re-planifier.
+            self._entries[key] = (current[0], when, action)
+            return
+        seq = next(self._counter)
+        self._entries[key] = (seq, when, action)
+        heapq.heappush(self._heap, (when, seq, key))
+        self._arm()
+
+    @callback
+    def async_cancel(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    @callback
+    def async_stop(self) -> None:
+        self._entries.clear()
+        self._heap.clear()
+        self._disarm()
+
+    def _discard_stale(self) -> None:
+        while self._heap:
+            _, seq, key = self._heap[0]
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == seq:
+                return
+            heapq.heappop(self._heap)
+
+    def _disarm(self) -> None:
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+        self._armed_for = None
+
+    def _arm(self) -> None:
+        self._discard_stale()
+        if not self._heap:
+            self._disarm()
+            return
+        when = self._heap[0][0]
+        if self._armed_for == when:
+            return
+        self._disarm()
+        self._armed_for = when
+        self._unsub = async_track_point_in_utc_time(self._hass, self._fire, when)
+
+    @callback
+    def _fire(self, _now: datetime) -> None:
+        self._unsub = None
+        self._armed_for = None
+        now = dt_util.utcnow()
+        while self._heap and self._heap[0][0] <= now:
+            _, seq, key = heapq.heappop(self._heap)
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != seq:
+                continue  # re-planifiée ou annulée depuis
+            del self._entries[key]
+            try:
+                entry[2]()
+            except Exception:  # noqa: BLE001 - une entité fautive ne bloque pas les autres
+                _LOGGER.exception("OneTV : échéance %s en erreur", key)
+        self._arm()
+
+    def __len__(self) -> int:
+        return len(self._entries)
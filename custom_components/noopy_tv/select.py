@@ -32,6 +32,13 @@ from .const import (
 )
 from .device import build_device_info
 from .images import proxy_image_url, shared_artwork_picture
+from .optimistic import (
+    ZAP_WINDOW,
+    channel_confirm,
+    channel_patches,
+    track_confirm,
+    track_patches,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -313,10 +320,23 @@ class _ChannelSelectBase(CoordinatorEntity, SelectEntity):
             _LOGGER.error("Chaîne non trouvée: %s", option)
             return
         _LOGGER.info("Changement de chaîne : %s (id=%s)", option, channel_id)
+        channel = ((self.coordinator.data or {}).get("channels") or {}).get(channel_id)
+        token = (
+            self.coordinator.async_expect(
+                "channel",
+                channel_patches(channel_id, channel),
+                window=ZAP_WINDOW,
+                confirm=channel_confirm(channel_id),
+            )
+            if channel is not None
+            else None
+        )
         success = await self._api.play_channel(channel_id)
         if success:
-            await self.coordinator.async_request_refresh()
+            await self.coordinator.async_request_player_refresh(include_player=True)
         else:
+            if token is not None:
+                self.coordinator.async_cancel_expectation(token)
             _LOGGER.error("Échec play_channel pour %s", option)
 
     @callback
@@ -505,15 +525,21 @@ class NoopyTVTrackSelect(CoordinatorEntity, SelectEntity):
         if track is None or track.get("index") is None:
             raise HomeAssistantError(f"Piste introuvable : {option}")
 
+        index = int(track["index"])
+        # La piste choisie s'affiche tout de suite ; l'app la confirme au relevé suivant.
+        token = self.coordinator.async_expect(
+            self._kind,
+            track_patches(self._payload_key, self._tracks(), index),
+            confirm=track_confirm(self._payload_key, index),
+        )
         try:
-            result = await self._api.send_command(
-                self._command, {"trackIndex": int(track["index"])}
-            )
+            result = await self.coordinator.commands.async_send(self._command, {"trackIndex": index})
         except NoopyTVAPIError as err:
+            self.coordinator.async_cancel_expectation(token)
             raise HomeAssistantError(f"OneTV : changement de piste impossible — {err}") from err
         if not result.get("success", False):
+            self.coordinator.async_cancel_expectation(token)
             raise HomeAssistantError(
                 f"OneTV a refusé le changement de piste : "
                 f"{result.get('error') or result.get('message')}"
             )
-        await self.coordinator.async_request_refresh()
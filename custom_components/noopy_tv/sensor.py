@@ -11,7 +11,7 @@ HTTP push-based côté serveur OneTV (pas de hop main thread, pas de freeze).
 from __future__ import annotations
 
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Any
 from urllib.parse import quote
 
@@ -22,6 +22,7 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import (
@@ -32,6 +33,9 @@ from .const import (
     ATTR_CURRENT_PROGRAM_ICON,
     ATTR_CURRENT_PROGRAM_START,
     ATTR_LOGO_URL,
+    ATTR_NEXT_PROGRAM,
+    ATTR_NEXT_PROGRAM_END,
+    ATTR_NEXT_PROGRAM_START,
     ATTR_PLAYER_ACTIVE,
     ATTR_PROGRESS_PERCENT,
     ATTR_STREAM_ID,
@@ -42,11 +46,16 @@ from .const import (
     DOMAIN,
 )
 from .device import build_device_info
+from .api import NoopyProgram
 from .playback import infer_content_type
 from .images import proxy_image_url, shared_artwork_picture
 
 _LOGGER = logging.getLogger(__name__)
 
+# Cadence d'écriture de la progression d'un programme en direct : calculée localement depuis
+# ses horaires, sans le moindre appel réseau.
+_PROGRESS_TICK = timedelta(minutes=1)
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -60,6 +69,7 @@ async def async_setup_entry(
         NoopyTVStatsSensor(coordinator, entry),
         NoopyTVCurrentChannelSensor(coordinator, entry),
         NoopyTVProgrammeProgressSensor(coordinator, entry),
+        NoopyTVNextProgrammeSensor(coordinator, entry),
     ]
     async_add_entities(entities)
     _LOGGER.info("OneTV : %d sensor(s) créé(s)", len(entities))
@@ -315,6 +325,23 @@ class NoopyTVCurrentChannelSensor(CoordinatorEntity, SensorEntity):
                 attrs[ATTR_CURRENT_PROGRAM_DESCRIPTION] = psp.get("desc")
                 attrs[ATTR_CURRENT_PROGRAM_ICON] = psp.get("iconURL")
                 attrs[ATTR_PROGRESS_PERCENT] = round((psp.get("progress") or 0) * 100, 1)
+            else:
+                # Dernier repli : le guide chargé (cf. epg.py).
+                now = self.coordinator.epg.now(attrs["channel_id"]) if attrs["channel_id"] else None
+                if now is not None:
+                    attrs[ATTR_CURRENT_PROGRAM] = now.title
+                    attrs[ATTR_CURRENT_PROGRAM_START] = now.start.isoformat()
+                    attrs[ATTR_CURRENT_PROGRAM_END] = now.end.isoformat()
+                    attrs[ATTR_CURRENT_PROGRAM_DESCRIPTION] = now.description
+                    attrs[ATTR_CURRENT_PROGRAM_ICON] = now.icon_url
+                    attrs[ATTR_PROGRESS_PERCENT] = now.progress_percent
+
+        # Programme suivant : recherche dichotomique dans le guide, rien d'autre ne le fournit.
+        upcoming = self.coordinator.epg.next(attrs["channel_id"]) if attrs["channel_id"] else None
+        if upcoming is not None:
+            attrs[ATTR_NEXT_PROGRAM] = upcoming.title
+            attrs[ATTR_NEXT_PROGRAM_START] = upcoming.start.isoformat()
+            attrs[ATTR_NEXT_PROGRAM_END] = upcoming.end.isoformat()
 
         return attrs
 
@@ -333,7 +360,11 @@ class NoopyTVProgrammeProgressSensor(CoordinatorEntity, SensorEntity):
 
     Les attributs `start`/`end` (direct) ou `position_seconds`/`duration_seconds` +
     `position_updated_at` (VOD) permettent à une carte d'animer la barre entre deux mises à
-    jour, qui n'arrivent qu'au rythme du coordinator.
+    jour. En VOD, ce couple est l'ancre de l'horloge partagée (cf. `PositionClock`) et la
+    valeur est extrapolée : elle avance aussi quand le coordinator saute ses relevés.
+
+    En direct, l'état n'attend plus le coordinator : il est réécrit chaque minute, et à la
+    fin EXACTE du programme (cf. scheduler.py), où le guide fournit le suivant.
     """
 
     _attr_has_entity_name = True
@@ -346,8 +377,6 @@ class NoopyTVProgrammeProgressSensor(CoordinatorEntity, SensorEntity):
         super().__init__(coordinator)
         self._entry = entry
         self._attr_unique_id = f"{entry.entry_id}_programme_progress"
-        self._last_position: float | None = None
-        self._last_position_updated = dt_util.utcnow()
 
     @property
     def device_info(self) -> DeviceInfo:
@@ -365,25 +394,36 @@ class NoopyTVProgrammeProgressSensor(CoordinatorEntity, SensorEntity):
         return infer_content_type(self._state_payload(), player) in ("movie", "episode")
 
     def _vod_bounds(self) -> tuple[float, float] | None:
-        ps = self._state_payload()
-        position = ps.get("currentTime")
-        duration = ps.get("duration")
-        if not isinstance(position, (int, float)) or not isinstance(duration, (int, float)):
-            return None
-        if duration <= 0:
+        """(position extrapolée, durée) — cf. `PositionClock`."""
+        duration = self._state_payload().get("duration")
+        position = self.coordinator.position.position_at()
+        if position is None or not isinstance(duration, (int, float)) or duration <= 0:
             return None
-        return float(position), float(duration)
+        return position, float(duration)
 
     def _programme(self) -> dict[str, Any]:
         state = self._state_payload()
         programme = state.get("currentProgramme")
-        if isinstance(programme, dict):
-            return programme
-        # Repli : la chaîne courante porte aussi son programme, mais aplati.
         player = (self.coordinator.data or {}).get("player") or {}
         channel = player.get("current_channel") or {}
-        raw = channel.get("current_program")
-        return raw if isinstance(raw, dict) else {}
+        if not isinstance(programme, dict):
+            # Repli : la chaîne courante porte aussi son programme, mais aplati.
+            raw = channel.get("current_program")
+            programme = raw if isinstance(raw, dict) else {}
+
+        # Programme terminé depuis le dernier relevé : le guide connaît déjà le suivant.
+        end = self._parse(programme.get("end"))
+        if (end is None or end <= dt_util.utcnow()) and channel.get("id"):
+            rolled = self.coordinator.epg.now(channel["id"])
+            if rolled is not None:
+                return {
+                    "title": rolled.title,
+                    "start": rolled.start.isoformat(),
+                    "end": rolled.end.isoformat(),
+                    "desc": rolled.description,
+                    "iconURL": rolled.icon_url,
+                }
+        return programme
 
     @staticmethod
     def _parse(value: Any) -> datetime | None:
@@ -393,20 +433,37 @@ class NoopyTVProgrammeProgressSensor(CoordinatorEntity, SensorEntity):
 
     @callback
     def _handle_coordinator_update(self) -> None:
-        """Horodate les sauts de position, pour que la carte puisse extrapoler.
-
-        Le coordinator ne rafraîchit qu'au rythme du sondage (les events SSE ne sont émis
-        qu'au zap) : sans cet horodatage, une barre de progression de film avancerait par
-        paliers d'une minute.
-        """
-        bounds = self._vod_bounds()
-        if bounds is not None:
-            position = bounds[0]
-            if self._last_position is None or abs(position - self._last_position) >= 1:
-                self._last_position = position
-                self._last_position_updated = dt_util.utcnow()
+        self._schedule_boundary()
         super()._handle_coordinator_update()
 
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_track_time_interval(self.hass, self._async_progress_tick, _PROGRESS_TICK)
+        )
+        self.async_on_remove(lambda: self.coordinator.boundaries.async_cancel(self.unique_id))
+        self._schedule_boundary()
+
+    @callback
+    def _async_progress_tick(self, _now: datetime) -> None:
+        # VOD compris : la position est extrapolée, elle avance entre deux relevés.
+        if self.coordinator.last_update_success:
+            self.async_write_ha_state()
+
+    @callback
+    def _schedule_boundary(self) -> None:
+        end = None if self._is_vod() else self._parse(self._programme().get("end"))
+        if end is None or end <= dt_util.utcnow():
+            self.coordinator.boundaries.async_cancel(self.unique_id)
+            return
+        self.coordinator.boundaries.async_schedule(self.unique_id, end, self._on_boundary)
+
+    @callback
+    def _on_boundary(self) -> None:
+        """Fin du programme : bascule sur le suivant (lu dans le guide) sans attendre l'app."""
+        self.async_write_ha_state()
+        self._schedule_boundary()
+
     # ------------------------------------------------------------------- état
 
     @property
@@ -448,16 +505,17 @@ class NoopyTVProgrammeProgressSensor(CoordinatorEntity, SensorEntity):
             if bounds is None:
                 return {"content_type": content_type}
             position, duration = bounds
+            anchor_position, anchored_at = self.coordinator.position.anchor()
             attrs: dict[str, Any] = {
                 "content_type": content_type,
                 "title": ps.get("contentTitle"),
                 "subtitle": ps.get("contentSubtitle"),
-                "position_seconds": int(position),
+                "position_seconds": int(anchor_position),
                 "duration_seconds": int(duration),
                 "duration_minutes": int(duration // 60),
                 "remaining_minutes": max(0, int((duration - position) // 60)),
                 # Permet à une carte d'extrapoler entre deux mises à jour.
-                "position_updated_at": self._last_position_updated.isoformat(),
+                "position_updated_at": anchored_at.isoformat(),
                 "is_playing": ps.get("isPlaying"),
             }
             return {k: v for k, v in attrs.items() if v is not None}
@@ -479,3 +537,90 @@ class NoopyTVProgrammeProgressSensor(CoordinatorEntity, SensorEntity):
         if icon_url:
             attrs["icon_url"] = icon_url
         return {k: v for k, v in attrs.items() if v is not None}
+
+
+class NoopyTVNextProgrammeSensor(CoordinatorEntity, SensorEntity):
+    """Programme suivant sur la chaîne en cours, lu dans le guide (cf. epg.py).
+
+    `unavailable` hors direct, ou quand le guide ne couvre pas la chaîne : l'app n'annonce
+    le programme suivant nulle part ailleurs.
+    """
+
+    _attr_has_entity_name = True
+    _attr_name = "Programme suivant"
+    _attr_icon = "mdi:television-guide"
+
+    def __init__(self, coordinator, entry: ConfigEntry) -> None:
+        super().__init__(coordinator)
+        self._entry = entry
+        self._attr_unique_id = f"{entry.entry_id}_next_programme"
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        return build_device_info(self._entry)
+
+    def _channel_id(self) -> str | None:
+        data = self.coordinator.data or {}
+        player = data.get("player") or {}
+        if infer_content_type(data.get("playback_state") or {}, player) != "channel":
+            return None
+        return (player.get("current_channel") or {}).get("id")
+
+    def _upcoming(self) -> NoopyProgram | None:
+        channel_id = self._channel_id()
+        if not channel_id:
+            return None
+        return self.coordinator.epg.next(channel_id)
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self.async_on_remove(lambda: self.coordinator.boundaries.async_cancel(self.unique_id))
+        self._schedule_boundary()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        self._schedule_boundary()
+        super()._handle_coordinator_update()
+
+    @callback
+    def _schedule_boundary(self) -> None:
+        # Le « suivant » change quand il commence : c'est son début qu'on guette.
+        upcoming = self._upcoming()
+        if upcoming is None:
+            self.coordinator.boundaries.async_cancel(self.unique_id)
+            return
+        self.coordinator.boundaries.async_schedule(
+            self.unique_id, upcoming.start, self._on_boundary
+        )
+
+    @callback
+    def _on_boundary(self) -> None:
+        self.async_write_ha_state()
+        self._schedule_boundary()
+
+    @property
+    def available(self) -> bool:
+        return self.coordinator.last_update_success and self._upcoming() is not None
+
+    @property
+    def native_value(self) -> str | None:
+        upcoming = self._upcoming()
+        return upcoming.title if upcoming else None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        upcoming = self._upcoming()
+        if upcoming is None:
+            return {}
+        attrs: dict[str, Any] = {
+            "channel_id": self._channel_id(),
+            "start": upcoming.start.isoformat(),
+            "end": upcoming.end.isoformat(),
+            "starts_in_minutes": max(
+                0, int((upcoming.start - dt_util.utcnow()).total_seconds() // 60)
+            ),
+            "duration_minutes": int((upcoming.end - upcoming.start).total_seconds() // 60),
+            "description": upcoming.description,
+            "icon_url": upcoming.icon_url,
+        }
+        return {k: v for k, v in attrs.items() if v is not None}
@@ -0,0 +1,186 @@
+"""Planches de vignettes (« sprites ») pour les grosses pages du navigateur de médias.
+
+Une catégorie de 800 chaînes, c'était 800 requêtes de vignettes signées — chacune avec sa
+propre URL, donc jamais servie depuis le cache du navigateur d'une visite à l'autre : la
+signature change à chaque navigation. Sur une tablette murale lente, la grille mettait de
+longues secondes à se remplir.
+
+En mode planche (option de l'intégration), chaque tranche de `SPRITE_PAGE_SIZE` chaînes
+reçoit une clé STABLE, dérivée de ses logos :
+
+- `/api/noopy_tv/sprite/<clé>` : la planche entière, une image en grille de
+  `SPRITE_COLUMNS` colonnes de `SPRITE_TILE` px (annoncées dans les en-têtes
+  `X-Sprite-Columns` / `X-Sprite-Tile`). Une carte qui sait découper une planche affiche
+  toute la page en UNE requête.
+- `/api/noopy_tv/sprite/<clé>/<rang>` : la vignette seule, pour le navigateur de Home
+  Assistant qui n'affiche qu'une image par carte. L'URL ne change plus d'une visite à
+  l'autre : après la première, le navigateur sert la page entière depuis son cache.
+
+⚠️ Ces URL ne sont PAS signées par Home Assistant (une signature à durée de vie les
+rendrait instables, ce qu'on cherche justement à éviter). La clé est donc un HMAC de la
+page, calculé avec un secret aléatoire tiré au démarrage et gardé en mémoire : stable tant
+que Home Assistant tourne, impossible à calculer de l'extérieur même en connaissant la
+playlist. Une clé ne désigne qu'une liste de logos enregistrée par l'intégration elle-même
+lors d'une navigation ; une clé inconnue répond 404.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import hmac
+import io
+import logging
+import secrets
+from collections import OrderedDict
+
+from aiohttp import web
+
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN
+from .image_pipeline import async_get_image_pipeline
+from .images import IMAGE_CONTENT_TYPES, accepts_webp, size_bucket
+
+_LOGGER = logging.getLogger(__name__)
+
+SPRITE_URL = "/api/noopy_tv/sprite"
+# 100 vignettes de 128 px sur 10 colonnes : une planche de 1280×1280, quelques centaines de
+# kilo-octets en WebP.
+SPRITE_PAGE_SIZE = 100
+SPRITE_COLUMNS = 10
+SPRITE_TILE = 128
+
+# Pages mémorisées. Au-delà, les plus anciennes sont oubliées : leurs URL répondent 404
+# jusqu'à la prochaine navigation, qui les ré-enregistre sous la même clé.
+_MAX_PAGES = 256
+_REGISTRY_KEY = f"{DOMAIN}_sprite_pages"
+
+
+class _SpriteRegistry:
+    """Clé de page → liste ordonnée des logos de la page."""
+
+    def __init__(self) -> None:
+        self._pages: OrderedDict[str, list[str]] = OrderedDict()
+        # Propre à cette instance de Home Assistant : les clés ne se devinent pas.
+        self._secret = secrets.token_bytes(32)
+
+    def register(self, urls: list[str]) -> str:
+        digest = hmac.new(self._secret, digestmod=hashlib.sha256)
+        digest.update(f"{SPRITE_TILE}\n{SPRITE_COLUMNS}\n".encode())
+        digest.update("\n".join(urls).encode())
+        key = digest.hexdigest()[:32]
+        self._pages[key] = urls
+        self._pages.move_to_end(key)
+        while len(self._pages) > _MAX_PAGES:
+            self._pages.popitem(last=False)
+        return key
+
+    def get(self, key: str) -> list[str] | None:
+        return self._pages.get(key)
+
+
+@callback
+def _registry(hass: HomeAssistant) -> _SpriteRegistry:
+    registry = hass.data.get(_REGISTRY_KEY)
+    if registry is None:
+        registry = hass.data[_REGISTRY_KEY] = _SpriteRegistry()
+    return registry
+
+
+@callback
+def async_register_sprite_page(hass: HomeAssistant, urls: list[str]) -> str:
+    """Enregistre une page de logos et renvoie sa clé (identique pour les mêmes logos)."""
+    return _registry(hass).register(urls)
+
+
+def sprite_sheet_url(key: str) -> str:
+    return f"{SPRITE_URL}/{key}"
+
+
+def sprite_tile_url(key: str, index: int) -> str:
+    return f"{SPRITE_URL}/{key}/{index}"
+
+
+class NoopyTVSpriteView(HomeAssistantView):
+    """Sert une planche de vignettes, ou une de ses vignettes."""
+
+    url = SPRITE_URL + "/{key}"
+    extra_urls = [SPRITE_URL + "/{key}/{index}"]
+    name = "api:noopy_tv:sprite"
+    # La balise `img` du navigateur n'envoie pas de jeton. Clé = HMAC à secret local, limitée
+    # aux logos enregistrés : cf. l'en-tête du module.
+    requires_auth = False
+
+    async def get(self, request: web.Request, key: str, index: str | None = None) -> web.Response:
+        hass: HomeAssistant = request.app["hass"]
+        urls = _registry(hass).get(key)
+        if urls is None:
+            return web.Response(status=404, text="planche inconnue")
+
+        fmt = "webp" if accepts_webp(request.headers.get("Accept")) else "png"
+        pipeline = async_get_image_pipeline(hass)
+        headers = {
+            # La clé est dérivée du contenu : même URL = même image (jusqu'au redémarrage,
+            # qui change le secret et donc toutes les clés).
+            "Cache-Control": "public, max-age=604800, immutable",
+            "Vary": "Accept",
+        }
+
+        if index is not None:
+            try:
+                rank = int(index)
+            except ValueError:
+                rank = -1
+            if not 0 <= rank < len(urls):
+                return web.Response(status=404, text="vignette inconnue")
+            url = urls[rank]
+            data = await pipeline.async_get(url, size_bucket(SPRITE_TILE), fmt)
+            if data is None:
+                return web.Response(status=404, text="visuel indisponible")
+            return web.Response(body=data, content_type=IMAGE_CONTENT_TYPES[fmt], headers=headers)
+
+        async def _build() -> bytes | None:
+            # Les vignettes passent par le cache commun en PNG (sans perte) : la planche est
+            # ré-encodée une seule fois, dans le format demandé.
+            tiles = await asyncio.gather(
+                *(pipeline.async_get(url, size_bucket(SPRITE_TILE), "png") for url in urls)
+            )
+            return await pipeline.async_run_job(_compose, list(tiles), fmt)
+
+        data = await pipeline.async_get_or_build((f"sprite:{key}", SPRITE_TILE, fmt), _build)
+        if data is None:
+            return web.Response(status=404, text="planche indisponible")
+        headers["X-Sprite-Columns"] = str(SPRITE_COLUMNS)
+        headers["X-Sprite-Tile"] = str(SPRITE_TILE)
+        return web.Response(body=data, content_type=IMAGE_CONTENT_TYPES[fmt], headers=headers)
+
+
+def _compose(tiles: list[bytes | None], fmt: str) -> bytes | None:
+    try:
+        from PIL import Image
+    except ImportError:  # pragma: no cover - Pillow est une dépendance de HA
+        return None
+
+    rows = max(1, -(-len(tiles) // SPRITE_COLUMNS))
+    columns = min(SPRITE_COLUMNS, max(1, len(tiles)))
+    sheet = Image.new("RGBA", (columns * SPRITE_TILE, rows * SPRITE_TILE), (0, 0, 0, 0))
+    for position, tile in enumerate(tiles):
+        if tile is None:
+            continue  # logo injoignable : case transparente, les autres restent alignées
+        try:
+            image = Image.open(io.BytesIO(tile)).convert("RGBA")
+        except Exception:  # noqa: BLE001 - une vignette illisible laisse sa case vide
+            continue
+        # Vignette déjà carrée, au plus SPRITE_TILE : on la centre dans sa case.
+        x = (position % SPRITE_COLUMNS) * SPRITE_TILE + (SPRITE_TILE - image.width) // 2
+        y = (position // SPRITE_COLUMNS) * SPRITE_TILE + (SPRITE_TILE - image.height) // 2
+        sheet.paste(image, (x, y))
+
+    buffer = io.BytesIO()
+    if fmt == "webp":
+        sheet.save(buffer, format="WEBP", quality=80, method=4)
+    else:
+        sheet.save(buffer, format="PNG", compress_level=6)
+    return buffer.getvalue()
@@ -0,0 +1,108 @@
+"""Lecture incrémentale du flux `text/event-stream` de l'app.
+
+Le flux était lu ligne à ligne : chaque ligne décodée en `str`, nettoyée, comparée à des
+préfixes, et les lignes `data:` d'un évènement rassemblées dans une liste avant d'être
+jointes. Surtout, les champs `id:` et `retry:` étaient ignorés : après une coupure, rien
+ne permettait à l'app de rejouer les évènements émis pendant la reconnexion — un zap
+tombé dans ce trou n'était jamais vu.
+
+`SSEParser` consomme directement les morceaux d'octets reçus (de n'importe quelle taille,
+une ligne pouvant être coupée entre deux morceaux) et suit la spécification : fin de ligne
+LF ou CRLF, commentaires `:`, un espace optionnel après les deux-points, `data:` multiples
+réunis par des `\\n`, `id:` retenu d'un évènement à l'autre (et d'une connexion à
+l'autre : il est renvoyé dans `Last-Event-ID`), `retry:` en millisecondes.
+
+Un `id:` ne compte qu'une fois son évènement complet (ligne vide) : coupé avant, l'évènement
+est perdu, et annoncer son id à la reconnexion ferait reprendre l'app APRÈS lui.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+
+@dataclass
+class SSEEvent:
+    name: str
+    data: bytes
+    id: str | None
+
+
+class SSEParser:
+    """Découpe un flux d'octets en évènements ; l'état survit aux reconnexions."""
+
+    def __init__(self, last_event_id: str | None = None) -> None:
+        self.last_event_id = last_event_id
+        # Délai de reconnexion demandé par le serveur, en secondes (None = non précisé).
+        self.retry: float | None = None
+        # `id:` de l'évènement en cours de lecture, retenu à sa distribution seulement.
+        self._pending_id: str | None = None
+        self._buffer = bytearray()
+        self._event = b""
+        self._data = bytearray()
+        self._has_data = False
+
+    def reset(self) -> None:
+        """Nouvelle connexion : l'évènement en cours de lecture est abandonné, son `id` aussi."""
+        self._pending_id = None
+        self._buffer.clear()
+        self._event = b""
+        self._data.clear()
+        self._has_data = False
+
+    def feed(self, chunk: bytes) -> list[SSEEvent]:
+        """Ajoute `chunk` et renvoie les évènements qu'il complète."""
+        buffer = self._buffer
+        buffer += chunk
+        end = buffer.rfind(b"\n")
+        if end < 0:
+            return []
+        # Découpage en C d'un seul tenant ; la ligne incomplète reste dans le tampon.
+        lines = bytes(buffer[:end]).split(b"\n")
+        del buffer[: end + 1]
+        events: list[SSEEvent] = []
+        for line in lines:
+            if line[-1:] == b"\r":
+                line = line[:-1]
+            if not line:
+                event = self._dispatch()
+                if event is not None:
+                    events.append(event)
+            elif line[0] != 0x3A:  # ':' → commentaire (heartbeat)
+                self._field(line)
+        return events
+
+    def _field(self, line: bytes) -> None:
+        name, sep, value = line.partition(b":")
+        if sep and value[:1] == b" ":
+            value = value[1:]
+        if name == b"data":
+            if self._has_data:
+                self._data += b"\n"
+            self._data += value
+            self._has_data = True
+        elif name == b"event":
+            self._event = value
+        elif name == b"id":
+            if b"\x00" not in value:
+                self._pending_id = value.decode("utf-8", errors="replace")
+        elif name == b"retry":
+            if value.isdigit():
+                self.retry = int(value) / 1000
+        # Champ inconnu : ignoré, comme le veut la spécification.
+
+    def _dispatch(self) -> SSEEvent | None:
+        if self._pending_id is not None:
+            self.last_event_id = self._pending_id
+            self._pending_id = None
+        event: SSEEvent | None = None
+        if self._has_data:
+            event = SSEEvent(
+                self._event.decode("utf-8", errors="replace") or "message",
+                bytes(self._data),
+                self.last_event_id,
+            )
+        self._event = b""
+        self._data.clear()
+        self._has_data = False
+        return event
@@ -36,7 +36,7 @@ except ImportError:  # pragma: no cover
     from homeassistant.components.http import async_sign_path  # type: ignore[attr-defined]
 from homeassistant.core import HomeAssistant, callback
 
-from .images import async_square_png
+from .images import accepts_webp, async_square_image
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -69,27 +69,42 @@ class NoopyTVThumbnailView(HomeAssistantView):
         if urlparse(url).scheme not in ("http", "https"):
             return web.Response(status=400, text="schéma non autorisé")
 
+        try:
+            size = int(request.query["size"]) if "size" in request.query else None
+        except ValueError:
+            return web.Response(status=400, text="taille invalide")
+        # Une taille au-delà du plus grand palier y est ramenée (cf. `size_bucket`).
+        if size is not None and size <= 0:
+            return web.Response(status=400, text="taille invalide")
+
         hass: HomeAssistant = request.app["hass"]
-        data = await async_square_png(hass, url)
-        if data is None:
+        fmt = "webp" if accepts_webp(request.headers.get("Accept")) else "png"
+        result = await async_square_image(hass, url, size=size, fmt=fmt)
+        if result is None:
             return web.Response(status=404, text="visuel indisponible")
 
+        data, content_type = result
         return web.Response(
             body=data,
-            content_type="image/png",
-            headers={"Cache-Control": "max-age=3600"},
+            content_type=content_type,
+            # Le format dépend de l'en-tête `Accept` : un cache intermédiaire ne doit pas
+            # servir du WebP à un client qui ne l'a pas demandé.
+            headers={"Cache-Control": "max-age=3600", "Vary": "Accept"},
         )
 
 
 @callback
-def squared_thumbnail_url(hass: HomeAssistant, raw_url: str) -> str | None:
-    """URL signée servant `raw_url` mis au carré. `None` si la signature échoue."""
+def squared_thumbnail_url(hass: HomeAssistant, raw_url: str, size: int | None = None) -> str | None:
+    """URL signée servant `raw_url` mis au carré (et réduit à `size`). `None` si la signature échoue."""
     if not raw_url:
         return None
+    path = f"{THUMBNAIL_URL}?url={quote(raw_url, safe='')}"
+    if size:
+        path = f"{path}&size={int(size)}"
     try:
         return async_sign_path(
             hass,
-            f"{THUMBNAIL_URL}?url={quote(raw_url, safe='')}",
+            path,
             # `expiration` attend un timedelta, pas un nombre de secondes.
             expiration=timedelta(seconds=_SIGNATURE_LIFETIME_SECONDS),
         )
@@ -0,0 +1,187 @@
+"""Commandes websocket de l'intégration.
+
+`noopy_tv/guide` : même requête que le service `noopy_tv.get_guide`, pour une carte de
+guide TV qui pagine au défilement sans passer par un appel de service. Servie uniquement
+depuis le guide indexé (cf. epg.py) : aucune requête vers l'app.
+
+`noopy_tv/playback/subscribe` : position et état de lecture poussés à la carte, au rythme
+qu'elle choisit. Une barre de progression à la seconde sans écrire d'état à chaque tick
+(que l'enregistreur conserverait) ni extrapoler côté carte. Servi depuis la mémoire — le
+dernier relevé et l'horloge de position (cf. `PositionClock`) : une tablette de plus ne
+coûte aucune requête à l'Apple TV. Seuls les champs qui ont changé sont envoyés.
+L'abonnement prend fin, sur une erreur, quand l'entrée est déchargée (reload compris) :
+à la carte de se réabonner.
+"""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, SIGNAL_ENTRY_UNLOADED
+from .epg import GUIDE_DEFAULT_LIMIT, GUIDE_MAX_LIMIT, query_guide
+from .playback import infer_content_type
+
+# Cadence des positions poussées, en secondes : au choix de la carte, dans ces bornes.
+PLAYBACK_DEFAULT_INTERVAL = 1.0
+PLAYBACK_MIN_INTERVAL = 0.25
+PLAYBACK_MAX_INTERVAL = 60.0
+
+
+@callback
+def async_register_websocket_commands(hass: HomeAssistant) -> None:
+    websocket_api.async_register_command(hass, ws_guide)
+    websocket_api.async_register_command(hass, ws_playback_subscribe)
+
+
+def _entry_id(hass: HomeAssistant, entry_id: str | None) -> str | None:
+    """Entrée demandée si elle est chargée — à défaut, la première configurée."""
+    entries: dict[str, Any] = hass.data.get(DOMAIN) or {}
+    if entry_id is not None:
+        return entry_id if entry_id in entries else None
+    return next(iter(entries), None)
+
+
+def _entry_data(hass: HomeAssistant, entry_id: str | None) -> dict[str, Any] | None:
+    """Données de l'entrée demandée — à défaut, de la première configurée."""
+    resolved = _entry_id(hass, entry_id)
+    return None if resolved is None else hass.data[DOMAIN][resolved]
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "noopy_tv/guide",
+        vol.Optional("entry_id"): str,
+        vol.Exclusive("channel_ids", "channels"): [str],
+        vol.Exclusive("category", "channels"): str,
+        vol.Optional("start"): cv.datetime,
+        vol.Optional("end"): cv.datetime,
+        vol.Optional("cursor"): str,
+        vol.Optional("limit", default=GUIDE_DEFAULT_LIMIT): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=GUIDE_MAX_LIMIT)
+        ),
+    }
+)
+@callback
+def ws_guide(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]
+) -> None:
+    data = _entry_data(hass, msg.get("entry_id"))
+    if data is None:
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, "Appareil OneTV inconnu")
+        return
+    coordinator = data["coordinator"]
+    try:
+        result = query_guide(
+            coordinator.epg,
+            (coordinator.data or {}).get("channels") or {},
+            channel_ids=msg.get("channel_ids"),
+            category=msg.get("category"),
+            start=dt_util.as_utc(msg["start"]) if "start" in msg else None,
+            end=dt_util.as_utc(msg["end"]) if "end" in msg else None,
+            cursor=msg.get("cursor"),
+            limit=msg["limit"],
+        )
+    except ValueError as err:
+        connection.send_error(msg["id"], websocket_api.ERR_INVALID_FORMAT, str(err))
+        return
+    connection.send_result(msg["id"], result)
+
+
+def _playback_snapshot(coordinator) -> dict[str, Any]:
+    """État de lecture réduit à ce qu'affiche une carte — mêmes règles que le lecteur."""
+    data = coordinator.data or {}
+    state = data.get("playback_state") or {}
+    player = data.get("player") or {}
+    if not coordinator.last_update_success:
+        status = "off"
+    elif not state.get("isPlayerActive", player.get("is_active", False)):
+        status = "idle"
+    elif state.get("isPaused"):
+        status = "paused"
+    elif state.get("isBuffering"):
+        status = "buffering"
+    else:
+        status = "playing"
+    position = coordinator.position.position_at()
+    duration = state.get("duration")
+    return {
+        "state": status,
+        "content_type": infer_content_type(state, player),
+        "content_id": state.get("contentId"),
+        "title": state.get("contentTitle"),
+        "position": None if position is None else round(position, 1),
+        "duration": duration if isinstance(duration, (int, float)) and duration > 0 else None,
+    }
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "noopy_tv/playback/subscribe",
+        vol.Optional("entry_id"): str,
+        vol.Optional("interval", default=PLAYBACK_DEFAULT_INTERVAL): vol.All(
+            vol.Coerce(float), vol.Range(min=PLAYBACK_MIN_INTERVAL, max=PLAYBACK_MAX_INTERVAL)
+        ),
+    }
+)
+@callback
+def ws_playback_subscribe(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Premier message : l'état complet. Ensuite : les seuls champs modifiés.
+
+    Poussé à chaque `interval` (la position avance) et à chaque publication du coordinator
+    (pause, zap… sans attendre le tick suivant). Prend fin au déchargement de l'entrée.
+    """
+    entry_id = _entry_id(hass, msg.get("entry_id"))
+    if entry_id is None:
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, "Appareil OneTV inconnu")
+        return
+    coordinator = hass.data[DOMAIN][entry_id]["coordinator"]
+    sent: dict[str, Any] = {}
+
+    @callback
+    def _push(_now=None) -> None:
+        snapshot = _playback_snapshot(coordinator)
+        delta = {
+            key: value
+            for key, value in snapshot.items()
+            if key not in sent or sent[key] != value
+        }
+        if not delta:
+            return
+        sent.update(delta)
+        connection.send_message(websocket_api.event_message(msg["id"], delta))
+
+    unsub_timer = async_track_time_interval(hass, _push, timedelta(seconds=msg["interval"]))
+    unsub_updates = coordinator.async_add_listener(_push)
+
+    @callback
+    def _unsubscribe() -> None:
+        unsub_timer()
+        unsub_updates()
+        unsub_unload()
+
+    @callback
+    def _unloaded() -> None:
+        # Sans ça, l'abonnement survivrait au reload en suivant l'ancien coordinator, figé.
+        if connection.subscriptions.pop(msg["id"], None) is None:
+            return
+        _unsubscribe()
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, "Appareil OneTV déchargé")
+
+    unsub_unload = async_dispatcher_connect(
+        hass, SIGNAL_ENTRY_UNLOADED.format(entry_id), _unloaded
+    )
+    connection.subscriptions[msg["id"]] = _unsubscribe
+    connection.send_result(msg["id"])
+    _push()
@@ -0,0 +1 @@
+"""Tests de l'intégration OneTV."""
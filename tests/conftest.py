@@ -0,0 +1,9 @@
+"""Fixtures communes (cf. pytest-homeassistant-custom-component)."""
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations):
+    """Rend `custom_components/noopy_tv` chargeable dans chaque test."""
+    yield
@@ -0,0 +1,52 @@
+"""File des commandes (cf. commands.py)."""
+
+import asyncio
+from typing import Any
+
+import pytest
+
+from custom_components.noopy_tv.commands import NoopyTVCommandQueue
+
+
+class _FakeAPI:
+    def __init__(self) -> None:
+        self.sent: list[str] = []
+
+    async def send_command(self, command: str, params: dict[str, Any] | None = None) -> dict:
+        self.sent.append(command)
+        return {"success": True}
+
+
+class _FakeCoordinator:
+    """Relevé de fin de rafale lent, pendant lequel le test peut glisser une commande."""
+
+    data: dict[str, Any] = {}
+
+    def __init__(self) -> None:
+        self.refreshes = 0
+        self.refreshing = asyncio.Event()
+        self.release = asyncio.Event()
+
+    async def async_request_player_refresh(self, include_player: bool = False) -> None:
+        self.refreshes += 1
+        self.refreshing.set()
+        await self.release.wait()
+
+
+@pytest.mark.asyncio
+async def test_command_queued_during_final_refresh_is_sent(hass) -> None:
+    """Une commande arrivée pendant le relevé de fin de rafale part quand même."""
+    api = _FakeAPI()
+    coordinator = _FakeCoordinator()
+    queue = NoopyTVCommandQueue(hass, api, coordinator)
+
+    assert await queue.async_send("play") == {"success": True}
+    await asyncio.wait_for(coordinator.refreshing.wait(), 2)
+
+    late = hass.async_create_task(queue.async_send("pause"))
+    await asyncio.sleep(0)
+    coordinator.release.set()
+
+    assert await asyncio.wait_for(late, 2) == {"success": True}
+    assert api.sent == ["play", "pause"]
+    queue.async_stop()
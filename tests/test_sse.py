@@ -0,0 +1,18 @@
+"""Lecture du flux SSE (cf. sse.py)."""
+
+from custom_components.noopy_tv.sse import SSEParser
+
+
+def test_id_counts_only_once_the_event_is_complete() -> None:
+    """Flux coupé après `id: 2`, avant la ligne vide : la reprise repart de 1."""
+    parser = SSEParser()
+    events = parser.feed(b"id: 1\nevent: channel.start\ndata: {}\n\nid: 2\nevent: channel.")
+    assert [event.id for event in events] == ["1"]
+    assert parser.last_event_id == "1"
+
+    parser.reset()
+    assert parser.last_event_id == "1"
+
+    events = parser.feed(b"id: 2\nevent: channel.change\ndata: {}\n\n")
+    assert [(event.name, event.id) for event in events] == [("channel.change", "2")]
+    assert parser.last_event_id == "2"
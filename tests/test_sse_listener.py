@@ -0,0 +1,60 @@
+"""Relais des évènements SSE sur le bus (cf. `NoopyTVEventListener`)."""
+
+import asyncio
+from datetime import timedelta
+
+import pytest
+from pytest_homeassistant_custom_component.common import async_capture_events
+
+from custom_components.noopy_tv import NoopyTVEventListener
+from custom_components.noopy_tv.const import EVENT_CHANNEL_CHANGED, SSE_REPLAY_WINDOW
+
+
+class _FakeAPI:
+    def reset_circuit(self) -> None:
+        pass
+
+
+class _FakeCoordinator:
+    def __init__(self) -> None:
+        self.refreshes = 0
+
+    async def async_request_refresh(self) -> None:
+        self.refreshes += 1
+
+    async def async_request_player_refresh(self, include_player: bool = False) -> None:
+        self.refreshes += 1
+
+
+def _listener(hass, coordinator: _FakeCoordinator) -> NoopyTVEventListener:
+    return NoopyTVEventListener(hass, _FakeAPI(), coordinator, timedelta(seconds=30), "entry")
+
+
+@pytest.mark.asyncio
+async def test_connect_burst_is_not_relayed(hass) -> None:
+    """État initial et rejeu, d'une traite à la connexion : relevés, mais pas relayés."""
+    events = async_capture_events(hass, EVENT_CHANNEL_CHANGED)
+    coordinator = _FakeCoordinator()
+    listener = _listener(hass, coordinator)
+
+    listener._on_connected()
+    listener._on_event("channel.change", {"channel_id": "c1"})
+    listener._on_event("channel.change", {"channel_id": "c2"})
+    await hass.async_block_till_done()
+
+    assert events == []
+    assert coordinator.refreshes == 2
+
+
+@pytest.mark.asyncio
+async def test_first_live_event_after_a_quiet_connect_is_relayed(hass) -> None:
+    """Rien à la connexion : le premier évènement, bien plus tard, est une vraie transition."""
+    events = async_capture_events(hass, EVENT_CHANNEL_CHANGED)
+    listener = _listener(hass, _FakeCoordinator())
+
+    listener._on_connected()
+    await asyncio.sleep(SSE_REPLAY_WINDOW + 0.1)
+    listener._on_event("channel.change", {"channel_id": "c1"})
+    await hass.async_block_till_done()
+
+    assert [event.data["channel_id"] for event in events] == ["c1"]